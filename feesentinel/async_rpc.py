@@ -0,0 +1,362 @@
+"""Asyncio Bitcoin RPC client with bounded concurrency for Blockscope.
+
+The synchronous ``RPCClient`` remains the default (and the only client used in
+cron/``--once`` runs). This client is used when ``rpc.async_enabled`` is set to
+run independent lookups concurrently over a small pool of keep-alive
+connections.
+
+When built with the synchronous client (``from_config(config, rpc_client)``),
+``call_many`` keeps its layers: answers come from its immutable response
+cache first, requests wait for its rate limiter, and the primary node's
+circuit breaker is honoured and updated. Multi-node failover and hedging only
+exist in ``RPCClient``, so with several ``rpc.urls`` ``call_many`` runs through
+``RPCClient.batch`` instead. Tip coalescing and adaptive timeouts are not
+applied; calls use ``rpc.timeout_secs``.
+"""
+
+import asyncio
+import base64
+import json
+import ssl
+import threading
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from .instrumentation import CallStats
+from .rpc import RPCClient, map_rpc_error
+from .rpc_cache import MISS, is_cacheable_method
+from .rpc_cassette import Cassette
+from .rpc_resilience import CircuitOpenError
+from .constants import DEFAULT_RPC_MAX_IN_FLIGHT, DEFAULT_RPC_TIMEOUT_SECS
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncRPCClient:
+    """Bitcoin RPC client on asyncio with pooled keep-alive connections."""
+
+    def __init__(
+        self,
+        url: str,
+        user: str,
+        password: str,
+        max_in_flight: int = DEFAULT_RPC_MAX_IN_FLIGHT,
+        timeout_secs: float = DEFAULT_RPC_TIMEOUT_SECS,
+        cassette: Optional[Cassette] = None,
+        rpc_client: Optional[RPCClient] = None,
+    ):
+        """
+        Initialize async RPC client.
+
+        Args:
+            url: RPC URL (e.g., "http://127.0.0.1:8332")
+            user: RPC username
+            password: RPC password
+            max_in_flight: Maximum number of concurrent requests (and pooled connections)
+            timeout_secs: Default per-call timeout in seconds
+            cassette: Optional cassette to record calls to or replay them from
+            rpc_client: Optional synchronous client whose cache, rate limiter
+                and circuit breaker this client shares (see module docstring)
+        """
+        parsed = urlparse(url)
+        self.url = url
+        self.host = parsed.hostname or "127.0.0.1"
+        self.use_ssl = parsed.scheme == "https"
+        self.port = parsed.port or (443 if self.use_ssl else 80)
+        self.path = parsed.path or "/"
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.timeout_secs = timeout_secs
+        token = base64.b64encode(f"{user}:{password}".encode()).decode()
+        self._auth_header = f"Basic {token}"
+
+        # Created lazily so they bind to the loop that first uses the client
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._next_id = 0
+        # Per-method call counts, latency histograms, bytes and errors; shared
+        # with the synchronous client so rpc_stats covers all traffic
+        self.stats = rpc_client.stats if rpc_client is not None else CallStats()
+        self.cassette = cassette
+        self.rpc_client = rpc_client
+        self._breaker = rpc_client.breakers.get(url) if rpc_client is not None else None
+
+        # Private loop used by the synchronous call_many() bridge
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, rpc_client: Optional[RPCClient] = None) -> "AsyncRPCClient":
+        """
+        Build an async RPC client from a Config instance.
+
+        Args:
+            config: Configuration instance
+            rpc_client: Synchronous client to share cache, limiter and breaker with
+
+        Returns:
+            AsyncRPCClient configured with the rpc.* settings
+        """
+        return cls(
+            config.rpc_urls[0],
+            config.rpc_user,
+            config.rpc_password,
+            max_in_flight=config.rpc_max_in_flight,
+            timeout_secs=config.rpc_timeout_secs,
+            cassette=Cassette.open(config.rpc_cassette_path, config.rpc_cassette_mode),
+            rpc_client=rpc_client,
+        )
+
+    async def call(self, method: str, *params: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Make an RPC call.
+
+        Args:
+            method: RPC method name
+            *params: RPC method parameters
+            timeout: Per-call timeout in seconds (defaults to timeout_secs)
+
+        Returns:
+            RPC result
+
+        Raises:
+            PrunedBlockError: If attempting to access a pruned block
+            RuntimeError: If RPC returns an error
+            CircuitOpenError: If the shared circuit breaker is open
+            requests.RequestException: If the HTTP request fails or times out
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            result, error = self.cassette.replay(method, params)
+            if error is not None:
+                raise map_rpc_error(error, params)
+            return result
+
+        self._next_id += 1
+        payload = {
+            "jsonrpc": "2.0",
+            "id": self._next_id,
+            "method": method,
+            "params": list(params)
+        }
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        data = json.dumps(payload).encode()
+
+        async with self._semaphore:
+            if self._breaker is not None and not self._breaker.allow():
+                self.stats.record(method, 0.0, errors=1)
+                raise CircuitOpenError(f"RPC circuit open for {self.url}; not calling {method}")
+            start = time.monotonic()
+            try:
+                status, body = await asyncio.wait_for(
+                    self._post(data),
+                    timeout if timeout is not None else self.timeout_secs,
+                )
+            except asyncio.TimeoutError:
+                self.stats.record(method, time.monotonic() - start, len(data), errors=1)
+                self._record_unreachable()
+                raise requests.exceptions.Timeout(f"RPC {method} timed out")
+            except OSError as e:
+                self.stats.record(method, time.monotonic() - start, len(data), errors=1)
+                self._record_unreachable()
+                raise requests.exceptions.ConnectionError(str(e))
+            except BaseException:
+                # Cancelled: hand back a claimed half-open probe without judging the node
+                if self._breaker is not None:
+                    self._breaker.release()
+                raise
+        elapsed = time.monotonic() - start
+        if self._breaker is not None:
+            # The node answered, even if with an error
+            self._breaker.record_success()
+
+        try:
+            result = self._parse_reply(status, body, params)
+        except Exception as e:
+            self.stats.record(method, elapsed, len(data), len(body), errors=1)
+            if self.cassette is not None and hasattr(e, "rpc_error"):
+                self.cassette.record(method, params, error=e.rpc_error)
+            raise
+        self.stats.record(method, elapsed, len(data), len(body))
+        if self.cassette is not None:
+            self.cassette.record(method, params, result)
+        return result
+
+    def _record_unreachable(self) -> None:
+        """Count a timeout or connection failure against the shared breaker."""
+        if self._breaker is not None:
+            self._breaker.record_failure()
+            if self._breaker.state == "open":
+                logger.warning(f"RPC circuit opened for {self.url} after {self._breaker.failures} failures")
+
+    @staticmethod
+    def _parse_reply(status: int, body: bytes, params: Sequence[Any]) -> Any:
+        """Decode a JSON-RPC reply, raising the mapped error if it carries one."""
+        try:
+            result = json.loads(body)
+        except ValueError:
+            result = None
+        if not isinstance(result, dict):
+            raise requests.exceptions.HTTPError(f"HTTP {status} from RPC endpoint")
+        if "error" in result and result["error"]:
+            raise map_rpc_error(result["error"], params)
+        if status >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {status} from RPC endpoint")
+        return result["result"]
+
+    async def gather(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """
+        Run several RPC calls concurrently, bounded by max_in_flight.
+
+        Args:
+            calls: Sequence of (method, params) pairs
+
+        Returns:
+            List of results in call order; failed calls are represented by
+            their exception instance (same contract as RPCClient.batch)
+        """
+        return await asyncio.gather(
+            *(self.call(method, *params) for method, params in calls),
+            return_exceptions=True,
+        )
+
+    def call_many(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """
+        Synchronously run several RPC calls concurrently.
+
+        The calls execute on a private event loop thread, so this can be used
+        from the (threaded) synchronous runners. With a shared synchronous
+        client, cached answers are returned without a request, each request
+        first takes a token from its rate limiter, and several configured
+        nodes route the calls through ``RPCClient.batch`` for failover.
+
+        Args:
+            calls: Sequence of (method, params) pairs
+
+        Returns:
+            List of results in call order with exceptions in place of failures
+        """
+        if not calls:
+            return []
+        rpc_client = self.rpc_client
+        if rpc_client is None:
+            future = asyncio.run_coroutine_threadsafe(self.gather(calls), self._ensure_loop())
+            return future.result()
+        if len(rpc_client.pool.endpoints) > 1:
+            return rpc_client.batch(calls)
+
+        cache = rpc_client.cache
+        results: List[Any] = [MISS] * len(calls)
+        if cache is not None:
+            for idx, (method, params) in enumerate(calls):
+                if is_cacheable_method(method):
+                    results[idx] = cache.get(method, params)
+        pending = [idx for idx, result in enumerate(results) if result is MISS]
+        if not pending:
+            return results
+        missing = [calls[idx] for idx in pending]
+
+        if rpc_client.limiter is not None:
+            for method, _ in missing:
+                rpc_client.limiter.acquire(rpc_client.priority_class([method]))
+        future = asyncio.run_coroutine_threadsafe(self.gather(missing), self._ensure_loop())
+        for idx, (method, params), result in zip(pending, missing, future.result()):
+            results[idx] = result
+            if cache is not None and not isinstance(result, Exception) and is_cacheable_method(method):
+                cache.put(method, params, result)
+        return results
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the private event loop thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._loop.run_forever, name="async-rpc", daemon=True
+                )
+                thread.start()
+            return self._loop
+
+    async def _post(self, body: bytes) -> Tuple[int, bytes]:
+        """POST a request body over a pooled connection and return (status, body)."""
+        reader, writer = await self._acquire()
+        try:
+            request = (
+                f"POST {self.path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                f"Authorization: {self._auth_header}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: keep-alive\r\n\r\n"
+            ).encode() + body
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive, response_body = await self._read_response(reader)
+        except BaseException:
+            # Includes cancellation by wait_for(): the connection state is unknown
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, response_body
+
+    async def _acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Take an idle pooled connection or open a new one."""
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        ssl_context = ssl.create_default_context() if self.use_ssl else None
+        return await asyncio.open_connection(self.host, self.port, ssl=ssl_context)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bool, bytes]:
+        """Read one HTTP/1.1 response; returns (status, keep_alive, body)."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("RPC endpoint closed the connection")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        status = int(parts[1])
+        http_10 = parts[0].upper() == "HTTP/1.0"
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            return status, False, body
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if http_10 else connection != "close"
+        return status, keep_alive, body
@@ -0,0 +1,105 @@
+"""Fee statistics of recently confirmed blocks.
+
+A secondary fee signal taken from ``getblockstats`` instead of the mempool:
+what the last few blocks actually cleared at. It costs one small batched
+request per new block, since stats are kept per block hash and only blocks
+not seen before are fetched, so it stays cheap when dumping the mempool is
+not.
+"""
+
+from typing import Dict, List, Tuple
+from .constants import DEFAULT_BLOCK_VSIZE, WEIGHT_TO_VSIZE_RATIO
+from .logging import get_logger
+from .rpc import RPCClient
+
+logger = get_logger(__name__)
+
+# getblockstats feerate_percentiles points (vsize-weighted, sat/vB)
+CONFIRMED_PERCENTILES = (10, 25, 50, 75, 90)
+_STATS_FIELDS = ["height", "feerate_percentiles", "total_weight", "txs"]
+
+
+class ConfirmedFeeTracker:
+    """Fee percentiles of the last N blocks, refreshed on tip changes."""
+
+    def __init__(self, rpc_client: RPCClient, blocks: int):
+        """
+        Initialize confirmed fee tracker.
+
+        Args:
+            rpc_client: RPC client instance
+            blocks: Number of most recent blocks to summarize
+        """
+        self.rpc_client = rpc_client
+        self.blocks = max(1, int(blocks))
+        # block hash -> selected getblockstats fields, for the current window only
+        self._stats: Dict[str, Dict] = {}
+        self._window: List[Tuple[int, str]] = []
+        self.fetched = 0
+
+    def update(self) -> Dict:
+        """
+        Follow the chain tip and summarize the window of recent blocks.
+
+        Block hashes for the window are looked up in one batch (so reorgs
+        replace the blocks they orphan), then stats are fetched in one batch
+        for hashes not seen before.
+
+        Returns:
+            Summary dict (see summary)
+
+        Raises:
+            RuntimeError: If RPC returns an error
+            requests.RequestException: If HTTP request fails
+        """
+        tip = self.rpc_client.call("getblockcount")
+        if self._window and self._window[-1][0] == tip:
+            # Same height; a one-block reorg still changes the tip hash
+            if self.rpc_client.call("getbestblockhash") == self._window[-1][1]:
+                return self.summary()
+
+        heights = list(range(max(0, tip - self.blocks + 1), tip + 1))
+        hashes = self.rpc_client.batch([("getblockhash", [height]) for height in heights])
+        window = [
+            (height, block_hash) for height, block_hash in zip(heights, hashes)
+            if not isinstance(block_hash, Exception)
+        ]
+
+        missing = [block_hash for _, block_hash in window if block_hash not in self._stats]
+        if missing:
+            replies = self.rpc_client.batch([("getblockstats", [block_hash, _STATS_FIELDS]) for block_hash in missing])
+            for block_hash, reply in zip(missing, replies):
+                if isinstance(reply, Exception):
+                    logger.warning(f"getblockstats failed for {block_hash}: {reply}")
+                    continue
+                self._stats[block_hash] = reply
+            self.fetched += len(missing)
+
+        self._window = window
+        current = {block_hash for _, block_hash in window}
+        self._stats = {block_hash: stats for block_hash, stats in self._stats.items() if block_hash in current}
+        return self.summary()
+
+    def summary(self) -> Dict:
+        """
+        Summarize the blocks in the window.
+
+        Percentiles are averaged over blocks weighted by block weight, so
+        near-empty blocks count for little.
+
+        Returns:
+            Dict with tip_height, blocks (number summarized), p10..p90 in
+            sat/vB, and fullness (average share of a full block); only
+            tip_height and blocks when no stats are available
+        """
+        rows = [self._stats[block_hash] for _, block_hash in self._window if block_hash in self._stats]
+        result: Dict = {"tip_height": self._window[-1][0] if self._window else None, "blocks": len(rows)}
+        total_weight = sum(row.get("total_weight", 0) for row in rows)
+        if not rows or not total_weight:
+            return result
+        for pos, point in enumerate(CONFIRMED_PERCENTILES):
+            weighted = sum(row["feerate_percentiles"][pos] * row.get("total_weight", 0) for row in rows)
+            result[f"p{point}"] = round(weighted / total_weight, 2)
+        full_weight = DEFAULT_BLOCK_VSIZE * WEIGHT_TO_VSIZE_RATIO
+        result["fullness"] = round(total_weight / (full_weight * len(rows)), 3)
+        return result
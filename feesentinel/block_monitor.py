@@ -1,17 +1,42 @@
 """Block monitoring and reorg detection for event monitoring."""
 
-from typing import Dict, Optional, Tuple
-from .rpc import RPCClient, PrunedBlockError
+import requests
+from typing import Dict, List, Optional, Tuple
+from .rpc import RPCClient, PrunedBlockError, rpc_error_code
+from .block_parser import RawBlock, BlockParseError, parse_block
+from .async_rpc import AsyncRPCClient
 from .state_manager import StateManager
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# RPC_METHOD_NOT_FOUND: the node does not offer the wait RPCs
+_METHOD_NOT_FOUND = -32601
+# RPC_TYPE_ERROR and RPC_INVALID_PARAMETER: the node rejects the verbosity argument
+_VERBOSITY_ERROR_CODES = (-3, -8)
+
+
+def _rejects_verbosity(error: RuntimeError) -> bool:
+    """Return True if a getblock error means the node does not accept numeric verbosity."""
+    if rpc_error_code(error) in _VERBOSITY_ERROR_CODES:
+        return True
+    # Older nodes answer -1 "JSON value is not a boolean as expected"
+    message = str(error).lower()
+    return "boolean" in message or "verbosity" in message
+
 
 class BlockMonitor:
     """Monitors Bitcoin blocks and detects reorganizations."""
 
-    def __init__(self, rpc_client: RPCClient, state_manager: StateManager, max_reorg_depth: int = 6):
+    def __init__(
+        self,
+        rpc_client: RPCClient,
+        state_manager: StateManager,
+        max_reorg_depth: int = 6,
+        block_ingestion: str = "verbose",
+        async_client: Optional[AsyncRPCClient] = None,
+        longpoll: bool = False
+    ):
         """
         Initialize block monitor.
 
@@ -19,10 +44,24 @@ class BlockMonitor:
             rpc_client: RPC client instance
             state_manager: State manager instance
             max_reorg_depth: Maximum reorg depth to handle
+            block_ingestion: "verbose" to fetch whole decoded blocks (getblock
+                verbosity 3, with prevouts where supported), "rest" to fetch raw
+                blocks from the REST interface and parse them locally, or
+                "txids" to fetch only transaction IDs (getblock verbosity 1)
+            async_client: Optional async RPC client used to run independent
+                lookups concurrently instead of as one batch
+            longpoll: Wait for new blocks with waitforblockheight instead of
+                sleeping between getblockcount polls (see wait_for_new_block)
         """
         self.rpc_client = rpc_client
         self.state_manager = state_manager
         self.max_reorg_depth = max_reorg_depth
+        self.block_ingestion = block_ingestion
+        self.async_client = async_client
+        self.longpoll = longpoll
+        self._chain: Optional[str] = None
+        # Height seen by the last getblockcount, to tell catch-up from the tip
+        self.tip_height: Optional[int] = None
 
     def get_current_height(self) -> int:
         """
@@ -31,7 +70,57 @@ class BlockMonitor:
         Returns:
             Current block height
         """
-        return self.rpc_client.call("getblockcount")
+        self.tip_height = self.rpc_client.call("getblockcount")
+        return self.tip_height
+
+    def wait_for_new_block(self, timeout_secs: float) -> Optional[bool]:
+        """
+        Block on the node until a block above the last processed height arrives.
+
+        Uses waitforblockheight (or waitfornewblock before the first block is
+        processed), so new blocks are seen with near-zero latency without
+        repeated getblockcount polls.
+
+        Args:
+            timeout_secs: Maximum seconds the node should wait
+
+        Returns:
+            True if a new block is available, False on timeout, None if the
+            long-poll failed and the caller should fall back to sleeping
+        """
+        last_height = self.state_manager.get_last_height()
+        timeout_ms = max(1, int(timeout_secs * 1000))
+        try:
+            if last_height is None:
+                tip = self.rpc_client.call("waitfornewblock", timeout_ms)
+            else:
+                tip = self.rpc_client.call("waitforblockheight", last_height + 1, timeout_ms)
+        except RuntimeError as e:
+            if rpc_error_code(e) != _METHOD_NOT_FOUND:
+                # Transient node error: sleep this round and long-poll again next time
+                logger.warning(f"Long-poll failed: {e}")
+                return None
+            # Node does not support the wait RPCs: stop trying
+            logger.warning(f"Long-poll unavailable ({e}), falling back to polling")
+            self.longpoll = False
+            return None
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                logger.warning(f"Long-poll failed: {e}")
+                return None
+            # A proxy in front of the node may not expose the wait RPCs
+            logger.warning(f"Long-poll unavailable ({e}), falling back to polling")
+            self.longpoll = False
+            return None
+        except requests.RequestException as e:
+            logger.warning(f"Long-poll failed: {e}")
+            return None
+
+        if last_height is None:
+            # Nothing processed yet: get_new_blocks starts from the current tip
+            return True
+        height = tip.get("height", -1) if isinstance(tip, dict) else -1
+        return height > last_height
 
     def get_block_hash(self, height: int) -> str:
         """
@@ -45,12 +134,43 @@ class BlockMonitor:
         """
         return self.rpc_client.call("getblockhash", height)
 
-    def get_block_info(self, block_hash: str) -> Dict:
+    def get_block_hashes(self, heights: List[int]) -> Dict[int, str]:
+        """
+        Get block hashes for several heights in one batched (or concurrent) request.
+
+        Args:
+            heights: Block heights
+
+        Returns:
+            Dictionary mapping height to block hash
+
+        Raises:
+            PrunedBlockError: If any of the heights is pruned
+            RuntimeError: If RPC returns any other error
+        """
+        calls = [("getblockhash", [height]) for height in heights]
+        if self.async_client is not None:
+            replies = self.async_client.call_many(calls)
+        else:
+            replies = self.rpc_client.batch(calls)
+        hashes = {}
+        for height, reply in zip(heights, replies):
+            if isinstance(reply, PrunedBlockError):
+                reply.height = height
+                raise reply
+            if isinstance(reply, Exception):
+                raise reply
+            hashes[height] = reply
+        return hashes
+
+    def get_block_info(self, block_hash: str, verbosity: int = 1) -> Dict:
         """
         Get block information.
 
         Args:
             block_hash: Block hash
+            verbosity: getblock verbosity (1 = txids, 2 = decoded transactions,
+                3 = decoded transactions with prevouts)
 
         Returns:
             Block information dictionary
@@ -58,8 +178,79 @@ class BlockMonitor:
         Raises:
             PrunedBlockError: If block is pruned and not available
         """
-        return self.rpc_client.call("getblock", block_hash, 1)  # verbosity=1 for JSON
+        return self.rpc_client.call("getblock", block_hash, verbosity)
+
+    def get_decoded_block(self, block_hash: str) -> Optional[Dict]:
+        """
+        Get a block with all transactions decoded in a single call.
+
+        Requests verbosity 3; nodes that predate it (v22 and older) answer with
+        verbosity 2 output, which lacks input prevouts. Nodes that reject
+        numeric verbosity entirely disable decoded ingestion for this monitor;
+        any other node error is raised so the block is retried.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            Block information dictionary whose "tx" entries are transaction
+            dictionaries, or None if the node cannot return decoded blocks
+
+        Raises:
+            PrunedBlockError: If block is pruned and not available
+            RuntimeError: If the node fails the call for another reason
+        """
+        try:
+            block_info = self.get_block_info(block_hash, 3)
+        except PrunedBlockError:
+            raise
+        except RuntimeError as e:
+            if not _rejects_verbosity(e):
+                raise
+            logger.warning(
+                f"Node does not support decoded getblock ({e}); "
+                f"falling back to per-transaction lookups"
+            )
+            self.block_ingestion = "txids"
+            return None
+
+        txs = block_info.get("tx", [])
+        if txs and not isinstance(txs[0], dict):
+            self.block_ingestion = "txids"
+            return None
+        return block_info
     
+    def get_raw_block(self, block_hash: str) -> Optional[RawBlock]:
+        """
+        Get a block through the REST interface and parse it locally.
+
+        Falls back to "verbose" ingestion if REST is unavailable or the
+        payload cannot be parsed.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            RawBlock whose "tx" entries are lazy transaction views, or None if
+            REST ingestion is not usable
+
+        Raises:
+            PrunedBlockError: If block is pruned and not available
+        """
+        try:
+            if self._chain is None:
+                self._chain = self.rpc_client.call("getblockchaininfo").get("chain", "main")
+            raw = self.rpc_client.get_rest_block(block_hash)
+            return parse_block(raw, self._chain)
+        except PrunedBlockError:
+            raise
+        except (requests.exceptions.RequestException, BlockParseError) as e:
+            logger.warning(
+                f"REST block fetch unavailable ({e}); falling back to decoded getblock"
+            )
+            self.block_ingestion = "verbose"
+            return None
+
     def find_earliest_available_block(self, start_height: int, max_search_depth: int = 1000) -> Optional[int]:
         """
         Find the earliest available block height starting from a given height.
@@ -124,33 +315,46 @@ class BlockMonitor:
         
         # Check last few blocks for reorgs (up to max_reorg_depth)
         check_start = max(last_height - self.max_reorg_depth + 1, 0)
+        stored_hashes = {}
         for height in range(check_start, last_height + 1):
             stored_hash = self.state_manager.get_block_hash(height)
             if stored_hash:
-                try:
-                    current_hash = self.get_block_hash(height)
-                    if stored_hash != current_hash:
-                        reorg_detected = True
-                        if reorg_start_height is None:
-                            reorg_start_height = height
-                        logger.warning(
-                            f"Reorg detected: height {height} hash mismatch "
-                            f"(stored: {stored_hash[:16]}..., current: {current_hash[:16]}...)"
-                        )
-                except PrunedBlockError:
-                    # Block is pruned, can't verify reorg - reset to current height
-                    logger.warning(
-                        f"Stored block {height} is pruned, cannot verify reorg. "
-                        f"Resetting state to current height {current_height}"
-                    )
-                    # Clear state and start from current height
-                    self.state_manager.rollback_from_height(0)  # Clear all blocks
-                    return current_height, self.get_block_hash(current_height), False
+                stored_hashes[height] = stored_hash
+
+        # Fetch all current hashes in a single round trip
+        try:
+            current_hashes = self.get_block_hashes(list(stored_hashes))
+        except PrunedBlockError as e:
+            # Block is pruned, can't verify reorg - reset to current height
+            logger.warning(
+                f"Stored block {e.height} is pruned, cannot verify reorg. "
+                f"Resetting state to current height {current_height}"
+            )
+            # Clear state and start from current height
+            self.state_manager.rollback_from_height(0)  # Clear all blocks
+            return current_height, self.get_block_hash(current_height), False
+
+        for height, stored_hash in stored_hashes.items():
+            current_hash = current_hashes[height]
+            if stored_hash != current_hash:
+                reorg_detected = True
+                if reorg_start_height is None:
+                    reorg_start_height = height
+                logger.warning(
+                    f"Reorg detected: height {height} hash mismatch "
+                    f"(stored: {stored_hash[:16]}..., current: {current_hash[:16]}...)"
+                )
         
         # Handle reorg
         if reorg_detected and reorg_start_height is not None:
             logger.info(f"Rolling back state from height {reorg_start_height}")
             self.state_manager.rollback_from_height(reorg_start_height)
+            # Cached results of the disconnected blocks no longer describe the chain
+            cache = getattr(self.rpc_client, "cache", None)
+            if cache is not None:
+                cache.invalidate_blocks(
+                    stored_hash for height, stored_hash in stored_hashes.items() if height >= reorg_start_height
+                )
             # Return the reorg start height as the next block to process
             try:
                 return reorg_start_height, self.get_block_hash(reorg_start_height), True
@@ -215,12 +419,19 @@ class BlockMonitor:
             block_hash: Block hash
 
         Returns:
-            Block information dictionary
+            Block information mapping. In "verbose" and "rest" ingestion modes
+            the "tx" entries are decoded transaction mappings, otherwise txids.
             
         Raises:
             PrunedBlockError: If block is pruned and not available
         """
-        block_info = self.get_block_info(block_hash)
+        block_info = None
+        if self.block_ingestion == "rest":
+            block_info = self.get_raw_block(block_hash)
+        if block_info is None and self.block_ingestion == "verbose":
+            block_info = self.get_decoded_block(block_hash)
+        if block_info is None:
+            block_info = self.get_block_info(block_hash)
         self.state_manager.mark_block_processed(height, block_hash)
         
         logger.info(
@@ -1,6 +1,7 @@
 """Fee bucket classification for Bitcoin fee monitoring."""
 
 from dataclasses import dataclass
+from typing import Dict
 from .constants import EXTREME_BUCKET_MAX_SATVB
 
 
@@ -74,9 +75,26 @@ FEE_BUCKETS = [
 ]
 
 
+def snapshot_fee(snapshot: Dict, metric: str = "p50") -> int:
+    """
+    Pick the fee value that buckets, alerts and rolling stats key off.
+
+    Args:
+        snapshot: Result of current_fee_percentiles
+        metric: "p50" or "next_block_median" (falls back to p50 when the
+            snapshot has no projected blocks)
+
+    Returns:
+        Fee in sat/vB
+    """
+    if metric == "next_block_median" and "next_block_median" in snapshot:
+        return snapshot["next_block_median"]
+    return snapshot["p50"]
+
+
 def classify_fee_bucket(p50_satvb: int) -> FeeBucket:
     """
-    Map p50 sat/vB into a named fee bucket.
+    Map p50 sat/vB (or the next-block median, see snapshot_fee) into a named fee bucket.
     Falls back to the highest bucket if p50 exceeds all configured ranges.
     
     Args:
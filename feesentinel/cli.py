@@ -57,6 +57,17 @@ def main():
         default="all",
         help="Event filter mode (default: all)"
     )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record-rpc",
+        metavar="PATH",
+        help="Record all RPC traffic to a cassette file"
+    )
+    cassette_group.add_argument(
+        "--replay-rpc",
+        metavar="PATH",
+        help="Answer all RPC calls from a recorded cassette (no node needed)"
+    )
 
     args = parser.parse_args()
     
@@ -78,6 +89,11 @@ def main():
     setup_logging(config)
     logger = get_logger(__name__)
 
+    if args.record_rpc:
+        config.set_rpc_cassette("record", args.record_rpc)
+    elif args.replay_rpc:
+        config.set_rpc_cassette("replay", args.replay_rpc)
+
     # Optional structured output writer for JSONL records
     structured_writer = None
     structured_cfg = config.structured_output_config
@@ -88,6 +104,7 @@ def main():
             blocks_filename=structured_cfg["blocks_filename"],
             fee_alerts_filename=structured_cfg["fee_alerts_filename"],
             fee_snapshots_filename=structured_cfg["fee_snapshots_filename"],
+            rpc_stats_filename=structured_cfg["rpc_stats_filename"],
         )
 
     # Check if event monitoring mode is enabled
@@ -4,6 +4,29 @@ import os
 import yaml
 from pathlib import Path
 from typing import Dict, Any, List
+from .constants import (
+    DEFAULT_RPC_BATCH_MAX_ITEMS,
+    DEFAULT_RPC_BATCH_MAX_BYTES,
+    DEFAULT_RPC_MAX_IN_FLIGHT,
+    DEFAULT_RPC_TIMEOUT_SECS,
+    DEFAULT_ZMQ_QUIET_SECS,
+    DEFAULT_ZMQ_MAX_WAIT_SECS,
+    DEFAULT_LONGPOLL_TIMEOUT_SECS,
+    DEFAULT_RPC_CACHE_MAX_BYTES,
+    DEFAULT_FEE_PERCENTILES,
+    FEE_METRICS,
+    BLOCK_INGESTION_MODES,
+    ROLLING_METRICS,
+    DEFAULT_RPC_TIP_TTL_SECS,
+    DEFAULT_RPC_RATE_PER_SEC,
+    DEFAULT_RPC_TIMEOUT_MIN_SECS,
+    DEFAULT_RPC_TIMEOUT_MAX_SECS,
+    DEFAULT_RPC_TIMEOUT_MULTIPLIER,
+    DEFAULT_RPC_BREAKER_FAILURES,
+    DEFAULT_RPC_BREAKER_RESET_SECS,
+    DEFAULT_RPC_RATE_BURST,
+    RPC_CASSETTE_MODES,
+)
 
 
 class Config:
@@ -80,22 +103,85 @@ class Config:
         default_config = {
             "rpc": {
                 "url": "http://127.0.0.1:8332",
+                "urls": [],
                 "user": "bitcoin",
-                "password": ""
+                "password": "",
+                "batch_max_items": DEFAULT_RPC_BATCH_MAX_ITEMS,
+                "batch_max_bytes": DEFAULT_RPC_BATCH_MAX_BYTES,
+                "async_enabled": False,
+                "max_in_flight": DEFAULT_RPC_MAX_IN_FLIGHT,
+                "timeout_secs": DEFAULT_RPC_TIMEOUT_SECS,
+                "cassette": {
+                    "mode": "off",
+                    "path": "cassettes/rpc.jsonl.gz"
+                },
+                "cache": {
+                    "enabled": True,
+                    "max_bytes": DEFAULT_RPC_CACHE_MAX_BYTES,
+                    "disk_dir": ""
+                },
+                "coalesce": {
+                    "enabled": True,
+                    "tip_ttl_secs": DEFAULT_RPC_TIP_TTL_SECS
+                },
+                "resilience": {
+                    "timeout_min_secs": DEFAULT_RPC_TIMEOUT_MIN_SECS,
+                    "timeout_max_secs": DEFAULT_RPC_TIMEOUT_MAX_SECS,
+                    "timeout_multiplier": DEFAULT_RPC_TIMEOUT_MULTIPLIER,
+                    "hedge_enabled": False,
+                    "breaker_failures": DEFAULT_RPC_BREAKER_FAILURES,
+                    "breaker_reset_secs": DEFAULT_RPC_BREAKER_RESET_SECS
+                },
+                "rate_limit": {
+                    "enabled": False,
+                    "per_sec": DEFAULT_RPC_RATE_PER_SEC,
+                    "burst": DEFAULT_RPC_RATE_BURST,
+                    "classes": {
+                        "tip": {"per_sec": 0, "burst": 1},
+                        "fees": {"per_sec": 10, "burst": 5},
+                        "backfill": {"per_sec": 25, "burst": 8}
+                    }
+                }
+            },
+            "zmq": {
+                "enabled": False,
+                "hashblock": "tcp://127.0.0.1:28332",
+                "rawblock": "",
+                "rawtx": "",
+                "sequence": "",
+                "quiet_secs": DEFAULT_ZMQ_QUIET_SECS,
+                "max_wait_secs": DEFAULT_ZMQ_MAX_WAIT_SECS
             },
             "polling": {
                 "poll_secs": 60,
-                "rolling_window_mins": 60
+                "poll_min_secs": None,
+                "poll_max_secs": None,
+                "rolling_window_mins": 60,
+                "rolling_windows": [],
+                "rolling_ewma_mins": [],
+                "rolling_warm_start": True,
+                "mempool_streaming": True,
+                "mempool_tracker": False,
+                "fee_percentiles": list(DEFAULT_FEE_PERCENTILES),
+                "fee_backend": "auto",
+                "projected_blocks": 0,
+                "package_feerates": False,
+                "fee_histogram": True,
+                "confirmed_blocks": 0,
+                "fee_metric": "p50"
             },
             "alerts": {
                 "webhook_url": "",
-                "min_change_secs": 300
+                "min_change_secs": 300,
+                "rolling_fields": []
             },
             "spike_detection": {
                 "enabled": True,
                 "spike_pct": 35,
                 "min_alert_satvb": 15,
                 "cooldown_minutes": 20,
+                "confirmed_pct": 0,
+                "baseline": "",
                 "adjustment_rules": {
                     "target_sat_vb_floor": 12,
                     "bump_pct_if_queue_backlog": 20,
@@ -126,6 +212,11 @@ class Config:
                 "poll_interval_secs": 10,
                 "start_height": None,
                 "max_reorg_depth": 6,
+                "block_ingestion": "verbose",
+                "longpoll": {
+                    "enabled": False,
+                    "timeout_secs": DEFAULT_LONGPOLL_TIMEOUT_SECS
+                },
                 "filters": {
                     "treasury": {
                         "enabled": False,
@@ -169,6 +260,7 @@ class Config:
                 "blocks_filename": "blocks.jsonl",
                 "fee_alerts_filename": "fee_alerts.jsonl",
                 "fee_snapshots_filename": "fee_snapshots.jsonl",
+                "rpc_stats_filename": "rpc_stats.jsonl",
             }
         }
         with open(path, 'w') as f:
@@ -179,6 +271,12 @@ class Config:
         # RPC settings
         if os.getenv("FS_RPC_URL"):
             self._raw.setdefault("rpc", {})["url"] = os.getenv("FS_RPC_URL")
+        if os.getenv("FS_RPC_URLS"):
+            self._raw.setdefault("rpc", {})["urls"] = os.getenv("FS_RPC_URLS")
+        if os.getenv("FS_RPC_CASSETTE_MODE"):
+            self._raw.setdefault("rpc", {}).setdefault("cassette", {})["mode"] = os.getenv("FS_RPC_CASSETTE_MODE")
+        if os.getenv("FS_RPC_CASSETTE_PATH"):
+            self._raw.setdefault("rpc", {}).setdefault("cassette", {})["path"] = os.getenv("FS_RPC_CASSETTE_PATH")
         if os.getenv("FS_RPC_USER"):
             self._raw.setdefault("rpc", {})["user"] = os.getenv("FS_RPC_USER")
         if os.getenv("FS_RPC_PASS"):
@@ -236,6 +334,14 @@ class Config:
     def rpc_url(self) -> str:
         return self._raw.get("rpc", {}).get("url", "http://127.0.0.1:8332")
     
+    @property
+    def rpc_urls(self) -> List[str]:
+        """RPC URLs of all nodes; the first is the primary. Falls back to rpc.url."""
+        urls = self._raw.get("rpc", {}).get("urls") or []
+        if isinstance(urls, str):
+            urls = [url.strip() for url in urls.split(",") if url.strip()]
+        return list(urls) or [self.rpc_url]
+
     @property
     def rpc_user(self) -> str:
         return self._raw.get("rpc", {}).get("user", "bitcoin")
@@ -244,13 +350,245 @@ class Config:
     def rpc_password(self) -> str:
         return self._raw.get("rpc", {}).get("password", "")
     
+    @property
+    def rpc_batch_max_items(self) -> int:
+        return int(self._raw.get("rpc", {}).get("batch_max_items", DEFAULT_RPC_BATCH_MAX_ITEMS))
+    
+    @property
+    def rpc_batch_max_bytes(self) -> int:
+        return int(self._raw.get("rpc", {}).get("batch_max_bytes", DEFAULT_RPC_BATCH_MAX_BYTES))
+    
+    @property
+    def rpc_async_enabled(self) -> bool:
+        return bool(self._raw.get("rpc", {}).get("async_enabled", False))
+    
+    @property
+    def rpc_max_in_flight(self) -> int:
+        return int(self._raw.get("rpc", {}).get("max_in_flight", DEFAULT_RPC_MAX_IN_FLIGHT))
+    
+    @property
+    def rpc_timeout_secs(self) -> float:
+        return float(self._raw.get("rpc", {}).get("timeout_secs", DEFAULT_RPC_TIMEOUT_SECS))
+    
+    @property
+    def zmq_config(self) -> Dict[str, Any]:
+        """Get ZMQ notification configuration with defaults.
+
+        Topics with an empty endpoint are not subscribed.
+        """
+        cfg = self._raw.get("zmq", {})
+        endpoints = {
+            topic: cfg[topic]
+            for topic in ("hashblock", "rawblock", "rawtx", "sequence")
+            if cfg.get(topic)
+        }
+        if "hashblock" not in cfg and not endpoints:
+            endpoints["hashblock"] = "tcp://127.0.0.1:28332"
+        return {
+            "enabled": cfg.get("enabled", False),
+            "endpoints": endpoints,
+            "quiet_secs": cfg.get("quiet_secs", DEFAULT_ZMQ_QUIET_SECS),
+            "max_wait_secs": cfg.get("max_wait_secs", DEFAULT_ZMQ_MAX_WAIT_SECS),
+        }
+
+    @property
+    def rpc_cassette_mode(self) -> str:
+        """RPC cassette mode: "off", "record" or "replay"."""
+        mode = self._raw.get("rpc", {}).get("cassette", {}).get("mode", "off")
+        if mode not in RPC_CASSETTE_MODES:
+            raise ValueError(f"Invalid rpc.cassette.mode: {mode}")
+        return mode
+
+    @property
+    def rpc_cassette_path(self) -> str:
+        return self._raw.get("rpc", {}).get("cassette", {}).get("path", "cassettes/rpc.jsonl.gz")
+
+    @property
+    def rpc_cache_enabled(self) -> bool:
+        return bool(self._raw.get("rpc", {}).get("cache", {}).get("enabled", True))
+
+    @property
+    def rpc_cache_max_bytes(self) -> int:
+        return int(self._raw.get("rpc", {}).get("cache", {}).get("max_bytes", DEFAULT_RPC_CACHE_MAX_BYTES))
+
+    @property
+    def rpc_cache_disk_dir(self) -> str:
+        """Directory for the persistent cache tier ("" keeps the cache in memory only)."""
+        return self._raw.get("rpc", {}).get("cache", {}).get("disk_dir", "")
+
+    @property
+    def rpc_coalesce_enabled(self) -> bool:
+        return bool(self._raw.get("rpc", {}).get("coalesce", {}).get("enabled", True))
+
+    @property
+    def rpc_tip_ttl_secs(self) -> float:
+        return float(self._raw.get("rpc", {}).get("coalesce", {}).get("tip_ttl_secs", DEFAULT_RPC_TIP_TTL_SECS))
+
+    @property
+    def rpc_resilience_config(self) -> Dict[str, Any]:
+        """
+        Adaptive timeout, hedging and circuit breaker settings.
+
+        Returns:
+            Dictionary with timeout_min_secs, timeout_max_secs,
+            timeout_multiplier, hedge_enabled, breaker_failures and
+            breaker_reset_secs
+        """
+        cfg = self._raw.get("rpc", {}).get("resilience", {})
+        return {
+            "timeout_min_secs": float(cfg.get("timeout_min_secs", DEFAULT_RPC_TIMEOUT_MIN_SECS)),
+            "timeout_max_secs": float(cfg.get("timeout_max_secs", DEFAULT_RPC_TIMEOUT_MAX_SECS)),
+            "timeout_multiplier": float(cfg.get("timeout_multiplier", DEFAULT_RPC_TIMEOUT_MULTIPLIER)),
+            "hedge_enabled": bool(cfg.get("hedge_enabled", False)),
+            "breaker_failures": int(cfg.get("breaker_failures", DEFAULT_RPC_BREAKER_FAILURES)),
+            "breaker_reset_secs": float(cfg.get("breaker_reset_secs", DEFAULT_RPC_BREAKER_RESET_SECS)),
+        }
+
+    @property
+    def rpc_rate_limit_config(self) -> Dict[str, Any]:
+        """
+        Priority-aware RPC rate limiting configuration.
+
+        Returns:
+            Dictionary with enabled, per_sec and burst for the node as a whole,
+            and classes mapping tip/fees/backfill to {per_sec, burst}
+            (per_sec 0 = only bounded by the node budget)
+        """
+        cfg = self._raw.get("rpc", {}).get("rate_limit", {})
+        classes = {}
+        for name, budget in (cfg.get("classes") or {}).items():
+            if name not in ("tip", "fees", "backfill"):
+                raise ValueError(f"Invalid rpc.rate_limit class: {name}")
+            classes[name] = {
+                "per_sec": float(budget.get("per_sec", 0)),
+                "burst": float(budget.get("burst", 1)),
+            }
+        return {
+            "enabled": bool(cfg.get("enabled", False)),
+            "per_sec": float(cfg.get("per_sec", DEFAULT_RPC_RATE_PER_SEC)),
+            "burst": float(cfg.get("burst", DEFAULT_RPC_RATE_BURST)),
+            "classes": classes,
+        }
+
     @property
     def poll_secs(self) -> int:
         return int(self._raw.get("polling", {}).get("poll_secs", 60))
     
+    @property
+    def poll_min_secs(self) -> float:
+        """Fee poll interval during volatility and after blocks (capped at poll_secs; unset: poll_secs)."""
+        value = self._raw.get("polling", {}).get("poll_min_secs")
+        return float(self.poll_secs if value is None else value)
+
+    @property
+    def poll_max_secs(self) -> float:
+        """Fee poll interval ceiling in a flat market (at least poll_secs; unset: poll_secs)."""
+        value = self._raw.get("polling", {}).get("poll_max_secs")
+        return float(self.poll_secs if value is None else value)
+
     @property
     def rolling_window_mins(self) -> int:
         return int(self._raw.get("polling", {}).get("rolling_window_mins", 60))
+
+    @property
+    def rolling_windows_mins(self) -> List[float]:
+        """All rolling windows in minutes: rolling_window_mins plus polling.rolling_windows."""
+        windows = {float(self.rolling_window_mins)}
+        for minutes in self._raw.get("polling", {}).get("rolling_windows") or []:
+            if float(minutes) <= 0:
+                raise ValueError(f"Invalid polling.rolling_windows entry: {minutes}")
+            windows.add(float(minutes))
+        return sorted(windows)
+
+    @property
+    def rolling_ewma_mins(self) -> List[float]:
+        """EWMA half-lives in minutes tracked next to the rolling windows."""
+        half_lives = [float(minutes) for minutes in self._raw.get("polling", {}).get("rolling_ewma_mins") or []]
+        if any(minutes <= 0 for minutes in half_lives):
+            raise ValueError(f"Invalid polling.rolling_ewma_mins: {half_lives}")
+        return sorted(set(half_lives))
+
+    @property
+    def rolling_warm_start(self) -> bool:
+        """Reload rolling windows from the tail of fee_snapshots.jsonl on startup."""
+        return bool(self._raw.get("polling", {}).get("rolling_warm_start", True))
+
+    @property
+    def rolling_metrics(self) -> List[str]:
+        """Snapshot values tracked over rolling windows (ROLLING_METRICS plus fee_metric)."""
+        metrics = list(ROLLING_METRICS)
+        if self.fee_metric not in metrics:
+            metrics.append(self.fee_metric)
+        return metrics
+
+    def _rolling_key(self, key: str, setting: str) -> str:
+        """Validate a "<window>/<metric>" key against the tracked windows and metrics."""
+        label, _, metric = key.partition("/")
+        labels = {f"{minutes:g}m" for minutes in self.rolling_windows_mins}
+        labels.update(f"ewma_{minutes:g}m" for minutes in self.rolling_ewma_mins)
+        if label not in labels or metric not in self.rolling_metrics:
+            raise ValueError(f"Invalid {setting}: {key} (windows: {sorted(labels)}, metrics: {self.rolling_metrics})")
+        return key
+
+    @property
+    def mempool_streaming(self) -> bool:
+        """Scan getrawmempool replies incrementally instead of decoding the full dict."""
+        return bool(self._raw.get("polling", {}).get("mempool_streaming", True))
+
+    @property
+    def mempool_tracker(self) -> bool:
+        """Keep a local mempool mirror updated from mempool_sequence diffs."""
+        return bool(self._raw.get("polling", {}).get("mempool_tracker", False))
+
+    @property
+    def fee_percentiles(self) -> List[float]:
+        """Percentile points of fee snapshots; p25, p50, p75, p90 and p95 are always included."""
+        points = set(DEFAULT_FEE_PERCENTILES)
+        for point in self._raw.get("polling", {}).get("fee_percentiles") or []:
+            point = float(point)
+            if not 0 <= point <= 100:
+                raise ValueError(f"Invalid polling.fee_percentiles point: {point}")
+            points.add(int(point) if point.is_integer() else point)
+        return sorted(points)
+
+    @property
+    def fee_backend(self) -> str:
+        """Percentile engine: "numpy", "python", or "auto" (numpy when installed)."""
+        backend = self._raw.get("polling", {}).get("fee_backend", "auto")
+        if backend not in ("auto", "numpy", "python"):
+            raise ValueError(f"Invalid polling.fee_backend: {backend}")
+        return backend
+
+    @property
+    def package_feerates(self) -> bool:
+        """Rank transactions by effective ancestor/descendant package feerate instead of their own."""
+        return bool(self._raw.get("polling", {}).get("package_feerates", False))
+
+    @property
+    def fee_histogram(self) -> bool:
+        """Add a log-scale fee histogram to every fee snapshot."""
+        return bool(self._raw.get("polling", {}).get("fee_histogram", True))
+
+    @property
+    def confirmed_blocks(self) -> int:
+        """Number of recent blocks summarized with getblockstats per snapshot (0 = off)."""
+        return max(0, int(self._raw.get("polling", {}).get("confirmed_blocks", 0)))
+
+    @property
+    def fee_metric(self) -> str:
+        """Fee value buckets, alerts and rolling stats key off: "p50" or "next_block_median"."""
+        metric = self._raw.get("polling", {}).get("fee_metric", "p50")
+        if metric not in FEE_METRICS:
+            raise ValueError(f"Invalid polling.fee_metric: {metric}")
+        return metric
+
+    @property
+    def projected_blocks(self) -> int:
+        """Number of next blocks projected per snapshot (0 = off; at least 1 for next_block_median)."""
+        blocks = int(self._raw.get("polling", {}).get("projected_blocks", 0))
+        if self.fee_metric == "next_block_median":
+            blocks = max(1, blocks)
+        return max(0, blocks)
     
     @property
     def alert_webhook_url(self) -> str:
@@ -259,6 +597,14 @@ class Config:
     @property
     def alert_min_change_secs(self) -> int:
         return int(self._raw.get("alerts", {}).get("min_change_secs", 300))
+
+    @property
+    def alert_rolling_fields(self) -> List[str]:
+        """Window/metric pairs (e.g. "1440m/p90") added to bucket-change alerts."""
+        return [
+            self._rolling_key(str(key), "alerts.rolling_fields")
+            for key in self._raw.get("alerts", {}).get("rolling_fields") or []
+        ]
     
     @property
     def spike_detection_config(self) -> Dict[str, Any]:
@@ -269,6 +615,12 @@ class Config:
             "spike_pct": int(cfg.get("spike_pct", 35)),
             "min_alert_satvb": int(cfg.get("min_alert_satvb", 15)),
             "cooldown_minutes": int(cfg.get("cooldown_minutes", 20)),
+            "confirmed_pct": int(cfg.get("confirmed_pct", 0)),
+            # Window/metric pair spikes are measured against; default: the main window of the fee metric
+            "baseline": self._rolling_key(
+                cfg.get("baseline") or f"{self.rolling_window_mins:g}m/{self.fee_metric}",
+                "spike_detection.baseline",
+            ),
             "adjustment_rules": {
                 "target_sat_vb_floor": int(cfg.get("adjustment_rules", {}).get("target_sat_vb_floor", 12)),
                 "bump_pct_if_queue_backlog": int(cfg.get("adjustment_rules", {}).get("bump_pct_if_queue_backlog", 20)),
@@ -341,8 +693,13 @@ class Config:
             "blocks_filename": cfg.get("blocks_filename", "blocks.jsonl"),
             "fee_alerts_filename": cfg.get("fee_alerts_filename", "fee_alerts.jsonl"),
             "fee_snapshots_filename": cfg.get("fee_snapshots_filename", "fee_snapshots.jsonl"),
+            "rpc_stats_filename": cfg.get("rpc_stats_filename", "rpc_stats.jsonl"),
         }
 
+    def set_rpc_cassette(self, mode: str, path: str) -> None:
+        """Apply CLI overrides for RPC cassette record/replay."""
+        self._raw.setdefault("rpc", {})["cassette"] = {"mode": mode, "path": path}
+
     def set_event_filter_mode(self, mode: str) -> None:
         """Persist CLI overrides for event filter modes."""
         event_cfg = self._raw.setdefault("event_watcher", {})
@@ -351,6 +708,14 @@ class Config:
             filter_cfg = filters.setdefault(filter_name, {})
             filter_cfg["enabled"] = (filter_name == mode)
 
+    @property
+    def block_ingestion(self) -> str:
+        """How the event watcher fetches blocks: "verbose", "rest" or "txids"."""
+        mode = self._raw.get("event_watcher", {}).get("block_ingestion", "verbose")
+        if mode not in BLOCK_INGESTION_MODES:
+            raise ValueError(f"Invalid event_watcher.block_ingestion: {mode}")
+        return mode
+
     @property
     def event_watcher_config(self) -> Dict[str, Any]:
         """Get event monitoring configuration with defaults."""
@@ -369,6 +734,11 @@ class Config:
             "poll_interval_secs": event_config.get("poll_interval_secs", 10),
             "start_height": event_config.get("start_height"),
             "max_reorg_depth": event_config.get("max_reorg_depth", 6),
+            "block_ingestion": self.block_ingestion,
+            "longpoll": {
+                "enabled": event_config.get("longpoll", {}).get("enabled", False),
+                "timeout_secs": event_config.get("longpoll", {}).get("timeout_secs", DEFAULT_LONGPOLL_TIMEOUT_SECS)
+            },
             "filters": {
                 "treasury": {
                     "enabled": event_config.get("filters", {}).get("treasury", {}).get("enabled", False),
@@ -30,10 +30,43 @@ DEFAULT_CONNECTION_RETRY_DELAY_SECS = 10
 
 # Bitcoin RPC defaults
 MAX_CONFIRMATIONS = 9_999_999  # Effectively unconfirmed + all confirmed
+DEFAULT_RPC_BATCH_MAX_ITEMS = 250  # Calls per JSON-RPC batch request
+DEFAULT_RPC_BATCH_MAX_BYTES = 16_777_216  # 16MB estimated response per batch
+DEFAULT_RPC_BATCH_ITEM_BYTES = 4096  # Response size guess for methods not seen yet
+DEFAULT_RPC_MAX_IN_FLIGHT = 8  # Concurrent requests for the async RPC client
+DEFAULT_RPC_TIMEOUT_SECS = 30  # Per-call timeout (sync: until a method's latency is known)
+DEFAULT_RPC_TIMEOUT_MIN_SECS = 2  # Floor of adaptive per-method timeouts
+DEFAULT_RPC_TIMEOUT_MAX_SECS = 120  # Ceiling of adaptive timeouts; also bounds long-polls
+DEFAULT_RPC_TIMEOUT_MULTIPLIER = 4.0  # Adaptive timeout = observed p99 latency x this
+DEFAULT_RPC_CONNECT_TIMEOUT_SECS = 5  # TCP connect timeout for RPC requests
+DEFAULT_RPC_BREAKER_FAILURES = 5  # Consecutive failures that open an endpoint's circuit
+DEFAULT_RPC_BREAKER_RESET_SECS = 30  # Open circuit cool-down before a probe request
+DEFAULT_RPC_ENDPOINT_RETRY_SECS = 30  # Skip an unreachable node for this long
+DEFAULT_RPC_HEALTH_CHECK_SECS = 60  # Re-check each node's IBD state this often
+RPC_CASSETTE_MODES = ("off", "record", "replay")  # rpc.cassette.mode values
+DEFAULT_RPC_CACHE_MAX_BYTES = 67_108_864  # 64MB of cached immutable RPC results
+DEFAULT_RPC_TIP_TTL_SECS = 1.0  # Reuse getblockcount & co. answers for this long
+DEFAULT_RPC_RATE_PER_SEC = 40  # Requests/s to the node when rate limiting is enabled
+DEFAULT_RPC_RATE_BURST = 16  # Matches bitcoind's default -rpcworkqueue
+
+# ZMQ notification defaults
+DEFAULT_ZMQ_QUIET_SECS = 1800  # No message for this long: fall back to polling
+DEFAULT_ZMQ_MAX_WAIT_SECS = 60  # Safety poll interval while ZMQ is healthy
+DEFAULT_LONGPOLL_TIMEOUT_SECS = 30  # waitforblockheight timeout (keep <= bitcoind -rpcservertimeout)
 
 # Fee bucket limits
 EXTREME_BUCKET_MAX_SATVB = 10_000  # Practical cap for extreme bucket
 
 # Percentile calculation
 PERCENTILE_SCALE = 100.0  # Percentile scale (0-100)
+DEFAULT_FEE_PERCENTILES = (25, 50, 75, 90, 95)  # Always reported by fee snapshots
+DEFAULT_BLOCK_VSIZE = 1_000_000  # 4M weight units per block
+BLOCK_INGESTION_MODES = ("verbose", "rest", "txids")  # How the event watcher fetches block transactions
+FEE_METRICS = ("p50", "next_block_median")  # Values buckets, alerts and rolling stats can key off
+ROLLING_METRICS = ("p25", "p50", "p75", "p90", "p95", "tx_count")  # Snapshot values tracked over rolling windows
+
+# Fee histogram layout (log-spaced sat/vB bins)
+HISTOGRAM_MIN_FEERATE = 0.1  # Lower edge of the first regular bin; below goes to the underflow bin
+HISTOGRAM_MAX_FEERATE = 10_000  # Upper edge of the last regular bin; above goes to the overflow bin
+HISTOGRAM_BINS_PER_DECADE = 20  # ~12% wide bins
 
@@ -8,6 +8,7 @@ from urllib.parse import urlparse
 from typing import Dict, List, Optional
 from .logging import get_logger
 from .constants import DEFAULT_HTTP_TIMEOUT_SECS
+from .instrumentation import CallStats
 from .structured_output import StructuredOutputWriter
 
 logger = get_logger(__name__)
@@ -35,6 +36,8 @@ class EventEmitter:
         self.retry_attempts = retry_attempts
         self.retry_backoff_secs = retry_backoff_secs
         self._structured_writer = structured_writer
+        # Webhook post latency, bytes and failures
+        self.stats = CallStats()
         
         logger.info(f"Initialized event emitter: {len(self.webhook_urls)} endpoints")
 
@@ -49,6 +52,8 @@ class EventEmitter:
         Returns:
             True if successful, False otherwise
         """
+        start = time.monotonic()
+        sent = 0
         try:
             parsed = urlparse(url)
             conn_cls = HTTPSConnection if parsed.scheme == "https" else HTTPConnection
@@ -56,6 +61,7 @@ class EventEmitter:
             
             conn = conn_cls(parsed.hostname, port, timeout=DEFAULT_HTTP_TIMEOUT_SECS)
             body = json.dumps(payload)
+            sent = len(body)
             path = parsed.path or "/"
             if parsed.query:
                 path += "?" + parsed.query
@@ -63,17 +69,20 @@ class EventEmitter:
             headers = {"Content-Type": "application/json"}
             conn.request("POST", path, body=body, headers=headers)
             resp = conn.getresponse()
-            _ = resp.read()  # Consume response
+            received = len(resp.read())  # Consume response
             conn.close()
             
             if resp.status >= 400:
                 logger.warning(f"Webhook returned status {resp.status}: {resp.reason}")
+                self.stats.record("webhook", time.monotonic() - start, sent, received, errors=1)
                 return False
             
+            self.stats.record("webhook", time.monotonic() - start, sent, received)
             return True
             
         except Exception as e:
             logger.error(f"Failed to post webhook to {url}: {e}", exc_info=True)
+            self.stats.record("webhook", time.monotonic() - start, sent, errors=1)
             return False
 
     def emit(self, event_type: str, data: Dict, txid: str = None, block_height: int = None) -> bool:
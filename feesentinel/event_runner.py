@@ -3,9 +3,12 @@
 import sys
 import time
 import requests
+from collections.abc import Mapping
 from typing import Dict, Optional
 from datetime import datetime
 from .rpc import RPCClient, PrunedBlockError
+from .async_rpc import AsyncRPCClient
+from .zmq_notifier import ZMQNotifier
 from .block_monitor import BlockMonitor
 from .transaction_filter import TransactionFilter
 from .event_emitter import EventEmitter
@@ -32,11 +35,9 @@ class EventWatcherRunner:
         self._structured_writer = structured_writer
         
         # Initialize RPC client
-        self.rpc_client = RPCClient(
-            config.rpc_url,
-            config.rpc_user,
-            config.rpc_password
-        )
+        self.rpc_client = RPCClient.from_config(config)
+        # ZMQ notifier is only started for continuous runs (see run_continuous)
+        self.notifier: Optional[ZMQNotifier] = None
         
         # Initialize state manager
         event_config = config.event_watcher_config
@@ -50,7 +51,9 @@ class EventWatcherRunner:
         self.block_monitor = BlockMonitor(
             self.rpc_client,
             self.state_manager,
-            max_reorg_depth=event_config.get("max_reorg_depth", 6)
+            max_reorg_depth=event_config.get("max_reorg_depth", 6),
+            block_ingestion=event_config["block_ingestion"],
+            longpoll=event_config.get("longpoll", {}).get("enabled", False)
         )
         
         # Initialize transaction filter
@@ -126,7 +129,9 @@ class EventWatcherRunner:
         
         # Get block info
         block_info = self.block_monitor.process_block(height, block_hash)
-        txids = block_info.get("tx", [])
+        # Decoded blocks carry full transactions; legacy blocks only txids
+        block_txs = block_info.get("tx", [])
+        txids = [tx["txid"] if isinstance(tx, Mapping) else tx for tx in block_txs]
         
         # Emit block event
         self.event_emitter.emit_block_event(
@@ -135,14 +140,17 @@ class EventWatcherRunner:
         
         # Process transactions
         events_emitted = 0
-        for txid in txids:
+        for txid, block_tx in zip(txids, block_txs):
             # Check if already processed (idempotency)
             if self.state_manager.is_transaction_processed(txid):
                 logger.debug(f"Transaction {txid[:16]}... already processed, skipping")
                 continue
             
-            # Filter transaction (pass block_hash for transactions already in blocks)
-            filter_result = self.transaction_filter.filter_transaction(txid, block_hash)
+            if isinstance(block_tx, Mapping):
+                filter_result = self.transaction_filter.filter_decoded_transaction(block_tx, txid)
+            else:
+                # Filter transaction (pass block_hash for transactions already in blocks)
+                filter_result = self.transaction_filter.filter_transaction(txid, block_hash)
             self.metrics["transactions_filtered"] += 1
             
             if not filter_result["matched"]:
@@ -227,7 +235,13 @@ class EventWatcherRunner:
                 "metrics": self.metrics.copy()
             }
         
-        self.process_block(height, block_hash, reorg=reorg)
+        tip_height = self.block_monitor.tip_height
+        if tip_height is not None and height < tip_height:
+            # Catching up: let tip checks and fee polling go first
+            with self.rpc_client.priority("backfill"):
+                self.process_block(height, block_hash, reorg=reorg)
+        else:
+            self.process_block(height, block_hash, reorg=reorg)
         
         return {
             "processed": True,
@@ -246,6 +260,14 @@ class EventWatcherRunner:
         """
         logger.info(f"Starting continuous event monitoring (poll interval: {poll_interval_secs}s)")
         
+        # Concurrent lookups are only used by the long-running loop; --once stays synchronous
+        if self.config.rpc_async_enabled and self.block_monitor.async_client is None:
+            async_client = AsyncRPCClient.from_config(self.config, self.rpc_client)
+            self.block_monitor.async_client = async_client
+            self.transaction_filter.async_client = async_client
+        if self.notifier is None:
+            self.notifier = ZMQNotifier.from_config(self.config.zmq_config)
+        
         event_config = self.config.event_watcher_config
         metrics_config = event_config.get("metrics", {})
         log_interval_secs = metrics_config.get("log_interval_secs", 300)
@@ -265,11 +287,13 @@ class EventWatcherRunner:
                     last_metrics_log = now
                 
                 if not result["processed"]:
-                    time.sleep(poll_interval_secs)
+                    self._wait_for_block(poll_interval_secs)
                     continue
                 
             except KeyboardInterrupt:
                 logger.info("Exiting event monitoring")
+                if self.notifier is not None:
+                    self.notifier.stop()
                 self.state_manager.close()
                 sys.exit(0)
             except PrunedBlockError as e:
@@ -293,8 +317,58 @@ class EventWatcherRunner:
                 logger.error(f"Error in event monitoring loop: {e}", exc_info=True)
                 time.sleep(poll_interval_secs)
 
+    def _wait_for_block(self, poll_interval_secs: int):
+        """
+        Wait until the next block is likely available.
+
+        With a healthy ZMQ subscription this returns as soon as a block is
+        announced and otherwise only re-checks the tip every max_wait_secs.
+        Otherwise, with long-polling enabled, the node holds a
+        waitforblockheight call open until the next block or the timeout.
+        If neither is available, or the long-poll fails, it sleeps for the
+        regular poll interval.
+
+        Args:
+            poll_interval_secs: Seconds to sleep when polling
+        """
+        if self.notifier is not None and self.notifier.is_healthy():
+            block_hash = self.notifier.wait_for_block(self.config.zmq_config["max_wait_secs"])
+            if block_hash is not None:
+                logger.debug(f"ZMQ block notification: {block_hash}")
+                self.rpc_client.expire_tip()
+            return
+        if self.block_monitor.longpoll:
+            timeout_secs = self.config.event_watcher_config["longpoll"]["timeout_secs"]
+            if self.block_monitor.wait_for_new_block(timeout_secs) is not None:
+                return
+        time.sleep(poll_interval_secs)
+
+    def rpc_stats(self, reset: bool = False) -> Dict[str, Dict]:
+        """
+        Get per-method call statistics for RPC and webhook traffic.
+
+        Args:
+            reset: Clear the counters after reading
+
+        Returns:
+            Dictionary with "rpc" (including asyncio calls) and "webhook"
+            sections, each mapping a method name to its counters (see
+            CallStats.snapshot), "cache", "coalesce" and "limiter" with
+            cumulative cache, single-flight and rate limiter counters, and
+            "resilience" with current timeouts and circuit breaker states
+        """
+        cache = self.rpc_client.cache
+        return {
+            "rpc": self.rpc_client.stats.snapshot(reset),
+            "webhook": self.event_emitter.stats.snapshot(reset),
+            "cache": cache.stats() if cache is not None else {},
+            "coalesce": self.rpc_client.flight.stats() if self.rpc_client.flight is not None else {},
+            "limiter": self.rpc_client.limiter.stats() if self.rpc_client.limiter is not None else {},
+            "resilience": self.rpc_client.resilience_stats(),
+        }
+
     def _log_metrics(self):
-        """Log current metrics."""
+        """Log current metrics and the call statistics of the last interval."""
         logger.info(
             f"Metrics: blocks={self.metrics['blocks_processed']}, "
             f"tx_filtered={self.metrics['transactions_filtered']}, "
@@ -304,6 +378,28 @@ class EventWatcherRunner:
             f"ordinals={self.metrics['ordinal_matches']}, "
             f"covenants={self.metrics['covenant_matches']}"
         )
+        rpc_summary = self.rpc_client.stats.summary()
+        if rpc_summary:
+            logger.info(f"RPC time by method: {rpc_summary}")
+        if self.rpc_client.cache is not None:
+            cache_stats = self.rpc_client.cache.stats()
+            logger.info(
+                f"RPC cache: hits={cache_stats['hits'] + cache_stats['disk_hits']}, "
+                f"misses={cache_stats['misses']}, entries={cache_stats['entries']}, "
+                f"{cache_stats['bytes'] / 1_048_576:.1f}MB"
+            )
+        if self.rpc_client.limiter is not None:
+            limiter_stats = self.rpc_client.limiter.stats()
+            logger.info("RPC limiter: " + ", ".join(
+                f"{name}=queued {s['queued']}/max {s['max_queued']}, waited {s['wait_secs']}s"
+                for name, s in limiter_stats.items()
+            ))
+        webhook_summary = self.event_emitter.stats.summary()
+        if webhook_summary:
+            logger.info(f"Webhook time: {webhook_summary}")
+        stats = self.rpc_stats(reset=True)
+        if self._structured_writer is not None:
+            self._structured_writer.record_rpc_stats(stats)
 
     def close(self):
         """Close connections and cleanup."""
@@ -0,0 +1,180 @@
+"""Fixed log-scale fee histograms.
+
+A histogram keeps, per sat/vB bin, the number of transactions and their
+total vsize. Bins are log-spaced (``HISTOGRAM_BINS_PER_DECADE`` per power of
+ten between ``HISTOGRAM_MIN_FEERATE`` and ``HISTOGRAM_MAX_FEERATE``) plus an
+underflow and an overflow bin, so every histogram has the same ~100 bins
+and histograms from different snapshots can be added together. Percentiles
+walk the bins once and are accurate to half a bin (about 6%).
+
+Serialized histograms only list the span between the first and last
+non-empty bin, typically a few hundred bytes per snapshot.
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, Optional
+from .constants import (
+    HISTOGRAM_BINS_PER_DECADE,
+    HISTOGRAM_MAX_FEERATE,
+    HISTOGRAM_MIN_FEERATE,
+    PERCENTILE_SCALE,
+)
+from .mempool_stream import MempoolFeeArrays
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+_DECADES = math.log10(HISTOGRAM_MAX_FEERATE / HISTOGRAM_MIN_FEERATE)
+# Underflow bin, regular bins, overflow bin
+NUM_BINS = int(round(_DECADES * HISTOGRAM_BINS_PER_DECADE)) + 2
+
+
+def bin_index(feerate: float) -> int:
+    """Return the bin holding a sat/vB feerate."""
+    if feerate < HISTOGRAM_MIN_FEERATE:
+        return 0
+    idx = int(math.log10(feerate / HISTOGRAM_MIN_FEERATE) * HISTOGRAM_BINS_PER_DECADE) + 1
+    return min(idx, NUM_BINS - 1)
+
+
+def bin_edges(idx: int):
+    """Return the (lower, upper) sat/vB edges of a bin; open ends are 0 and inf."""
+    if idx == 0:
+        return 0.0, float(HISTOGRAM_MIN_FEERATE)
+    if idx == NUM_BINS - 1:
+        return float(HISTOGRAM_MAX_FEERATE), math.inf
+    lower = HISTOGRAM_MIN_FEERATE * 10 ** ((idx - 1) / HISTOGRAM_BINS_PER_DECADE)
+    return lower, HISTOGRAM_MIN_FEERATE * 10 ** (idx / HISTOGRAM_BINS_PER_DECADE)
+
+
+def bin_feerate(idx: int) -> float:
+    """Representative sat/vB feerate of a bin: the geometric middle, or the closed edge of an open bin."""
+    lower, upper = bin_edges(idx)
+    if idx == 0:
+        return upper
+    if idx == NUM_BINS - 1:
+        return lower
+    return math.sqrt(lower * upper)
+
+
+class FeeHistogram:
+    """Transaction count and total vsize per log-spaced feerate bin."""
+
+    def __init__(self):
+        self.counts = array("q", bytes(8 * NUM_BINS))
+        self.vsizes = array("q", bytes(8 * NUM_BINS))
+
+    @property
+    def tx_count(self) -> int:
+        return sum(self.counts)
+
+    @classmethod
+    def from_mempool(cls, mempool: MempoolFeeArrays) -> "FeeHistogram":
+        """
+        Build a histogram in one pass over a mempool (vectorized with numpy).
+
+        Args:
+            mempool: Fee and size columns; effective feerates are used when
+                it carries package totals
+
+        Returns:
+            FeeHistogram
+        """
+        hist = cls()
+        if not len(mempool):
+            return hist
+        if np is not None:
+            rates = mempool.feerate_array()
+            vsizes = np.frombuffer(mempool.vsizes, dtype=np.int64)
+            idx = np.zeros(len(rates), dtype=np.int64)
+            regular = rates >= HISTOGRAM_MIN_FEERATE
+            idx[regular] = np.minimum(
+                (np.log10(rates[regular] / HISTOGRAM_MIN_FEERATE) * HISTOGRAM_BINS_PER_DECADE).astype(np.int64) + 1,
+                NUM_BINS - 1,
+            )
+            hist.counts = array("q", np.bincount(idx, minlength=NUM_BINS).astype(np.int64).tobytes())
+            hist.vsizes = array("q", np.bincount(idx, weights=vsizes, minlength=NUM_BINS).astype(np.int64).tobytes())
+            return hist
+        for rate, vsize in zip(mempool.feerates(), mempool.vsizes):
+            idx = bin_index(rate)
+            hist.counts[idx] += 1
+            hist.vsizes[idx] += vsize
+        return hist
+
+    def merge(self, other: "FeeHistogram") -> "FeeHistogram":
+        """Add another histogram's bins to this one, in place; returns self."""
+        for idx in range(NUM_BINS):
+            self.counts[idx] += other.counts[idx]
+            self.vsizes[idx] += other.vsizes[idx]
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable["FeeHistogram"]) -> "FeeHistogram":
+        """Return the sum of several histograms, e.g. all snapshots of a time window."""
+        total = cls()
+        for hist in histograms:
+            total.merge(hist)
+        return total
+
+    def percentile(self, point: float, weighted: bool = False) -> Optional[float]:
+        """
+        Return the feerate at a percentile point, in O(bins).
+
+        Uses the same rank rule as fee_percentiles, round(p/100 * (n-1)),
+        and answers with the representative feerate of the bin holding that
+        rank.
+
+        Args:
+            point: Percentile point in [0..100]
+            weighted: Rank by vsize (share of block space) instead of by
+                transaction count
+
+        Returns:
+            Feerate in sat/vB, or None if the histogram is empty
+        """
+        column = self.vsizes if weighted else self.counts
+        total = sum(column)
+        if not total:
+            return None
+        rank = min(total - 1, max(0, int(round((point / PERCENTILE_SCALE) * (total - 1)))))
+        seen = 0
+        for idx, value in enumerate(column):
+            seen += value
+            if seen > rank:
+                return bin_feerate(idx)
+        return bin_feerate(NUM_BINS - 1)  # pragma: no cover - unreachable
+
+    def to_dict(self) -> Dict:
+        """
+        Serialize compactly: the bins between the first and last non-empty one.
+
+        Returns:
+            {"offset": first bin index, "count": [...], "vsize": [...]}, with
+            empty lists for an empty histogram
+        """
+        used = [idx for idx, count in enumerate(self.counts) if count]
+        if not used:
+            return {"offset": 0, "count": [], "vsize": []}
+        lo, hi = used[0], used[-1] + 1
+        return {"offset": lo, "count": self.counts[lo:hi].tolist(), "vsize": self.vsizes[lo:hi].tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FeeHistogram":
+        """
+        Load a histogram written by to_dict.
+
+        Raises:
+            ValueError: If the bins do not fit the histogram layout
+        """
+        hist = cls()
+        offset = int(data.get("offset", 0))
+        counts, vsizes = data.get("count", []), data.get("vsize", [])
+        if len(counts) != len(vsizes) or offset < 0 or offset + len(counts) > NUM_BINS:
+            raise ValueError("Fee histogram does not match the bin layout")
+        for pos, (count, vsize) in enumerate(zip(counts, vsizes)):
+            hist.counts[offset + pos] = int(count)
+            hist.vsizes[offset + pos] = int(vsize)
+        return hist
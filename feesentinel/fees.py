@@ -1,83 +1,149 @@
 """Mempool fee percentile calculations."""
 
-from typing import Dict
+from typing import Any, Dict, List, Optional, Sequence
 from .rpc import RPCClient
-from .constants import SATOSHIS_PER_BTC, VB_PER_KB, WEIGHT_TO_VSIZE_RATIO, PERCENTILE_SCALE
+from .async_rpc import AsyncRPCClient
+from .mempool_stream import MempoolFeeArrays, parse_mempool_stream
+from .mempool_tracker import MempoolTracker, entry_fee_vsize, entry_package
+from .projected_blocks import BlockProjector
+from .fee_histogram import FeeHistogram
+from .constants import SATOSHIS_PER_BTC, VB_PER_KB, PERCENTILE_SCALE, DEFAULT_FEE_PERCENTILES
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
 
-def current_fee_percentiles(rpc_client: RPCClient) -> Dict[str, int]:
+FEE_BACKENDS = ("auto", "numpy", "python")
+
+
+def percentile_key(point: float) -> str:
+    """Result key of a percentile point, e.g. 50 -> "p50", 99.5 -> "p99.5"."""
+    return f"p{point:g}"
+
+
+def current_fee_percentiles(
+    rpc_client: RPCClient,
+    async_client: Optional[AsyncRPCClient] = None,
+    streaming: bool = False,
+    tracker: Optional[MempoolTracker] = None,
+    percentiles: Sequence[float] = DEFAULT_FEE_PERCENTILES,
+    backend: str = "auto",
+    projector: Optional[BlockProjector] = None,
+    packages: bool = False,
+    histogram: bool = False
+) -> Dict[str, Any]:
     """
-    Compute sat/vB percentiles (p25, p50, p75, p90, p95) using getrawmempool(true).
+    Compute sat/vB percentiles (by default p25, p50, p75, p90, p95) using getrawmempool(true).
     Fallback to getmempoolinfo.mempoolminfee if mempool is empty.
-    
+
     Args:
         rpc_client: RPC client instance
-    
+        async_client: Optional async RPC client; when given, getrawmempool
+            is fetched over its pooled connections
+        streaming: If True, scan the getrawmempool reply as it arrives and keep
+            only fee and size per entry instead of decoding the full dict
+        tracker: Optional mempool mirror; when given it is synced with the
+            node's changes and the percentiles are computed from it
+        percentiles: Percentile points in [0..100]
+        backend: "numpy", "python", or "auto" to use numpy when installed
+        projector: Optional block projector; when given, the result also has
+            "projected_blocks" (see BlockProjector.project) and
+            "next_block_median", the vsize-weighted median feerate of the
+            next block rounded to sat/vB
+        packages: Use effective feerates of ancestor/descendant packages
+            (see MempoolFeeArrays) instead of each transaction's own feerate.
+            With a tracker this is decided by the tracker's packages flag.
+        histogram: Add "histogram", the serialized FeeHistogram of the mempool
+
     Returns:
-        Dictionary with percentile keys (p25, p50, p75, p90, p95) and tx_count
+        Dictionary with one key per percentile point (p25, p50, ...) and
+        tx_count, plus the projected block and histogram keys when requested
     """
-    txs = rpc_client.call("getrawmempool", True)  # dict: txid -> {fee, vsize, ...}
-    
-    if not txs:
+    if tracker is not None:
+        tracker.sync()
+        mempool = tracker.fee_arrays()
+    elif streaming:
+        mempool = parse_mempool_stream(rpc_client.call_stream("getrawmempool", True), packages)
+    else:
+        if async_client is not None:
+            # getmempoolinfo is only needed for an empty mempool and fetched below
+            (txs,) = async_client.call_many([("getrawmempool", [True])])
+            if isinstance(txs, Exception):
+                raise txs
+        else:
+            txs = rpc_client.call("getrawmempool", True)  # dict: txid -> {fee, vsize, ...}
+        mempool = _dict_fee_arrays(txs, packages) if txs else MempoolFeeArrays(packages)
+
+    if not len(mempool):
         info = rpc_client.call("getmempoolinfo")
         # Convert BTC/kB to sat/vB: multiply by satoshis per BTC, divide by vB per kB
         minfee_satvb = int(round(info.get("mempoolminfee", 0) * SATOSHIS_PER_BTC / VB_PER_KB))
-        return {
-            "p25": minfee_satvb,
-            "p50": minfee_satvb,
-            "p75": minfee_satvb,
-            "p90": minfee_satvb,
-            "p95": minfee_satvb,
-            "tx_count": 0
-        }
-    
-    fees = []
-    for tx_data in txs.values():
-        # Determine virtual size
-        vsize = tx_data.get("vsize")
-        if vsize is None:
-            weight = tx_data.get("weight")
-            if weight is not None:
-                vsize = max(1, int(round(weight / WEIGHT_TO_VSIZE_RATIO)))
-            else:
-                # Can't price without any notion of size
-                continue
-        else:
-            vsize = max(1, int(vsize))
-
-        # Determine fee in BTC
-        fee_btc = tx_data.get("fee")
-        if fee_btc is None:
-            fees_obj = tx_data.get("fees")
-            if isinstance(fees_obj, dict):
-                fee_btc = fees_obj.get("base")
-
-        if fee_btc is None:
-            continue
-
-        try:
-            # Convert BTC fee to sat/vB: multiply by satoshis per BTC, divide by vsize
-            fee_satvb = (float(fee_btc) * SATOSHIS_PER_BTC) / vsize
-        except (ValueError, TypeError):
-            continue
-
-        fees.append(fee_satvb)
-    
-    fees.sort()
-    
-    def percentile(p: int) -> int:
-        """Calculate percentile value. p in [0..100]"""
-        if not fees:
-            return 0
-        idx = min(len(fees) - 1, max(0, int(round((p / PERCENTILE_SCALE) * (len(fees) - 1)))))
-        return int(round(fees[idx]))
-    
-    return {
-        "p25": percentile(25),
-        "p50": percentile(50),
-        "p75": percentile(75),
-        "p90": percentile(90),
-        "p95": percentile(95),
-        "tx_count": len(fees),
-    }
+        result = {percentile_key(point): minfee_satvb for point in percentiles}
+        result["tx_count"] = 0
+        if projector is not None:
+            result["projected_blocks"] = projector.project(mempool)
+            result["next_block_median"] = minfee_satvb
+        if histogram:
+            result["histogram"] = FeeHistogram().to_dict()
+        return result
 
+    values = fee_percentiles(mempool, percentiles, backend)
+    result = {percentile_key(point): value for point, value in zip(percentiles, values)}
+    result["tx_count"] = len(mempool)
+    if projector is not None:
+        blocks = projector.project(mempool)
+        result["projected_blocks"] = blocks
+        result["next_block_median"] = int(round(blocks[0]["median_feerate"]))
+    if histogram:
+        result["histogram"] = FeeHistogram.from_mempool(mempool).to_dict()
+    return result
+
+
+def fee_percentiles(mempool: MempoolFeeArrays, points: Sequence[float], backend: str = "auto") -> List[int]:
+    """
+    Compute rounded sat/vB feerate percentiles of a non-empty mempool.
+
+    Both backends pick the element at rank round(p/100 * (n-1)) and give
+    identical results. The numpy backend divides the fee and size columns in
+    one vector operation and selects every rank with a single np.partition
+    (linear time) instead of sorting a Python list of floats.
+
+    Args:
+        mempool: Fee and size columns
+        points: Percentile points in [0..100]
+        backend: "numpy", "python", or "auto" to use numpy when installed
+
+    Returns:
+        Feerate per point, in the order of ``points``
+
+    Raises:
+        ValueError: If backend is unknown
+        RuntimeError: If the numpy backend is requested without numpy
+    """
+    if backend not in FEE_BACKENDS:
+        raise ValueError(f"Invalid fee backend: {backend}")
+    if backend == "auto":
+        backend = "numpy" if np is not None else "python"
+    n = len(mempool)
+    ranks = [min(n - 1, max(0, int(round((p / PERCENTILE_SCALE) * (n - 1))))) for p in points]
+
+    if backend == "numpy":
+        if np is None:
+            raise RuntimeError("Fee backend 'numpy' requested but numpy is not installed")
+        rates = mempool.feerate_array()
+        rates.partition(sorted(set(ranks)))
+        return [int(round(float(rates[rank]))) for rank in ranks]
+
+    rates = sorted(mempool.feerates())
+    return [int(round(rates[rank])) for rank in ranks]
+
+
+def _dict_fee_arrays(txs: Dict[str, Dict], packages: bool = False) -> MempoolFeeArrays:
+    """Extract fee and size columns from a decoded verbose getrawmempool dict."""
+    mempool = MempoolFeeArrays(packages)
+    for tx_data in txs.values():
+        priced = entry_fee_vsize(tx_data)
+        if priced is not None:
+            mempool.append(*priced, entry_package(tx_data) if packages else None)
+    return mempool
@@ -0,0 +1,132 @@
+"""Lightweight per-operation call statistics.
+
+Used to instrument RPC methods and webhook posts: call counts, error counts,
+bytes sent/received and a fixed-bucket latency histogram per name. Recording
+is a dict lookup plus a few integer updates under a lock, cheap enough to
+leave on in production.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class _OpStats:
+    """Counters for one operation name."""
+
+    __slots__ = ("calls", "requests", "errors", "bytes_sent", "bytes_received",
+                 "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile_ms(self, pct: float) -> Optional[float]:
+        """Estimate a latency percentile as the upper bound of its bucket."""
+        if not self.requests:
+            return None
+        rank = pct / 100.0 * self.requests
+        seen = 0
+        for idx, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return float(LATENCY_BUCKETS_MS[idx]) if idx < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.requests, 3) if self.requests else None,
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "max_ms": round(self.max_ms, 3),
+            "histogram_ms": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                "inf": self.buckets[-1],
+            },
+        }
+
+
+class CallStats:
+    """Thread-safe per-name call statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, _OpStats] = {}
+
+    def record(
+        self,
+        name: str,
+        elapsed_secs: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        errors: int = 0,
+        calls: int = 1,
+    ) -> None:
+        """
+        Record one request.
+
+        Args:
+            name: Operation name (e.g. RPC method)
+            elapsed_secs: Request duration in seconds
+            bytes_sent: Request body size
+            bytes_received: Response body size
+            errors: Failed calls (1 for a failed single call)
+            calls: Logical calls carried by the request (batch size); the
+                request still adds a single latency sample
+        """
+        elapsed_ms = elapsed_secs * 1000.0
+        bucket = bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+        with self._lock:
+            op = self._ops.get(name)
+            if op is None:
+                op = self._ops[name] = _OpStats()
+            op.calls += calls
+            op.requests += 1
+            op.errors += errors
+            op.bytes_sent += bytes_sent
+            op.bytes_received += bytes_received
+            op.total_ms += elapsed_ms
+            if elapsed_ms > op.max_ms:
+                op.max_ms = elapsed_ms
+            op.buckets[bucket] += 1
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Dict]:
+        """
+        Return statistics per operation name.
+
+        Args:
+            reset: Clear the counters after reading (for interval reporting)
+
+        Returns:
+            Dictionary mapping name to counters, latency summary and histogram
+        """
+        with self._lock:
+            result = {name: op.to_dict() for name, op in sorted(self._ops.items())}
+            if reset:
+                self._ops = {}
+        return result
+
+    def summary(self, top: int = 5) -> str:
+        """Format the operations with the most total time as a one-line log string."""
+        snap = self.snapshot()
+        ranked = sorted(snap.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:top]
+        return ", ".join(
+            f"{name}={stats['calls']}x/{stats['total_ms'] / 1000:.1f}s"
+            f"(p95={stats['p95_ms']}ms,err={stats['errors']})"
+            for name, stats in ranked
+        )
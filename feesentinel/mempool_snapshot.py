@@ -0,0 +1,241 @@
+"""Compact in-memory mempool representations.
+
+``MempoolFeeArrays`` holds the columns fee statistics need, one typed
+``array('q')`` per field, about 16 bytes per transaction (56 with package
+totals). ``MempoolSnapshot`` adds a packed table of 32-byte txids and an
+open-addressing index over it so single transactions can be added, looked
+up and removed in place, which is what the mempool tracker needs between
+polls. At 300k transactions that is roughly 20 MB instead of the several
+hundred MB of the decoded verbose ``getrawmempool`` dict (see
+``scripts/bench_mempool_memory.py``).
+"""
+
+from array import array
+from typing import Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+# (ancestor fee sats, ancestor vsize, descendant fee sats, descendant vsize, descendant count)
+Package = Tuple[int, int, int, int, int]
+
+
+class MempoolFeeArrays:
+    """Per-transaction base fee (sats) and virtual size (vB) of a mempool.
+
+    With ``packages`` each transaction also carries its ancestor and
+    descendant package totals (both including the transaction itself), and
+    feerates are effective ones:
+
+        effective = min(own, ancestor package rate)
+        raised to the descendant package rate if the transaction has descendants
+
+    A child is capped by the parents it must be mined with, and a low-fee
+    parent is lifted by the children paying for it (CPFP). This approximates
+    the node's mining score from the stats getrawmempool already reports,
+    elementwise, so it needs no walk of the dependency graph.
+    """
+
+    def __init__(self, packages: bool = False):
+        self.packages = packages
+        self.fees_sat = array("q")
+        self.vsizes = array("q")
+        if packages:
+            self.ancestor_fees_sat = array("q")
+            self.ancestor_vsizes = array("q")
+            self.descendant_fees_sat = array("q")
+            self.descendant_vsizes = array("q")
+            self.descendant_counts = array("q")
+
+    def __len__(self) -> int:
+        return len(self.vsizes)
+
+    def append(self, fee_sat: int, vsize: int, package: Optional[Package] = None) -> None:
+        """
+        Add one transaction.
+
+        Args:
+            fee_sat: Base fee in sats
+            vsize: Virtual size in vB
+            package: Package totals; ignored unless the arrays keep packages,
+                which then treat a missing package as the transaction alone
+        """
+        self.fees_sat.append(fee_sat)
+        self.vsizes.append(vsize)
+        if self.packages:
+            anc_fee, anc_vsize, desc_fee, desc_vsize, desc_count = package or (fee_sat, vsize, fee_sat, vsize, 1)
+            self.ancestor_fees_sat.append(anc_fee)
+            self.ancestor_vsizes.append(max(1, anc_vsize))
+            self.descendant_fees_sat.append(desc_fee)
+            self.descendant_vsizes.append(max(1, desc_vsize))
+            self.descendant_counts.append(desc_count)
+
+    def feerates(self) -> Iterator[float]:
+        """Yield each transaction's feerate in sat/vB (effective with packages)."""
+        own = (fee / vsize for fee, vsize in zip(self.fees_sat, self.vsizes))
+        if not self.packages:
+            return own
+        return (
+            max(min(rate, anc_fee / anc_vsize), desc_fee / desc_vsize) if desc_count > 1
+            else min(rate, anc_fee / anc_vsize)
+            for rate, anc_fee, anc_vsize, desc_fee, desc_vsize, desc_count in zip(
+                own, self.ancestor_fees_sat, self.ancestor_vsizes,
+                self.descendant_fees_sat, self.descendant_vsizes, self.descendant_counts,
+            )
+        )
+
+    def feerate_array(self):
+        """
+        Return every transaction's feerate as a numpy float64 array, computed
+        with vector operations (effective with packages).
+
+        Raises:
+            RuntimeError: If numpy is not installed
+        """
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+        rates = _column(self.fees_sat) / _column(self.vsizes)
+        if not self.packages:
+            return rates
+        rates = np.minimum(rates, _column(self.ancestor_fees_sat) / _column(self.ancestor_vsizes))
+        descendant_rates = _column(self.descendant_fees_sat) / _column(self.descendant_vsizes)
+        return np.where(_column(self.descendant_counts) > 1, np.maximum(rates, descendant_rates), rates)
+
+
+def _column(values: array):
+    return np.frombuffer(values, dtype=np.int64)
+
+
+# Index slot markers; other values are row numbers
+_EMPTY = -1
+_DELETED = -2
+_TXID_BYTES = 32
+
+
+class MempoolSnapshot(MempoolFeeArrays):
+    """Fee and size columns keyed by txid, updatable in place.
+
+    Rows are kept dense: removing a transaction moves the last row into its
+    place, so the columns can be handed to percentile and histogram code as
+    they are. Behaves as a read-only mapping of hex txid to
+    ``(fee_sat, vsize)`` (or ``(fee_sat, vsize, package)`` with packages).
+    """
+
+    def __init__(self, packages: bool = False):
+        super().__init__(packages)
+        self.txids = bytearray()
+        self._slots = array("i", [_EMPTY]) * 16
+        self._deleted = 0
+
+    def __contains__(self, txid: str) -> bool:
+        return self._find(bytes.fromhex(txid))[0] >= 0
+
+    def __getitem__(self, txid: str) -> Tuple:
+        slot = self._find(bytes.fromhex(txid))[0]
+        if slot < 0:
+            raise KeyError(txid)
+        row = self._slots[slot]
+        value = (self.fees_sat[row], self.vsizes[row])
+        if not self.packages:
+            return value
+        return value + ((
+            self.ancestor_fees_sat[row], self.ancestor_vsizes[row],
+            self.descendant_fees_sat[row], self.descendant_vsizes[row], self.descendant_counts[row],
+        ),)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield hex txids in row order."""
+        txids = self.txids
+        for start in range(0, len(txids), _TXID_BYTES):
+            yield txids[start:start + _TXID_BYTES].hex()
+
+    def add(self, txid: str, fee_sat: int, vsize: int, package: Optional[Package] = None) -> None:
+        """Insert a transaction, or overwrite its row if already present."""
+        raw = bytes.fromhex(txid)
+        slot, free = self._find(raw)
+        if slot >= 0:
+            row = self._slots[slot]
+            self.fees_sat[row] = fee_sat
+            self.vsizes[row] = vsize
+            if self.packages:
+                anc_fee, anc_vsize, desc_fee, desc_vsize, desc_count = package or (fee_sat, vsize, fee_sat, vsize, 1)
+                self.ancestor_fees_sat[row] = anc_fee
+                self.ancestor_vsizes[row] = max(1, anc_vsize)
+                self.descendant_fees_sat[row] = desc_fee
+                self.descendant_vsizes[row] = max(1, desc_vsize)
+                self.descendant_counts[row] = desc_count
+            return
+        if self._slots[free] == _DELETED:
+            self._deleted -= 1
+        self._slots[free] = len(self)
+        self.txids += raw
+        self.append(fee_sat, vsize, package)
+        if 4 * (len(self) + self._deleted) > 3 * len(self._slots):
+            self._reindex()
+
+    def discard(self, txid: str) -> bool:
+        """Remove a transaction; returns False if it was not present."""
+        slot = self._find(bytes.fromhex(txid))[0]
+        if slot < 0:
+            return False
+        row = self._slots[slot]
+        self._slots[slot] = _DELETED
+        self._deleted += 1
+        last = len(self) - 1
+        if row != last:
+            # Fill the hole with the last row and repoint its slot
+            moved = bytes(self.txids[last * _TXID_BYTES:])
+            self.txids[row * _TXID_BYTES:(row + 1) * _TXID_BYTES] = moved
+            for column in self._columns():
+                column[row] = column[last]
+            self._slots[self._find(moved)[0]] = row
+        del self.txids[last * _TXID_BYTES:]
+        for column in self._columns():
+            column.pop()
+        return True
+
+    def nbytes(self) -> int:
+        """Bytes held by the columns, txid table and index."""
+        return len(self.txids) + self._slots.itemsize * len(self._slots) + sum(
+            column.itemsize * len(column) for column in self._columns()
+        )
+
+    def _columns(self):
+        columns = [self.fees_sat, self.vsizes]
+        if self.packages:
+            columns += [
+                self.ancestor_fees_sat, self.ancestor_vsizes,
+                self.descendant_fees_sat, self.descendant_vsizes, self.descendant_counts,
+            ]
+        return columns
+
+    def _find(self, raw: bytes) -> Tuple[int, int]:
+        """Return (slot holding raw or -1, slot to insert it at)."""
+        slots = self._slots
+        mask = len(slots) - 1
+        # txids are hashes, so their leading bytes are already uniform
+        idx = int.from_bytes(raw[:8], "little") & mask
+        free = -1
+        while True:
+            row = slots[idx]
+            if row == _EMPTY:
+                return -1, free if free >= 0 else idx
+            if row == _DELETED:
+                if free < 0:
+                    free = idx
+            elif self.txids[row * _TXID_BYTES:(row + 1) * _TXID_BYTES] == raw:
+                return idx, idx
+            idx = (idx + 1) & mask
+
+    def _reindex(self) -> None:
+        """Rebuild the index, dropping deleted markers and growing it when half full."""
+        size = len(self._slots)
+        while 2 * len(self) >= size:
+            size *= 2
+        self._slots = array("i", [_EMPTY]) * size
+        self._deleted = 0
+        for row in range(len(self)):
+            raw = bytes(self.txids[row * _TXID_BYTES:(row + 1) * _TXID_BYTES])
+            self._slots[self._find(raw)[1]] = row
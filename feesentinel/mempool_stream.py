@@ -0,0 +1,173 @@
+"""Streaming decode of verbose getrawmempool replies.
+
+``getrawmempool true`` returns one JSON object per mempool transaction. During
+congestion that is 300k+ entries; loading it with ``json.loads`` builds a
+nested dict per entry and costs hundreds of MB. The scanner here reads the
+HTTP body chunk by chunk and keeps only each entry's size and base fee in
+compact arrays.
+
+With ``packages`` the scanner also keeps the ancestor and descendant package
+totals of each entry, from which ``MempoolFeeArrays`` derives effective
+(mining-score style) feerates.
+"""
+
+import json
+import re
+from typing import Iterable, Optional
+from .constants import SATOSHIS_PER_BTC, WEIGHT_TO_VSIZE_RATIO
+from .mempool_snapshot import MempoolFeeArrays, MempoolSnapshot, Package
+from .rpc import map_rpc_error
+
+# Entry keys are txids directly followed by an object. wtxid values and the
+# txids listed in depends/spentby are followed by "," or "]" instead.
+_TOKEN_RE = re.compile(
+    rb'"([0-9a-f]{64})":\s*\{'
+    rb'|"vsize":\s*(\d+)'
+    rb'|"weight":\s*(\d+)'
+    rb'|"base":\s*(-?[0-9.eE+-]+)'
+    rb'|"fee":\s*(-?[0-9.eE+-]+)'
+)
+# Package totals: fees.ancestor/fees.descendant (BTC), sizes and descendant count
+_PACKAGE_TOKEN_RE = re.compile(
+    _TOKEN_RE.pattern
+    + rb'|"ancestor":\s*(-?[0-9.eE+-]+)'
+    rb'|"ancestorsize":\s*(\d+)'
+    rb'|"descendant":\s*(-?[0-9.eE+-]+)'
+    rb'|"descendantsize":\s*(\d+)'
+    rb'|"descendantcount":\s*(\d+)'
+)
+
+# Bytes of the reply kept for error reporting when it contains no entries
+_HEAD_BYTES = 65536
+
+
+# Scanner state between chunks: (txid, vsize, weight, fee_btc, package) where
+# txid is None outside an entry and package maps regex group numbers 6-10 to
+# their raw values
+_NO_ENTRY = (None, None, None, None, None)
+
+
+def parse_mempool_stream(
+    chunks: Iterable[bytes],
+    packages: bool = False,
+    keep_txids: bool = False
+) -> MempoolFeeArrays:
+    """
+    Decode a verbose getrawmempool JSON-RPC reply from body chunks.
+
+    Entries without a size or a fee are skipped, like in the dict-based path.
+
+    Args:
+        chunks: Raw HTTP body chunks of the reply, in order
+        packages: Also keep ancestor and descendant package totals
+        keep_txids: Return a MempoolSnapshot indexed by txid
+
+    Returns:
+        MempoolFeeArrays (MempoolSnapshot with keep_txids) with one element
+        per priced transaction
+
+    Raises:
+        RuntimeError: If the reply carries an RPC error (via map_rpc_error)
+        ValueError: If the reply is not a JSON-RPC object
+    """
+    result = MempoolSnapshot(packages) if keep_txids else MempoolFeeArrays(packages)
+    token_re = _PACKAGE_TOKEN_RE if packages else _TOKEN_RE
+    state = _NO_ENTRY
+    head = bytearray()
+    buffer = b""
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if len(head) < _HEAD_BYTES:
+            head += chunk[:_HEAD_BYTES - len(head)]
+        buffer += chunk
+        # No token contains a comma, so everything before the last one is complete
+        cut = buffer.rfind(b",")
+        if cut < 0:
+            continue
+        state = _scan(token_re, buffer[:cut], state, result)
+        buffer = buffer[cut:]
+
+    state = _scan(token_re, buffer, state, result)
+    _finish_entry(state, result)
+
+    if not len(result):
+        _raise_for_error(bytes(head))
+    return result
+
+
+def _scan(token_re, data: bytes, state: tuple, result: MempoolFeeArrays) -> tuple:
+    """Consume tokens in ``data``, flushing completed entries into ``result``."""
+    txid, vsize, weight, fee_btc, package = state
+    for match in token_re.finditer(data):
+        group = match.lastindex
+        if group == 1:
+            if txid is not None:
+                _finish_entry((txid, vsize, weight, fee_btc, package), result)
+            txid, vsize, weight, fee_btc = match.group(1), None, None, None
+            package = {} if result.packages else None
+        elif txid is None:
+            continue
+        elif group == 2:
+            vsize = int(match.group(2))
+        elif group == 3:
+            weight = int(match.group(3))
+        elif group == 4:
+            fee_btc = match.group(4)
+        elif group == 5:
+            if fee_btc is None:
+                # Legacy top-level "fee" (pre-v23); fees.base wins when both exist
+                fee_btc = match.group(5)
+        else:
+            package[group] = match.group(group)
+    return txid, vsize, weight, fee_btc, package
+
+
+def _package(raw: dict) -> Optional[Package]:
+    """Convert scanned package tokens; None unless all five are present."""
+    try:
+        return (
+            int(round(float(raw[6]) * SATOSHIS_PER_BTC)),
+            int(raw[7]),
+            int(round(float(raw[8]) * SATOSHIS_PER_BTC)),
+            int(raw[9]),
+            int(raw[10]),
+        )
+    except (KeyError, ValueError):
+        return None
+
+
+def _finish_entry(state: tuple, result: MempoolFeeArrays) -> None:
+    """Append a scanned entry if it can be priced."""
+    txid, vsize, weight, fee_btc, package = state
+    if txid is None or fee_btc is None:
+        return
+    if vsize is not None:
+        vsize = max(1, vsize)
+    elif weight is not None:
+        vsize = max(1, int(round(weight / WEIGHT_TO_VSIZE_RATIO)))
+    else:
+        return
+    try:
+        fee_sat = int(round(float(fee_btc) * SATOSHIS_PER_BTC))
+    except ValueError:
+        return
+    package = _package(package) if package is not None else None
+    if isinstance(result, MempoolSnapshot):
+        result.add(txid.decode(), fee_sat, vsize, package)
+    else:
+        result.append(fee_sat, vsize, package)
+
+
+def _raise_for_error(head: bytes) -> None:
+    """Raise the RPC error carried by a reply without mempool entries."""
+    try:
+        reply = json.loads(head)
+    except ValueError:
+        # Longer than the retained head yet no entries: not a mempool reply
+        raise ValueError("Unexpected getrawmempool reply")
+    if not isinstance(reply, dict):
+        raise ValueError("Unexpected getrawmempool reply")
+    if reply.get("error"):
+        raise map_rpc_error(reply["error"], [True])
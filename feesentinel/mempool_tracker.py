@@ -0,0 +1,266 @@
+"""Local mirror of the node's mempool, kept current with small diffs.
+
+Re-reading verbose ``getrawmempool`` every poll costs time proportional to the
+whole mempool (roughly 500 bytes of JSON per transaction). The tracker loads
+it once and afterwards asks only for ``getrawmempool false true``: the txid
+list plus ``mempool_sequence``, a counter the node bumps on every addition
+and removal. Unchanged sequence means nothing to do; otherwise the txid list
+is diffed against the mirror, departed transactions are dropped and new ones
+are fetched with one batched ``getmempoolentry`` round trip. Per-poll cost
+then follows churn rather than mempool size, apart from the txid list itself
+(about 70 bytes per transaction).
+
+The mirror is reloaded when the sequence goes backwards (node restart) or
+when so much changed that a full load is cheaper than the diff. It is held
+in a ``MempoolSnapshot`` (typed columns plus packed txids) rather than a
+dict of entries, a few tens of bytes per transaction.
+
+With ``packages`` the mirror also keeps each transaction's ancestor and
+descendant package totals. Those change when relatives come and go, so the
+in-mempool parents and children of added and removed transactions are
+re-fetched in the same diff. Relatives further away keep their totals until
+they are re-fetched themselves.
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+from .constants import SATOSHIS_PER_BTC, WEIGHT_TO_VSIZE_RATIO
+from .logging import get_logger
+from .mempool_stream import MempoolFeeArrays, MempoolSnapshot, Package, parse_mempool_stream
+from .rpc import RPCClient
+
+logger = get_logger(__name__)
+
+# Reload instead of diffing when more than this share of the mirror changed
+RESYNC_CHURN_FRACTION = 0.5
+
+
+def entry_fee_vsize(entry: Dict) -> Optional[Tuple[int, int]]:
+    """
+    Extract base fee and virtual size from a verbose mempool entry.
+
+    Handles both the ``fees.base`` object and the top-level ``fee`` of
+    pre-v23 nodes, and derives vsize from weight when it is missing.
+
+    Args:
+        entry: Entry from verbose getrawmempool or getmempoolentry
+
+    Returns:
+        Tuple of (fee in sats, vsize in vB), or None if either is missing
+    """
+    vsize = entry.get("vsize")
+    if vsize is None:
+        weight = entry.get("weight")
+        if weight is None:
+            # Can't price without any notion of size
+            return None
+        vsize = max(1, int(round(weight / WEIGHT_TO_VSIZE_RATIO)))
+    else:
+        vsize = max(1, int(vsize))
+
+    fee_btc = entry.get("fee")
+    if fee_btc is None:
+        fees_obj = entry.get("fees")
+        if isinstance(fees_obj, dict):
+            fee_btc = fees_obj.get("base")
+    if fee_btc is None:
+        return None
+    try:
+        return int(round(float(fee_btc) * SATOSHIS_PER_BTC)), vsize
+    except (ValueError, TypeError):
+        return None
+
+
+def _btc_to_sat(value) -> int:
+    return int(round(float(value) * SATOSHIS_PER_BTC))
+
+
+def entry_package(entry: Dict) -> Optional[Package]:
+    """
+    Extract ancestor and descendant package totals from a verbose mempool entry.
+
+    Args:
+        entry: Entry from verbose getrawmempool or getmempoolentry
+
+    Returns:
+        Tuple of (ancestor fee sats, ancestor vsize, descendant fee sats,
+        descendant vsize, descendant count), each including the transaction
+        itself, or None if the node does not report them
+    """
+    fees_obj = entry.get("fees")
+    if not isinstance(fees_obj, dict):
+        return None
+    try:
+        return (
+            _btc_to_sat(fees_obj["ancestor"]),
+            int(entry["ancestorsize"]),
+            _btc_to_sat(fees_obj["descendant"]),
+            int(entry["descendantsize"]),
+            int(entry["descendantcount"]),
+        )
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+class MempoolTracker:
+    """Mempool mirror (txid -> fee and size) updated from mempool_sequence diffs."""
+
+    def __init__(self, rpc_client: RPCClient, packages: bool = False, streaming: bool = False):
+        """
+        Initialize mempool tracker. Nothing is loaded until the first sync().
+
+        Args:
+            rpc_client: RPC client instance
+            packages: Also mirror package totals for effective feerates
+            streaming: Scan full reloads from the reply stream instead of
+                decoding the verbose dict (not with packages, which need
+                each entry's depends list)
+        """
+        self.rpc_client = rpc_client
+        self.packages = packages
+        self.streaming = streaming and not packages
+        # txid -> (fee sats, vsize[, package]) in compact columns
+        self.entries = MempoolSnapshot(packages)
+        # Transactions that cannot be priced, kept so they are not fetched again
+        self.unpriced: Set[str] = set()
+        # In-mempool dependency links, kept only with packages
+        self.parents: Dict[str, Tuple[str, ...]] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.sequence: Optional[int] = None
+        self.stats = {"syncs": 0, "resyncs": 0, "added": 0, "removed": 0, "refreshed": 0}
+
+    def __len__(self) -> int:
+        return len(self.entries) + len(self.unpriced)
+
+    def __contains__(self, txid: str) -> bool:
+        return txid in self.entries or txid in self.unpriced
+
+    def sync(self) -> None:
+        """
+        Bring the mirror up to date with the node.
+
+        Raises:
+            RuntimeError: If RPC returns an error
+            requests.RequestException: If HTTP request fails
+        """
+        self.stats["syncs"] += 1
+        if self.sequence is None:
+            self.resync("initial load")
+            return
+
+        reply = self.rpc_client.call("getrawmempool", False, True)
+        sequence = reply["mempool_sequence"]
+        if sequence == self.sequence:
+            return
+        if sequence < self.sequence:
+            self.resync(f"mempool_sequence went back from {self.sequence} to {sequence}")
+            return
+        self._apply(reply["txids"], sequence)
+
+    def resync(self, reason: str) -> None:
+        """Reload the whole mempool, then catch up with changes made during the load."""
+        logger.info(f"Loading full mempool ({reason})")
+        self.stats["resyncs"] += 1
+        self.unpriced = set()
+        self.parents = {}
+        self.children = {}
+        if self.streaming:
+            self.entries = parse_mempool_stream(self.rpc_client.call_stream("getrawmempool", True), keep_txids=True)
+        else:
+            verbose = self.rpc_client.call("getrawmempool", True)
+            self.entries = MempoolSnapshot(self.packages)
+            for txid, entry in verbose.items():
+                self._store(txid, entry)
+            del verbose
+        # The verbose dump carries no sequence; take it from a txid listing
+        # and fetch whatever arrived in between
+        reply = self.rpc_client.call("getrawmempool", False, True)
+        self.sequence = None
+        self._apply(reply["txids"], reply["mempool_sequence"])
+
+    def _apply(self, txids, sequence: int) -> None:
+        """Diff the node's txid list against the mirror and fetch new entries."""
+        current = set(txids)
+        removed = [txid for txid in self.entries if txid not in current]
+        removed += [txid for txid in self.unpriced if txid not in current]
+        added = [txid for txid in current if txid not in self]
+
+        if self.sequence is not None and len(added) + len(removed) > RESYNC_CHURN_FRACTION * max(1, len(self)):
+            self.resync(f"{len(added)} added and {len(removed)} removed since sequence {self.sequence}")
+            return
+
+        stale: Set[str] = set()
+        for txid in removed:
+            if not self.entries.discard(txid):
+                self.unpriced.discard(txid)
+            if self.packages:
+                stale.update(self._unlink(txid))
+        fetched = self._fetch(added)
+        if self.packages:
+            for txid in fetched:
+                stale.update(self.parents.get(txid, ()))
+            stale = {txid for txid in stale if txid in self and txid not in fetched}
+            self.stats["refreshed"] += len(self._fetch(sorted(stale)))
+
+        self.sequence = sequence
+        self.stats["added"] += len(added)
+        self.stats["removed"] += len(removed)
+        logger.debug(
+            f"Mempool sequence {sequence}: +{len(added)} -{len(removed)}, {len(self)} txs"
+        )
+
+    def _fetch(self, txids: Iterable[str]) -> Set[str]:
+        """(Re)load entries with one batched getmempoolentry; returns the txids found."""
+        txids = list(txids)
+        if not txids:
+            return set()
+        found = set()
+        replies = self.rpc_client.batch([("getmempoolentry", [txid]) for txid in txids])
+        for txid, entry in zip(txids, replies):
+            if isinstance(entry, Exception):
+                # Left the mempool between the listing and the lookup
+                continue
+            self._store(txid, entry)
+            found.add(txid)
+        return found
+
+    def _store(self, txid: str, entry: Dict) -> None:
+        """Mirror one verbose entry, with its package totals and links when enabled."""
+        priced = entry_fee_vsize(entry)
+        if priced is None:
+            self.entries.discard(txid)
+            self.unpriced.add(txid)
+        else:
+            self.entries.add(txid, *priced, entry_package(entry) if self.packages else None)
+        if not self.packages:
+            return
+        parents = tuple(entry.get("depends") or ())
+        if parents and txid not in self.parents:
+            self.parents[txid] = parents
+            for parent in parents:
+                self.children.setdefault(parent, set()).add(txid)
+
+    def _unlink(self, txid: str) -> Set[str]:
+        """Forget a departed transaction's links; returns the relatives whose totals changed."""
+        relatives = self.children.pop(txid, set())
+        for parent in self.parents.pop(txid, ()):
+            relatives.add(parent)
+            siblings = self.children.get(parent)
+            if siblings is not None:
+                siblings.discard(txid)
+                if not siblings:
+                    del self.children[parent]
+        return relatives
+
+    def feerates(self) -> Iterator[float]:
+        """Yield the sat/vB feerate of every priced transaction in the mirror (effective with packages)."""
+        return self.entries.feerates()
+
+    def fee_arrays(self) -> MempoolFeeArrays:
+        """
+        Return the fee and size columns of every priced transaction in the mirror.
+
+        These are the mirror's own columns, not a copy; do not keep numpy
+        views of them across sync() calls (a resized array must not be
+        exporting buffers).
+        """
+        return self.entries
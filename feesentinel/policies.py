@@ -2,7 +2,12 @@
 
 from typing import Dict, Any, Optional
 
-def should_alert_spike(current: float, trail_avg: float, config: Dict[str, Any]) -> bool:
+def should_alert_spike(
+    current: float,
+    trail_avg: float,
+    config: Dict[str, Any],
+    confirmed: Optional[float] = None
+) -> bool:
     """
     Determine if a fee spike alert should be triggered.
     
@@ -10,6 +15,10 @@ def should_alert_spike(current: float, trail_avg: float, config: Dict[str, Any])
         current: Current fee estimate (sat/vB)
         trail_avg: Trailing average fee (sat/vB)
         config: Spike detection configuration dictionary
+        confirmed: Median feerate recent blocks cleared at (sat/vB); when
+            given, the current fee must also exceed it by confirmed_pct,
+            so mempool pressure that blocks are already absorbing is not
+            reported as a spike
         
     Returns:
         True if alert should be triggered
@@ -27,7 +36,52 @@ def should_alert_spike(current: float, trail_avg: float, config: Dict[str, Any])
         return False
         
     pct_change = 100.0 * (current - trail_avg) / trail_avg
-    return pct_change >= spike_pct
+    if pct_change < spike_pct:
+        return False
+
+    if confirmed is not None and confirmed > 0:
+        confirmed_pct = config.get("confirmed_pct", 0)
+        return 100.0 * (current - confirmed) / confirmed >= confirmed_pct
+    return True
+
+
+def rolling_value(rolling: Dict[str, Dict], key: str) -> Any:
+    """
+    Look up a window/metric pair in a RollingEngine snapshot.
+
+    Args:
+        rolling: RollingEngine.snapshot() result
+        key: "<window>/<metric>", e.g. "60m/p50" or "ewma_10m/p90"
+
+    Returns:
+        Stats dict (avg, min, max, n) for a window, or the value for an EWMA
+
+    Raises:
+        ValueError: If the window or metric is not tracked
+    """
+    label, _, metric = key.partition("/")
+    for section in ("windows", "ewma"):
+        metrics = rolling.get(section, {}).get(label)
+        if metrics is not None and metric in metrics:
+            return metrics[metric]
+    raise ValueError(f"Rolling statistic not tracked: {key}")
+
+
+def trailing_baseline(rolling: Dict[str, Dict], key: str) -> float:
+    """
+    Return the trailing value spike detection compares against.
+
+    Args:
+        rolling: RollingEngine.snapshot() result
+        key: "<window>/<metric>"; windows give their average, EWMAs their value
+
+    Returns:
+        Baseline in the metric's unit (0 while unknown)
+    """
+    value = rolling_value(rolling, key)
+    if isinstance(value, dict):
+        return value["avg"]
+    return value if value is not None else 0
 
 
 def propose_adjustment(current: float, trail_avg: float, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,96 @@
+"""Fee poll scheduling on absolute deadlines with a volatility-driven interval.
+
+Sleeping a fixed ``poll_secs`` after each iteration stretches the period by
+however long the iteration took, and polls a flat market as hard as a
+spiking one. The scheduler instead keeps a deadline on the monotonic clock
+and advances it by the current interval, so iteration time does not add up.
+An iteration that overruns its slot starts the next one right away rather
+than bursting to catch up.
+
+The interval drops to ``min_secs`` when the fee moves sharply away from
+the rolling average or a block has just arrived, returns to the base
+interval in between, and grows by half each flat poll up to ``max_secs``.
+"""
+
+import time
+from typing import Callable, Dict
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Relative move of the current fee from the rolling average that counts as volatile
+_VOLATILE_CHANGE = 0.10
+# Below this move, and with a rolling range within _FLAT_SPREAD of the average, the market is flat
+_FLAT_CHANGE = 0.02
+_FLAT_SPREAD = 0.10
+_BACKOFF_FACTOR = 1.5
+
+
+class PollScheduler:
+    """Absolute-deadline poll timer whose interval follows fee volatility."""
+
+    def __init__(
+        self,
+        base_secs: float,
+        min_secs: float,
+        max_secs: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize poll scheduler. The first deadline is the time of creation.
+
+        Args:
+            base_secs: Interval in a normal market (polling.poll_secs)
+            min_secs: Interval during volatility and right after a block
+            max_secs: Upper bound of the interval in a flat market
+            clock: Monotonic time source
+        """
+        self.min_secs = float(min(min_secs, base_secs))
+        self.max_secs = float(max(max_secs, base_secs))
+        self.base_secs = float(base_secs)
+        self.interval = self.base_secs
+        self._clock = clock
+        self._deadline = clock()
+
+    def update(self, current: float, stats: Dict, new_block: bool = False) -> float:
+        """
+        Pick the interval to the next poll from the latest snapshot.
+
+        Args:
+            current: Current fee (sat/vB)
+            stats: Rolling stats with avg, min and max
+            new_block: A block arrived since the previous poll
+
+        Returns:
+            New interval in seconds
+        """
+        avg = stats.get("avg", 0)
+        if avg <= 0:
+            interval = self.base_secs
+        else:
+            change = abs(current - avg) / avg
+            spread = (stats.get("max", avg) - stats.get("min", avg)) / avg
+            if new_block or change >= _VOLATILE_CHANGE:
+                interval = self.min_secs
+            elif change <= _FLAT_CHANGE and spread <= _FLAT_SPREAD:
+                interval = max(self.interval, self.base_secs) * _BACKOFF_FACTOR
+            else:
+                interval = self.base_secs
+        interval = min(max(interval, self.min_secs), self.max_secs)
+        if interval != self.interval:
+            logger.debug(f"Fee poll interval {self.interval:.0f}s -> {interval:.0f}s")
+        self.interval = interval
+        return interval
+
+    def wait_secs(self) -> float:
+        """Advance the deadline by the interval and return the seconds left until it."""
+        now = self._clock()
+        self._deadline += self.interval
+        if self._deadline < now:
+            # Overran the slot: poll now and schedule from here
+            self._deadline = now
+        return self._deadline - now
+
+    def restart(self) -> None:
+        """Anchor the schedule at now, after a poll triggered outside it (e.g. by a block)."""
+        self._deadline = self._clock()
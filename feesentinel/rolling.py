@@ -1,11 +1,17 @@
 """Rolling window statistics for fee monitoring."""
 
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
 
 class Rolling:
-    """Rolling window statistics calculator."""
+    """Rolling window statistics calculator.
+
+    Points are kept in timestamp order with a running sum, plus monotonic
+    queues whose fronts are the window's minimum and maximum, so ``add`` and
+    ``stats`` are O(1) amortized however many points the window holds.
+    """
     
     def __init__(self, minutes: int):
         """
@@ -15,19 +21,54 @@ class Rolling:
             minutes: Window size in minutes
         """
         self.minutes = minutes
-        self.points: List[Tuple[datetime, int]] = []  # list[(ts, p50_satvb)]
+        self._points: Deque[Tuple[datetime, int]] = deque()  # (ts, p50_satvb), oldest first
+        self._sum = 0
+        # Candidates for the minimum (values increasing) and maximum (values decreasing)
+        self._min: Deque[Tuple[datetime, int]] = deque()
+        self._max: Deque[Tuple[datetime, int]] = deque()
     
+    @property
+    def points(self) -> List[Tuple[datetime, int]]:
+        """Points in the window as a list of (ts, p50_satvb), oldest first."""
+        return list(self._points)
+
     def add(self, ts: datetime, p50: int):
         """
         Add a data point and prune old points outside the window.
         
+        The window ends at ``ts``: points older than ``ts`` minus the window
+        are dropped.
+
         Args:
             ts: Timestamp
             p50: p50 fee value in sat/vB
         """
-        self.points.append((ts, p50))
+        point = (ts, p50)
+        self._sum += p50
+        if self._points and ts < self._points[-1][0]:
+            # Out of order (e.g. clock step back): keep time order, rebuild the queues
+            idx = len(self._points)
+            while idx and self._points[idx - 1][0] > ts:
+                idx -= 1
+            self._points.insert(idx, point)
+            self._rebuild_extremes()
+        else:
+            self._points.append(point)
+            while self._min and self._min[-1][1] > p50:
+                self._min.pop()
+            self._min.append(point)
+            while self._max and self._max[-1][1] < p50:
+                self._max.pop()
+            self._max.append(point)
+
         cutoff = ts - timedelta(minutes=self.minutes)
-        self.points = [(t, v) for (t, v) in self.points if t >= cutoff]
+        points = self._points
+        while points and points[0][0] < cutoff:
+            self._sum -= points.popleft()[1]
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
     
     def stats(self) -> Dict[str, int]:
         """
@@ -36,14 +77,199 @@ class Rolling:
         Returns:
             Dictionary with avg, min, max, and n (count) keys
         """
-        vals = [v for _, v in self.points]
-        if not vals:
+        n = len(self._points)
+        if not n:
             return {"avg": 0, "min": 0, "max": 0, "n": 0}
         
         return {
-            "avg": int(round(sum(vals) / len(vals))),
-            "min": min(vals),
-            "max": max(vals),
-            "n": len(vals)
+            "avg": int(round(self._sum / n)),
+            "min": self._min[0][1],
+            "max": self._max[0][1],
+            "n": n
+        }
+
+    def _rebuild_extremes(self) -> None:
+        """Recompute the min/max queues from the points (O(n), out-of-order adds only)."""
+        self._min.clear()
+        self._max.clear()
+        for point in self._points:
+            while self._min and self._min[-1][1] > point[1]:
+                self._min.pop()
+            self._min.append(point)
+            while self._max and self._max[-1][1] < point[1]:
+                self._max.pop()
+            self._max.append(point)
+
+
+def window_label(minutes: float) -> str:
+    """Name of a window or EWMA half-life, e.g. 60 -> "60m"."""
+    return f"{minutes:g}m"
+
+
+class _Window:
+    """Running sums and monotonic min/max queues of one window, per metric."""
+
+    __slots__ = ("span", "start", "sums", "mins", "maxs")
+
+    def __init__(self, minutes: float, metrics: int, start: int):
+        self.span = timedelta(minutes=minutes)
+        # Sequence number of the oldest point inside the window
+        self.start = start
+        self.sums = [0] * metrics
+        self.mins = [deque() for _ in range(metrics)]
+        self.maxs = [deque() for _ in range(metrics)]
+
+
+class RollingEngine:
+    """Several metrics over several windows, plus EWMAs, from one point buffer.
+
+    Each snapshot is added once to a shared timestamped buffer. Every window
+    keeps the position of its oldest point in that buffer with running sums
+    and monotonic min/max queues per metric, so an add costs O(windows x
+    metrics) amortized whatever the window lengths. The buffer only keeps
+    what the longest window still needs. Window stats have the same shape
+    and rounding as ``Rolling.stats``.
+
+    EWMAs are time-aware: a point ``dt`` after the previous one moves the
+    average by ``1 - 0.5 ** (dt / half_life)`` of the difference.
+    """
+
+    def __init__(self, windows_mins: Sequence[float], metrics: Sequence[str], ewma_mins: Sequence[float] = ()):
+        """
+        Initialize rolling engine.
+
+        Args:
+            windows_mins: Window lengths in minutes (labelled e.g. "60m")
+            metrics: Names of the values passed to add (e.g. "p50", "tx_count")
+            ewma_mins: EWMA half-lives in minutes (labelled e.g. "ewma_10m")
+        """
+        self.metrics = list(metrics)
+        self._index = {metric: idx for idx, metric in enumerate(self.metrics)}
+        self._windows: Dict[str, _Window] = {
+            window_label(minutes): _Window(minutes, len(self.metrics), 0) for minutes in windows_mins
+        }
+        self._ewma_half_secs = {f"ewma_{window_label(minutes)}": minutes * 60.0 for minutes in ewma_mins}
+        self._ewma: Dict[str, List[float]] = {}
+        # Shared buffer; _base is the sequence number of its first point
+        self._ts: List[datetime] = []
+        self._rows: List[Tuple] = []
+        self._base = 0
+
+    @property
+    def windows(self) -> List[str]:
+        return list(self._windows)
+
+    @property
+    def ewmas(self) -> List[str]:
+        return list(self._ewma_half_secs)
+
+    def add(self, ts: datetime, values: Dict[str, float]) -> None:
+        """
+        Add one snapshot.
+
+        Args:
+            ts: Timestamp; one earlier than the previous point is treated as
+                simultaneous with it
+            values: Value of every metric
+
+        Raises:
+            KeyError: If a metric is missing from values
+        """
+        if self._ts and ts < self._ts[-1]:
+            ts = self._ts[-1]
+        row = tuple(values[metric] for metric in self.metrics)
+        seq = self._base + len(self._ts)
+        if self._ewma_half_secs:
+            self._update_ewma(ts, row)
+        self._ts.append(ts)
+        self._rows.append(row)
+
+        for window in self._windows.values():
+            for idx, value in enumerate(row):
+                window.sums[idx] += value
+                mins, maxs = window.mins[idx], window.maxs[idx]
+                while mins and mins[-1][1] > value:
+                    mins.pop()
+                mins.append((seq, value))
+                while maxs and maxs[-1][1] < value:
+                    maxs.pop()
+                maxs.append((seq, value))
+
+            cutoff = ts - window.span
+            while self._ts[window.start - self._base] < cutoff:
+                for idx, value in enumerate(self._rows[window.start - self._base]):
+                    window.sums[idx] -= value
+                window.start += 1
+            for queue in window.mins + window.maxs:
+                while queue[0][0] < window.start:
+                    queue.popleft()
+        self._compact()
+
+    def stats(self, window: str, metric: str) -> Dict[str, int]:
+        """
+        Return avg, min, max and n of a metric over a window, like Rolling.stats.
+
+        Raises:
+            KeyError: If the window or metric is unknown
+        """
+        state = self._windows[window]
+        idx = self._index[metric]
+        n = self._base + len(self._ts) - state.start
+        if not n:
+            return {"avg": 0, "min": 0, "max": 0, "n": 0}
+        return {
+            "avg": int(round(state.sums[idx] / n)),
+            "min": state.mins[idx][0][1],
+            "max": state.maxs[idx][0][1],
+            "n": n,
         }
 
+    def ewma(self, label: str, metric: str) -> Optional[float]:
+        """
+        Return an EWMA of a metric, or None before the first point.
+
+        Raises:
+            KeyError: If the EWMA or metric is unknown
+        """
+        if label not in self._ewma_half_secs:
+            raise KeyError(label)
+        values = self._ewma.get(label)
+        return None if values is None else round(values[self._index[metric]], 2)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Return every window and EWMA.
+
+        Returns:
+            {"windows": {label: {metric: stats}}, "ewma": {label: {metric: value}}}
+        """
+        return {
+            "windows": {
+                label: {metric: self.stats(label, metric) for metric in self.metrics} for label in self._windows
+            },
+            "ewma": {
+                label: {metric: self.ewma(label, metric) for metric in self.metrics} for label in self._ewma_half_secs
+            },
+        }
+
+    def _update_ewma(self, ts: datetime, row: Tuple) -> None:
+        if not self._ts:
+            self._ewma = {label: list(row) for label in self._ewma_half_secs}
+            return
+        dt = (ts - self._ts[-1]).total_seconds()
+        for label, half_secs in self._ewma_half_secs.items():
+            alpha = 1.0 - 0.5 ** (dt / half_secs) if half_secs > 0 else 1.0
+            values = self._ewma[label]
+            for idx, value in enumerate(row):
+                values[idx] += alpha * (value - values[idx])
+
+    def _compact(self) -> None:
+        """Drop buffer points no window needs any more, in bulk."""
+        if not self._windows:
+            drop = len(self._ts) - 1
+        else:
+            drop = min(window.start for window in self._windows.values()) - self._base
+        if drop > 1024 and 2 * drop > len(self._ts):
+            del self._ts[:drop]
+            del self._rows[:drop]
+            self._base += drop
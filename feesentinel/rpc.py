@@ -1,8 +1,37 @@
 """Bitcoin RPC client for Blockscope."""
 
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import requests
-from typing import Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+from .constants import (
+    DEFAULT_RPC_BATCH_MAX_ITEMS,
+    DEFAULT_RPC_BATCH_MAX_BYTES,
+    DEFAULT_RPC_BATCH_ITEM_BYTES,
+    DEFAULT_RPC_BREAKER_FAILURES,
+    DEFAULT_RPC_BREAKER_RESET_SECS,
+    DEFAULT_RPC_CONNECT_TIMEOUT_SECS,
+)
+from .instrumentation import CallStats
+from .logging import get_logger
+from .rpc_cache import MISS, ResponseCache, is_cacheable_method
+from .rpc_cassette import Cassette
+from .rpc_coalesce import SingleFlight
+from .rpc_limiter import RateLimiter, classify_priority
+from .rpc_resilience import AdaptiveTimeouts, CircuitBreaker, CircuitOpenError
+from .rpc_pool import (
+    BLOCK_BY_HASH_METHODS,
+    UNTIMED_METHODS,
+    EndpointPool,
+    NodeEndpoint,
+    classify_methods,
+)
+
+logger = get_logger(__name__)
 
 
 class PrunedBlockError(Exception):
@@ -14,59 +43,735 @@ class PrunedBlockError(Exception):
         super().__init__(self.message)
 
 
+def map_rpc_error(error: Any, params: Sequence[Any]) -> Exception:
+    """
+    Map a JSON-RPC error object to the exception raised to callers.
+
+    Args:
+        error: The "error" member of a JSON-RPC reply
+        params: Parameters of the failed call (used to recover the block hash)
+
+    Returns:
+        PrunedBlockError for pruned/unavailable data, RuntimeError otherwise.
+        The original error object is kept as ``rpc_error`` (e.g. for cassettes).
+    """
+    exc: Exception = RuntimeError(error)
+    # Check if this is a pruned block error
+    if isinstance(error, dict):
+        error_message = error.get("message", "")
+        if "pruned" in error_message.lower() or "not available" in error_message.lower():
+            # Try to extract block hash from params if available
+            block_hash = params[0] if params and isinstance(params[0], str) else None
+            exc = PrunedBlockError(block_hash=block_hash, message=str(error))
+    exc.rpc_error = error
+    return exc
+
+
+def rpc_error_code(error: Exception) -> Optional[int]:
+    """Return the JSON-RPC error code carried by an exception from map_rpc_error, or None."""
+    # RuntimeError(error) from map_rpc_error also carries the object as its argument
+    payload = getattr(error, "rpc_error", error.args[0] if error.args else None)
+    return payload.get("code") if isinstance(payload, dict) else None
+
+
+class _NotOnThisNode(Exception):
+    """Internal: the endpoint lacks the requested data, another node may have it."""
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _error_body(body: bytes) -> Any:
+    """Return the "error" member of a JSON-RPC reply body, or None if it has none."""
+    try:
+        reply = json.loads(body)
+    except ValueError:
+        return None
+    return reply.get("error") if isinstance(reply, dict) else None
+
+
+def _is_not_found(error: Any) -> bool:
+    """Return True for RPC_INVALID_ADDRESS_OR_KEY (-5), e.g. "Block not found"."""
+    return isinstance(error, dict) and error.get("code") == -5
+
+
 class RPCClient:
     """Bitcoin RPC client with persistent session."""
-    
-    def __init__(self, url: str, user: str, password: str):
+
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        user: str,
+        password: str,
+        batch_max_items: int = DEFAULT_RPC_BATCH_MAX_ITEMS,
+        batch_max_bytes: int = DEFAULT_RPC_BATCH_MAX_BYTES,
+        cassette: Optional[Cassette] = None,
+        cache: Optional[ResponseCache] = None,
+        flight: Optional[SingleFlight] = None,
+        limiter: Optional[RateLimiter] = None,
+        timeouts: Optional[AdaptiveTimeouts] = None,
+        hedge: bool = False,
+        breaker_failures: int = DEFAULT_RPC_BREAKER_FAILURES,
+        breaker_reset_secs: float = DEFAULT_RPC_BREAKER_RESET_SECS,
+    ):
         """
         Initialize RPC client.
-        
+
         Args:
-            url: RPC URL (e.g., "http://127.0.0.1:8332")
+            url: RPC URL (e.g., "http://127.0.0.1:8332"), or a list of URLs of
+                nodes sharing the same credentials. With several nodes,
+                read-only calls go to the fastest healthy node, tip calls
+                stick to one node, wallet calls go to the first (primary)
+                node, and unreachable or syncing nodes are failed over.
             user: RPC username
             password: RPC password
+            batch_max_items: Maximum number of calls sent in one batch request
+            batch_max_bytes: Approximate cap on the response size of one batch
+            cassette: Optional cassette to record every call to, or to answer
+                every call from without contacting a node (see rpc_cassette)
+            cache: Optional cache for immutable results (blocks by hash,
+                confirmed transactions), consulted before the node
+            flight: Optional single-flight group, usually shared with other
+                clients of the same nodes, that merges identical concurrent
+                calls into one request (see rpc_coalesce)
+            limiter: Optional rate limiter, usually shared with other clients
+                of the same nodes, that every request waits on according to
+                its priority class (see rpc_limiter and ``priority``)
+            timeouts: Per-method adaptive timeouts (default: AdaptiveTimeouts())
+            hedge: With several nodes, send a read-only call to a second node
+                when the first has not answered within the method's p95
+                latency, and use whichever answers first
+            breaker_failures: Consecutive connection failures or timeouts
+                after which an endpoint is not contacted for a while
+            breaker_reset_secs: Seconds before an open endpoint is probed again
         """
-        self.url = url
+        urls = [url] if isinstance(url, str) else list(url)
+        self.pool = EndpointPool(urls)
+        self.url = urls[0]
         self.session = requests.Session()
         self.session.headers["content-type"] = "application/json"
         self.session.auth = (user, password)
-    
+        self.batch_max_items = max(1, int(batch_max_items))
+        self.batch_max_bytes = max(1, int(batch_max_bytes))
+        # Observed response bytes per call, per method (EWMA), used to size batches
+        self._item_bytes: Dict[str, float] = {}
+        # Per-method call counts, latency histograms, bytes and errors
+        self.stats = CallStats()
+        self.cassette = cassette
+        self.cache = cache
+        self.flight = flight
+        self.limiter = limiter
+        # Per-thread priority class override set by priority()
+        self._local = threading.local()
+        self.timeouts = timeouts if timeouts is not None else AdaptiveTimeouts()
+        self.hedge = hedge
+        self.breakers = {
+            endpoint.url: CircuitBreaker(breaker_failures, breaker_reset_secs) for endpoint in self.pool.endpoints
+        }
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.hedge_stats = {"hedged": 0, "hedge_wins": 0}
+
+    @classmethod
+    def from_config(cls, config) -> "RPCClient":
+        """
+        Build an RPC client from a Config instance.
+
+        Args:
+            config: Configuration instance
+
+        Returns:
+            RPCClient configured with the rpc.* settings
+        """
+        cassette = Cassette.open(config.rpc_cassette_path, config.rpc_cassette_mode)
+        group = (tuple(config.rpc_urls), config.rpc_user)
+        resilience = config.rpc_resilience_config
+        return cls(
+            config.rpc_urls,
+            config.rpc_user,
+            config.rpc_password,
+            batch_max_items=config.rpc_batch_max_items,
+            batch_max_bytes=config.rpc_batch_max_bytes,
+            cassette=cassette,
+            # Cache hits and coalesced calls would bypass the cassette, leaving gaps in recordings
+            cache=ResponseCache(config.rpc_cache_max_bytes, config.rpc_cache_disk_dir or None)
+            if config.rpc_cache_enabled and cassette is None else None,
+            flight=SingleFlight.shared(group, config.rpc_tip_ttl_secs)
+            if config.rpc_coalesce_enabled and cassette is None else None,
+            limiter=RateLimiter.from_config(group, config.rpc_rate_limit_config),
+            timeouts=AdaptiveTimeouts(
+                config.rpc_timeout_secs,
+                resilience["timeout_min_secs"],
+                resilience["timeout_max_secs"],
+                resilience["timeout_multiplier"],
+            ),
+            hedge=resilience["hedge_enabled"],
+            breaker_failures=resilience["breaker_failures"],
+            breaker_reset_secs=resilience["breaker_reset_secs"],
+        )
+
+    @contextmanager
+    def priority(self, priority_class: str):
+        """
+        Send this thread's requests with the given priority class.
+
+        Args:
+            priority_class: "tip", "fees" or "backfill" (see rpc_limiter)
+        """
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = priority_class
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def priority_class(self, methods: Sequence[str]) -> str:
+        """Return the limiter class of a request: this thread's ``priority`` context, else the methods' default."""
+        return getattr(self._local, "priority", None) or classify_priority(methods)
+
     def call(self, method: str, *params: Any) -> Any:
         """
         Make an RPC call.
-        
+
         Args:
             method: RPC method name
             *params: RPC method parameters
-        
+
         Returns:
             RPC result
-        
+
         Raises:
             PrunedBlockError: If attempting to access a pruned block
             RuntimeError: If RPC returns an error
             requests.RequestException: If HTTP request fails
         """
+        cacheable = self.cache is not None and is_cacheable_method(method)
+        if cacheable:
+            cached = self.cache.get(method, params)
+            if cached is not MISS:
+                return cached
+
+        if self.flight is not None and self.flight.should_coalesce(method):
+            result = self.flight.do(method, params, lambda: self._call(method, params))
+        else:
+            result = self._call(method, params)
+            if self.flight is not None and method in UNTIMED_METHODS:
+                # A long-poll returning means the tip may have moved
+                self.flight.expire()
+        if cacheable:
+            self.cache.put(method, params, result)
+        return result
+
+    def _call(self, method: str, params: Sequence[Any]) -> Any:
+        """Make one RPC call over the network (or from the cassette)."""
+        if self.cassette is not None and self.cassette.replaying:
+            return self._replay(method, params)
+
         payload = {
             "jsonrpc": "2.0",
             "id": "fs",
             "method": method,
             "params": list(params)
         }
-        response = self.session.post(self.url, data=json.dumps(payload))
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result and result["error"]:
-            error = result["error"]
-            # Check if this is a pruned block error
-            if isinstance(error, dict):
-                error_message = error.get("message", "")
-                if "pruned" in error_message.lower() or "not available" in error_message.lower():
-                    # Try to extract block hash from params if available
-                    block_hash = params[0] if params and isinstance(params[0], str) else None
-                    raise PrunedBlockError(block_hash=block_hash, message=str(error))
-            raise RuntimeError(error)
-        
-        return result["result"]
+        data = json.dumps(payload)
+        received = 0
+
+        def send(endpoint: NodeEndpoint) -> Any:
+            nonlocal received
+            response = self._post(endpoint, data, [method], params=[params])
+            body = response.content
+            received += len(body)
+            # bitcoind sends RPC errors with HTTP 404/500 and a JSON-RPC error body;
+            # only replies without one are HTTP failures
+            if not response.ok and not _error_body(body):
+                response.raise_for_status()
+            result = json.loads(body)
+            if "error" in result and result["error"]:
+                error = map_rpc_error(result["error"], params)
+                if method in BLOCK_BY_HASH_METHODS and _is_not_found(result["error"]):
+                    # A lagging node may not have the block yet; try another one
+                    raise _NotOnThisNode(error)
+                raise error
+            return result["result"]
+
+        start = time.monotonic()
+        try:
+            result = self._with_failover([method], send, params=[params])
+        except Exception as e:
+            self.stats.record(method, time.monotonic() - start, len(data), received, errors=1)
+            if self.cassette is not None and hasattr(e, "rpc_error"):
+                self.cassette.record(method, params, error=e.rpc_error)
+            raise
+        self.stats.record(method, time.monotonic() - start, len(data), received)
+        if self.cassette is not None:
+            self.cassette.record(method, params, result)
+        return result
+
+    def expire_tip(self) -> None:
+        """Drop briefly cached tip answers, e.g. when a new block is announced."""
+        if self.flight is not None:
+            self.flight.expire()
+
+    def call_stream(self, method: str, *params: Any, chunk_size: int = 65536) -> Iterator[bytes]:
+        """
+        Make an RPC call and return the raw reply body as an iterator of chunks.
+
+        The body is not decoded, so callers can scan very large replies (e.g.
+        verbose getrawmempool, see ``mempool_stream``) without holding the
+        whole document in memory. RPC errors are left in the body.
+
+        Args:
+            method: RPC method name
+            *params: RPC method parameters
+            chunk_size: Bytes per chunk
+
+        Returns:
+            Iterator over the reply body. Its stats entry is recorded once the
+            iterator is exhausted, so the latency includes consumer time.
+
+        Raises:
+            requests.RequestException: If HTTP request fails
+        """
+        # Cassettes store streamed replies verbatim under a separate key
+        stream_key = f"stream:{method}"
+        if self.cassette is not None and self.cassette.replaying:
+            body = self._replay(stream_key, params).encode()
+            return iter([body[i:i + chunk_size] for i in range(0, len(body), chunk_size)])
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": "fs",
+            "method": method,
+            "params": list(params)
+        }
+        data = json.dumps(payload)
+
+        def send(endpoint: NodeEndpoint) -> requests.Response:
+            response = self._post(endpoint, data, [method], stream=True, params=[params])
+            # As in _call: an HTTP 404/500 carrying a JSON-RPC error is left in
+            # the (small, now buffered) body for the caller to decode
+            if not response.ok and not _error_body(response.content):
+                response.raise_for_status()
+            return response
+
+        start = time.monotonic()
+        try:
+            # A streamed response cannot be raced against another one
+            response = self._with_failover([method], send, hedge=False, params=[params])
+        except Exception:
+            self.stats.record(method, time.monotonic() - start, len(data), errors=1)
+            raise
+        chunks = response.iter_content(chunk_size=chunk_size)
+        if self.cassette is not None:
+            chunks = self._record_stream(stream_key, params, chunks)
+        return self._count_stream(method, len(data), start, chunks)
+
+    def _count_stream(self, method: str, sent: int, start: float, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass chunks through and record the call once the stream ends."""
+        received = 0
+        errors = 1
+        try:
+            for chunk in chunks:
+                received += len(chunk)
+                yield chunk
+            errors = 0
+        finally:
+            self.stats.record(method, time.monotonic() - start, sent, received, errors=errors)
+
+    def _record_stream(self, key: str, params: Sequence[Any], chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass chunks through and store the complete body in the cassette."""
+        body = bytearray()
+        for chunk in chunks:
+            body += chunk
+            yield chunk
+        self.cassette.record(key, params, body.decode("utf-8"))
+
+    def get_rest_block(self, block_hash: str) -> bytes:
+        """
+        Fetch a serialized block from bitcoind's REST interface.
+
+        Requires the node to run with ``-rest``. The binary form is about 2.5x
+        smaller than verbose JSON; decode it with ``block_parser.parse_block``.
+
+        Args:
+            block_hash: Block hash
+
+        Returns:
+            Raw block bytes
+
+        Raises:
+            PrunedBlockError: If the block is pruned and not available
+            requests.RequestException: If the REST request fails (e.g. REST disabled)
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            return bytes.fromhex(self._replay("rest/block", [block_hash]))
+
+        # Timed like the raw (verbosity 0) getblock it replaces
+        timing_params = [[block_hash, 0]]
+
+        def fetch(endpoint: NodeEndpoint) -> bytes:
+            parsed = urlparse(endpoint.url)
+            rest_url = f"{parsed.scheme}://{parsed.netloc}/rest/block/{block_hash}.bin"
+            start = time.monotonic()
+            response = self.session.get(rest_url, timeout=self._timeout(["getblock"], timing_params))
+            if response.status_code == 404:
+                message = response.text.strip()
+                if "pruned" in message.lower() or "not available" in message.lower():
+                    # REST replies are plain text: no JSON-RPC code to keep
+                    raise map_rpc_error({"code": None, "message": message}, [block_hash])
+                raise _NotOnThisNode(requests.HTTPError(message, response=response))
+            response.raise_for_status()
+            elapsed = time.monotonic() - start
+            self.pool.record_success(endpoint, "read", elapsed)
+            self.timeouts.observe(["getblock"], elapsed, timing_params)
+            return response.content
+
+        start = time.monotonic()
+        try:
+            content = self._with_failover(["getblock"], fetch, params=timing_params)
+        except Exception as e:
+            self.stats.record("rest/block", time.monotonic() - start, errors=1)
+            if self.cassette is not None and hasattr(e, "rpc_error"):
+                self.cassette.record("rest/block", [block_hash], error=e.rpc_error)
+            raise
+        self.stats.record("rest/block", time.monotonic() - start, bytes_received=len(content))
+        if self.cassette is not None:
+            self.cassette.record("rest/block", [block_hash], content.hex())
+        return content
+
+    def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """
+        Make several RPC calls using JSON-RPC batch requests.
+
+        Calls are split into chunks capped by ``batch_max_items`` and by the
+        estimated response size (``batch_max_bytes``), which is learned per
+        method from previous replies so that e.g. verbose blocks are sent in
+        far smaller chunks than ``getblockhash`` lookups.
+
+        Args:
+            calls: Sequence of (method, params) pairs
+
+        Returns:
+            List of results in the same order as ``calls``. A call that failed
+            on the node is represented by its exception instance
+            (PrunedBlockError or RuntimeError) instead of a result.
+
+        Raises:
+            RuntimeError: If the node returns a malformed batch reply
+            requests.RequestException: If HTTP request fails
+        """
+        results: List[Any] = [MISS] * len(calls)
+        if self.cache is not None:
+            for idx, (method, params) in enumerate(calls):
+                if is_cacheable_method(method):
+                    results[idx] = self.cache.get(method, params)
+        # Only calls not answered by the cache go to the node
+        pending = [idx for idx, result in enumerate(results) if result is MISS]
+        if not pending:
+            return results
+        missing = [calls[idx] for idx in pending]
+
+        if self.cassette is not None and self.cassette.replaying:
+            fetched = [self._replay_item(method, params) for method, params in missing]
+        else:
+            fetched = []
+            start = 0
+            while start < len(missing):
+                end = self._next_batch_end(missing, start)
+                fetched.extend(self._send_batch(missing[start:end]))
+                start = end
+
+            if self.cassette is not None:
+                for (method, params), result in zip(missing, fetched):
+                    if isinstance(result, Exception):
+                        self.cassette.record(method, params, error=result.rpc_error)
+                    else:
+                        self.cassette.record(method, params, result)
+
+        for idx, (method, params), result in zip(pending, missing, fetched):
+            results[idx] = result
+            if self.cache is not None and not isinstance(result, Exception) and is_cacheable_method(method):
+                self.cache.put(method, params, result)
+        return results
+
+    def _replay(self, method: str, params: Sequence[Any]) -> Any:
+        """Answer a call from the cassette, raising recorded node errors."""
+        result, error = self.cassette.replay(method, params)
+        if error is not None:
+            raise map_rpc_error(error, params)
+        return result
+
+    def _replay_item(self, method: str, params: Sequence[Any]) -> Any:
+        """Answer a batched call from the cassette with batch error semantics."""
+        try:
+            return self._replay(method, params)
+        except (PrunedBlockError, RuntimeError) as e:
+            return e
+
+    def _next_batch_end(self, calls: Sequence[Tuple[str, Sequence[Any]]], start: int) -> int:
+        """Return the end index of the next batch chunk starting at ``start``."""
+        end = start
+        estimated_bytes = 0.0
+        while end < len(calls) and end - start < self.batch_max_items:
+            item_bytes = self._item_bytes.get(calls[end][0], DEFAULT_RPC_BATCH_ITEM_BYTES)
+            # Always send at least one call, even if it is expected to be huge
+            if end > start and estimated_bytes + item_bytes > self.batch_max_bytes:
+                break
+            estimated_bytes += item_bytes
+            end += 1
+        return end
+
+    def _send_batch(self, chunk: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """Send one batch request and return per-call results or exceptions."""
+        payload = [
+            {"jsonrpc": "2.0", "id": idx, "method": method, "params": list(params)}
+            for idx, (method, params) in enumerate(chunk)
+        ]
+        data = json.dumps(payload)
+        methods = [method for method, _ in chunk]
+        params = [call_params for _, call_params in chunk]
+        start = time.monotonic()
+        try:
+            response = self._with_failover(
+                methods, lambda endpoint: self._post(endpoint, data, methods, params=params), params=params
+            )
+            response.raise_for_status()
+            body = response.content
+            replies = json.loads(body)
+            if not isinstance(replies, list):
+                # Whole-batch failure (e.g. node rejected the request)
+                error = replies.get("error") if isinstance(replies, dict) else replies
+                raise RuntimeError(error or "Invalid batch reply")
+        except Exception:
+            self._record_batch(chunk, time.monotonic() - start, len(data), 0, failed=True)
+            raise
+
+        self._observe_batch(chunk, len(body))
+
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        results: List[Any] = []
+        for idx, (method, params) in enumerate(chunk):
+            reply = by_id.get(idx)
+            if reply is None:
+                results.append(map_rpc_error({"code": None, "message": f"No reply for batched call {method}"}, params))
+            elif reply.get("error"):
+                results.append(map_rpc_error(reply["error"], params))
+            else:
+                results.append(reply.get("result"))
+        self._record_batch(chunk, time.monotonic() - start, len(data), len(body), results=results)
+        return results
+
+    def _record_batch(
+        self,
+        chunk: Sequence[Tuple[str, Sequence[Any]]],
+        elapsed: float,
+        sent: int,
+        received: int,
+        failed: bool = False,
+        results: Sequence[Any] = (),
+    ) -> None:
+        """Record one batch request in the per-method stats, splitting bytes by call share."""
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for idx, (method, _) in enumerate(chunk):
+            counts[method] = counts.get(method, 0) + 1
+            if failed or (idx < len(results) and isinstance(results[idx], Exception)):
+                errors[method] = errors.get(method, 0) + 1
+        for method, count in counts.items():
+            share = count / len(chunk)
+            self.stats.record(
+                method,
+                elapsed,
+                int(sent * share),
+                int(received * share),
+                errors=errors.get(method, 0),
+                calls=count,
+            )
+
+    def _with_failover(
+        self,
+        methods: Sequence[str],
+        send: Callable[[NodeEndpoint], Any],
+        hedge: bool = True,
+        params: Optional[Sequence[Sequence[Any]]] = None,
+    ) -> Any:
+        """
+        Run ``send`` against the endpoints suited to ``methods`` until one succeeds.
+
+        With a rate limiter, waits for a token of the request's priority class
+        first. Endpoints with an open circuit are skipped, and read-only calls
+        may be hedged to a second node (see ``hedge``). Connection failures
+        and timeouts mark the endpoint down and move on to the next candidate;
+        any other error is raised immediately. ``params`` (aligned with
+        ``methods``) selects the latency history used for the hedge delay.
+
+        Raises:
+            CircuitOpenError: If every endpoint's circuit is open
+        """
+        if self.limiter is not None:
+            self.limiter.acquire(self.priority_class(methods))
+        kind = classify_methods(methods)
+        # The probe slot of a half-open breaker is only claimed in _attempt,
+        # so endpoints that end up not being tried stay eligible
+        candidates = [ep for ep in self.pool.candidates(kind) if self.breakers[ep.url].available()]
+        if not candidates:
+            raise CircuitOpenError(f"RPC circuit open for all endpoints; not calling {methods[0]}")
+        last_error: Exception = requests.exceptions.ConnectionError("No RPC endpoint available")
+
+        if hedge and self.hedge and kind == "read" and len(candidates) > 1:
+            delay = self.timeouts.hedge_delay(methods, params)
+            if delay is not None:
+                result, error = self._hedged(candidates[:2], send, delay)
+                if error is None:
+                    return result
+                last_error = error
+                candidates = candidates[2:]
+
+        for endpoint in candidates:
+            if self.pool.needs_check(endpoint) and not self._check_sync_state(endpoint):
+                if len(candidates) > 1:
+                    continue
+            try:
+                return self._attempt(endpoint, send)
+            except CircuitOpenError as e:
+                # Lost the half-open probe to another thread: nothing was sent, try the next node
+                last_error = e
+                continue
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = e
+            except _NotOnThisNode as e:
+                last_error = e.error
+        raise last_error
+
+    def _attempt(self, endpoint: NodeEndpoint, send: Callable[[NodeEndpoint], Any]) -> Any:
+        """Run ``send`` on one endpoint, updating its health and circuit breaker."""
+        breaker = self.breakers[endpoint.url]
+        if not breaker.allow():
+            # Another thread took the half-open probe since the candidates were picked
+            raise CircuitOpenError(f"RPC circuit open for {endpoint.url}")
+        try:
+            result = send(endpoint)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            logger.warning(f"RPC endpoint {endpoint.url} unreachable: {e}")
+            self.pool.record_failure(endpoint)
+            breaker.record_failure()
+            if breaker.state == "open":
+                logger.warning(f"RPC circuit opened for {endpoint.url} after {breaker.failures} failures")
+            raise
+        except Exception:
+            # The node answered, even if with an error
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+
+    def _hedged(
+        self, endpoints: Sequence[NodeEndpoint], send: Callable[[NodeEndpoint], Any], delay: float
+    ) -> Tuple[Any, Optional[Exception]]:
+        """
+        Race a read against a second endpoint if the first is slower than ``delay``.
+
+        Returns:
+            Tuple of (result, None) from the first endpoint to answer, or
+            (None, error) if both were unreachable or lacked the data. Node
+            errors (PrunedBlockError, RuntimeError) are raised.
+        """
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rpc-hedge")
+        first = self._hedge_executor.submit(self._attempt, endpoints[0], send)
+        futures = {first: endpoints[0]}
+        wait([first], timeout=delay)
+        retryable = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, _NotOnThisNode)
+        if not first.done() or isinstance(first.exception(), retryable):
+            # First endpoint is slow (or failed): ask the second one too
+            self.hedge_stats["hedged"] += 1
+            futures[self._hedge_executor.submit(self._attempt, endpoints[1], send)] = endpoints[1]
+        last_error: Optional[Exception] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    last_error = e
+                    continue
+                except _NotOnThisNode as e:
+                    last_error = e.error
+                    continue
+                if futures[future] is endpoints[1]:
+                    self.hedge_stats["hedge_wins"] += 1
+                # The slower request finishes in the background and is discarded
+                return result, None
+        return None, last_error
+
+    def _timeout(
+        self, methods: Sequence[str], params: Optional[Sequence[Sequence[Any]]] = None
+    ) -> Tuple[float, float]:
+        """Return the (connect, read) timeout for a request."""
+        read = self.timeouts.timeout(methods, params)
+        return min(DEFAULT_RPC_CONNECT_TIMEOUT_SECS, read), read
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """
+        Get adaptive timeouts, circuit breaker states and hedging counters.
+
+        Returns:
+            Dictionary with "timeouts" (seconds per method), "breakers"
+            (state per endpoint URL) and the hedged/hedge_wins counters
+        """
+        return {
+            "timeouts": self.timeouts.snapshot(),
+            "breakers": {url: breaker.state for url, breaker in self.breakers.items()},
+            **self.hedge_stats,
+        }
+
+    def _post(
+        self,
+        endpoint: NodeEndpoint,
+        data: str,
+        methods: Sequence[str],
+        stream: bool = False,
+        params: Optional[Sequence[Sequence[Any]]] = None,
+    ) -> requests.Response:
+        """POST a JSON-RPC payload to one endpoint and record its latency."""
+        start = time.monotonic()
+        response = self.session.post(
+            endpoint.url, data=data, stream=stream, timeout=self._timeout(methods, params)
+        )
+        elapsed = time.monotonic() - start
+        timed = not any(method in UNTIMED_METHODS for method in methods)
+        self.pool.record_success(endpoint, classify_methods(methods), elapsed if timed else None)
+        self.timeouts.observe(methods, elapsed, params)
+        return response
+
+    def _check_sync_state(self, endpoint: NodeEndpoint) -> bool:
+        """
+        Refresh whether a node is still in initial block download.
+
+        Returns:
+            True if the endpoint is reachable and synced
+        """
+        payload = json.dumps({"jsonrpc": "2.0", "id": "fs", "method": "getblockchaininfo", "params": []})
+        try:
+            response = self.session.post(endpoint.url, data=payload, timeout=self._timeout(["getblockchaininfo"]))
+            response.raise_for_status()
+            info = response.json().get("result") or {}
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"RPC endpoint {endpoint.url} health check failed: {e}")
+            self.pool.record_failure(endpoint)
+            return False
+        syncing = bool(info.get("initialblockdownload", False))
+        if syncing and not endpoint.syncing:
+            logger.warning(f"RPC endpoint {endpoint.url} is in initial block download; skipping it")
+        self.pool.record_sync_state(endpoint, syncing)
+        return not syncing
 
+    def _observe_batch(self, chunk: Sequence[Tuple[str, Sequence[Any]]], body_bytes: int) -> None:
+        """Update per-method response size estimates from a batch reply."""
+        per_item = body_bytes / max(1, len(chunk))
+        for method in {method for method, _ in chunk}:
+            previous = self._item_bytes.get(method)
+            if previous is None:
+                self._item_bytes[method] = per_item
+            else:
+                self._item_bytes[method] = 0.7 * previous + 0.3 * per_item
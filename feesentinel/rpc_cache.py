@@ -0,0 +1,234 @@
+"""Byte-bounded cache for RPC results that never change.
+
+Only results addressed by content are cached: blocks and block stats by
+block hash, and confirmed transactions (those whose reply names a
+``blockhash``). Each entry is tagged with the block it belongs to so that a
+reorg can drop everything from the disconnected blocks. Fields that change as
+the chain grows (``confirmations``, ``nextblockhash``) are removed before
+storing.
+
+Entries are kept serialized, which makes the byte budget exact and hands every
+caller its own copy. An optional on-disk tier keeps entries across restarts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .constants import DEFAULT_RPC_CACHE_MAX_BYTES
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Methods whose first parameter is a block hash and whose result is fixed by it
+_BLOCK_KEYED_METHODS = frozenset({"getblock", "getblockheader", "getblockstats"})
+
+# Fields that keep changing after a block or transaction is confirmed
+_VOLATILE_FIELDS = ("confirmations", "nextblockhash")
+
+# Marker distinguishing "not cached" from a cached None
+MISS = object()
+
+
+def _strip_volatile(result: Any) -> Any:
+    """Drop fields that change as the chain grows."""
+    if isinstance(result, dict) and any(field in result for field in _VOLATILE_FIELDS):
+        result = {k: v for k, v in result.items() if k not in _VOLATILE_FIELDS}
+    return result
+
+
+def cache_tag(method: str, params: Sequence[Any], result: Any) -> Optional[str]:
+    """
+    Return the block hash an immutable result belongs to, or None if uncacheable.
+
+    Args:
+        method: RPC method
+        params: Call parameters
+        result: Call result
+
+    Returns:
+        Block hash used to invalidate the entry on reorg, or None
+    """
+    if method in _BLOCK_KEYED_METHODS:
+        if params and isinstance(params[0], str) and len(params[0]) == 64:
+            return params[0]
+        return None
+    if method == "getrawtransaction" and isinstance(result, dict):
+        # Mempool transactions have no blockhash and may still be replaced
+        return result.get("blockhash")
+    return None
+
+
+def is_cacheable_method(method: str) -> bool:
+    """Return True if results of ``method`` may be served from the cache."""
+    return method in _BLOCK_KEYED_METHODS or method == "getrawtransaction"
+
+
+class ResponseCache:
+    """LRU cache of immutable RPC results bounded by total serialized bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_RPC_CACHE_MAX_BYTES, disk_dir: Optional[str] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            max_bytes: Memory budget for serialized entries
+            disk_dir: Optional directory for a persistent second tier
+        """
+        self.max_bytes = max(0, int(max_bytes))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # key -> (tag, serialized result)
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(method: str, params: Sequence[Any]) -> str:
+        """Canonical cache key for a call."""
+        return method + " " + json.dumps(list(params), sort_keys=True, separators=(",", ":"))
+
+    def get(self, method: str, params: Sequence[Any]) -> Any:
+        """
+        Look up a cached result.
+
+        Args:
+            method: RPC method
+            params: Call parameters
+
+        Returns:
+            Decoded result, or MISS
+        """
+        key = self.key(method, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return json.loads(entry[1])
+
+        if self.disk_dir is not None:
+            found = self._disk_read(key)
+            if found is not None:
+                tag, data = found
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                    self._insert(key, tag, data)
+                return json.loads(data)
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return MISS
+
+    def put(self, method: str, params: Sequence[Any], result: Any) -> bool:
+        """
+        Store a result if it is immutable.
+
+        Args:
+            method: RPC method
+            params: Call parameters
+            result: Call result
+
+        Returns:
+            True if the result was cached
+        """
+        tag = cache_tag(method, params, result)
+        if tag is None:
+            return False
+        key = self.key(method, params)
+        data = json.dumps(_strip_volatile(result), separators=(",", ":")).encode()
+        with self._lock:
+            self._insert(key, tag, data)
+        if self.disk_dir is not None:
+            self._disk_write(key, tag, data)
+        return True
+
+    def invalidate_blocks(self, block_hashes: Iterable[str]) -> int:
+        """
+        Drop every entry belonging to the given blocks (after a reorg).
+
+        Args:
+            block_hashes: Hashes of disconnected blocks
+
+        Returns:
+            Number of entries removed from memory and disk
+        """
+        tags = set(block_hashes)
+        removed = 0
+        with self._lock:
+            for key in [k for k, (tag, _) in self._entries.items() if tag in tags]:
+                _, data = self._entries.pop(key)
+                self._bytes -= len(data)
+                removed += 1
+        if self.disk_dir is not None:
+            removed += self._disk_invalidate(tags)
+        with self._lock:
+            self._counters["invalidations"] += removed
+        if removed:
+            logger.info(f"Invalidated {removed} cached RPC results from {len(tags)} reorged block(s)")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+
+    def _insert(self, key: str, tag: str, data: bytes) -> None:
+        """Insert under the lock and evict least recently used entries over budget."""
+        # A single huge block must not flush the many small entries
+        if len(data) > self.max_bytes // 4:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[1])
+        self._entries[key] = (tag, data)
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._counters["evictions"] += 1
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.disk_dir / digest[:2] / f"{digest[2:34]}.json"
+
+    def _disk_read(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """Read an entry from disk: the tag line followed by the serialized result."""
+        try:
+            raw = self._disk_path(key).read_bytes()
+        except OSError:
+            return None
+        tag, _, data = raw.partition(b"\n")
+        return tag.decode(), data
+
+    def _disk_write(self, key: str, tag: str, data: bytes) -> None:
+        """Write an entry atomically; failures only cost a future miss."""
+        path = self._disk_path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp.write_bytes(tag.encode() + b"\n" + data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write RPC cache entry {path}: {e}")
+
+    def _disk_invalidate(self, tags: set) -> int:
+        """Remove disk entries of the given blocks (scans the tier; reorgs are rare)."""
+        removed = 0
+        for path in self.disk_dir.glob("*/*.json"):
+            try:
+                with path.open("rb") as f:
+                    tag = f.readline().strip().decode()
+                if tag in tags:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
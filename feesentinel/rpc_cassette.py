@@ -0,0 +1,162 @@
+"""Record/replay of RPC traffic for deterministic runs without a node.
+
+A cassette is a gzip-compressed JSONL file with one record per RPC call:
+``{"m": method, "p": params, "r": result}`` or ``{"m": ..., "p": ..., "e":
+error}``. On replay the records are indexed by method and params; repeated
+identical calls (e.g. ``getblockcount``) are answered in recorded order, and
+the last answer is repeated once a key's recordings are used up.
+"""
+
+import atexit
+import gzip
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Cassettes are shared per path so that runners in the same process (cli
+# comprehensive mode) append to and replay from a single file.
+_open_cassettes: Dict[str, "Cassette"] = {}
+_open_lock = threading.Lock()
+
+
+class CassetteMiss(RuntimeError):
+    """Raised on replay when a call was never recorded."""
+
+
+def _key(method: str, params: Sequence[Any]) -> str:
+    """Canonical index key for a call."""
+    return method + " " + json.dumps(list(params), sort_keys=True, separators=(",", ":"))
+
+
+class Cassette:
+    """A recording or replaying RPC cassette."""
+
+    def __init__(self, path: str, mode: str):
+        """
+        Open a cassette.
+
+        Args:
+            path: Cassette file (gzip JSONL)
+            mode: "record" to append calls, "replay" to answer calls from it
+
+        Raises:
+            ValueError: If mode is not "record" or "replay"
+            FileNotFoundError: If replaying a cassette that does not exist
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._index: Dict[str, Deque[Dict]] = {}
+        self._last: Dict[str, Dict] = {}
+        self._file = None
+
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+            atexit.register(self.close)
+
+    @classmethod
+    def open(cls, path: str, mode: str) -> Optional["Cassette"]:
+        """
+        Get the shared cassette for a path, opening it on first use.
+
+        Args:
+            path: Cassette file
+            mode: "off", "record" or "replay"
+
+        Returns:
+            Cassette instance, or None if mode is "off"
+        """
+        if mode == "off" or not mode:
+            return None
+        with _open_lock:
+            cassette = _open_cassettes.get(path)
+            if cassette is None or cassette.mode != mode:
+                cassette = cls(path, mode)
+                _open_cassettes[path] = cassette
+            return cassette
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _load(self) -> None:
+        """Index a cassette for replay."""
+        count = 0
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self._index.setdefault(_key(record["m"], record["p"]), deque()).append(record)
+                count += 1
+        logger.info(f"Loaded RPC cassette {self.path} ({count} calls, {len(self._index)} distinct)")
+
+    def record(self, method: str, params: Sequence[Any], result: Any = None, error: Any = None) -> None:
+        """
+        Append one call to the cassette.
+
+        Args:
+            method: RPC method (or pseudo-method such as "rest/block")
+            params: Call parameters
+            result: Call result (JSON-serializable)
+            error: JSON-RPC error object, if the call failed on the node
+        """
+        record: Dict[str, Any] = {"m": method, "p": list(params)}
+        if error is not None:
+            record["e"] = error
+        else:
+            record["r"] = result
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+
+    def replay(self, method: str, params: Sequence[Any]) -> Tuple[Any, Optional[Any]]:
+        """
+        Look up the next recorded answer for a call.
+
+        Args:
+            method: RPC method
+            params: Call parameters
+
+        Returns:
+            Tuple of (result, error); error is the recorded JSON-RPC error
+            object or None
+
+        Raises:
+            CassetteMiss: If the call was never recorded
+        """
+        key = _key(method, params)
+        with self._lock:
+            queue = self._index.get(key)
+            if queue:
+                record = queue.popleft()
+                self._last[key] = record
+            else:
+                record = self._last.get(key)
+        if record is None:
+            raise CassetteMiss(f"No recorded response for {method} {list(params)}")
+        return record.get("r"), record.get("e")
+
+    def close(self) -> None:
+        """Flush and close a recording cassette."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
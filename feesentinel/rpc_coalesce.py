@@ -0,0 +1,141 @@
+"""Single-flight coalescing of identical concurrent RPC calls.
+
+In comprehensive mode the fee and event threads each own an RPCClient but
+talk to the same node(s), and both keep asking for the tip. A SingleFlight is
+shared by every client with the same nodes and credentials: while a call is
+on the wire, identical calls from any thread wait for it and receive the same
+decoded result instead of sending their own request. Tip lookups are also
+kept fresh for a short TTL, so back-to-back ``getblockcount`` calls from the
+two runners cost one round trip.
+
+Shared results are the same object for every caller and must not be mutated.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from .constants import DEFAULT_RPC_TIP_TTL_SECS
+from .rpc_pool import READ_ONLY_METHODS, TIP_METHODS, UNTIMED_METHODS
+
+# Calls that return the same answer to every caller at the same moment.
+# Long-polls are excluded: each waiter passes its own height and timeout.
+COALESCED_METHODS = (TIP_METHODS | READ_ONLY_METHODS) - UNTIMED_METHODS
+
+# Tip calls whose answer is reused for the freshness TTL
+TTL_METHODS = frozenset({"getblockcount", "getbestblockhash", "getblockchaininfo", "getchaintips"})
+
+_shared: Dict[Tuple, "SingleFlight"] = {}
+_shared_lock = threading.Lock()
+
+
+class _Flight:
+    """One in-flight call that followers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces identical in-flight calls and caches tip answers briefly."""
+
+    def __init__(self, tip_ttl_secs: float = DEFAULT_RPC_TIP_TTL_SECS):
+        """
+        Initialize single-flight group.
+
+        Args:
+            tip_ttl_secs: Seconds a TTL_METHODS answer is reused (0 disables)
+        """
+        self.tip_ttl_secs = max(0.0, float(tip_ttl_secs))
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}
+        # key -> (expires at, result)
+        self._fresh: Dict[str, Tuple[float, Any]] = {}
+        self._counters = {"leaders": 0, "coalesced": 0, "ttl_hits": 0}
+
+    @classmethod
+    def shared(cls, group: Tuple, tip_ttl_secs: float = DEFAULT_RPC_TIP_TTL_SECS) -> "SingleFlight":
+        """
+        Get the process-wide group for a set of nodes, creating it on first use.
+
+        Args:
+            group: Hashable identity of the nodes, e.g. (urls, user)
+            tip_ttl_secs: TTL used if the group is created
+
+        Returns:
+            SingleFlight shared by all clients of that group
+        """
+        with _shared_lock:
+            flight = _shared.get(group)
+            if flight is None:
+                flight = _shared[group] = cls(tip_ttl_secs)
+            return flight
+
+    @staticmethod
+    def should_coalesce(method: str) -> bool:
+        """Return True if concurrent identical calls of ``method`` may share one request."""
+        return method in COALESCED_METHODS
+
+    def do(self, method: str, params: Sequence[Any], fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` unless an identical call is in flight or freshly answered.
+
+        Args:
+            method: RPC method
+            params: Call parameters
+            fn: Performs the call; only the leader of a flight runs it
+
+        Returns:
+            The call result, shared with every coalesced caller
+
+        Raises:
+            Exception: Whatever the leader's call raised
+        """
+        key = method + " " + repr(list(params))
+        ttl = self.tip_ttl_secs if method in TTL_METHODS else 0.0
+        with self._lock:
+            if ttl:
+                fresh = self._fresh.get(key)
+                if fresh is not None and fresh[0] > time.monotonic():
+                    self._counters["ttl_hits"] += 1
+                    return fresh[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._counters["leaders"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if ttl and flight.error is None:
+                    self._fresh[key] = (time.monotonic() + ttl, flight.result)
+            flight.done.set()
+
+    def expire(self) -> None:
+        """Forget fresh tip answers (a new block was seen)."""
+        with self._lock:
+            self._fresh.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return leader/coalesced/TTL-hit counters."""
+        with self._lock:
+            return dict(self._counters)
@@ -0,0 +1,231 @@
+"""Priority-aware token-bucket rate limiting of RPC requests.
+
+bitcoind serves RPC from a small work queue (``-rpcworkqueue``, 16 by
+default). A burst of enrichment lookups can fill it and delay the calls that
+matter: tip and reorg checks, then the fee snapshot that drives alerts. Every
+HTTP request takes one token from its priority class's bucket and one from a
+shared node bucket. While a higher class is waiting for a shared token, lower
+classes do not take one, so under pressure backfill waits first.
+
+Priority classes, most urgent first:
+
+- ``tip``: chain tip and reorg checks, the block being processed at the tip
+- ``fees``: mempool reads for fee snapshots
+- ``backfill``: catch-up blocks, transaction enrichment and everything else
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from .rpc_pool import TIP_METHODS
+
+PRIORITY_CLASSES = ("tip", "fees", "backfill")
+
+# Reads behind fee snapshots
+FEE_METHODS = frozenset({"getrawmempool", "getmempoolinfo", "getmempoolentry", "estimatesmartfee"})
+
+# Blocks fetched by hash are usually the new tip; callers catching up mark
+# their calls as backfill explicitly
+_TIP_BLOCK_METHODS = frozenset({"getblock", "getblockheader"})
+
+_shared: Dict[Tuple, "RateLimiter"] = {}
+_shared_lock = threading.Lock()
+
+
+def classify_priority(methods: Iterable[str]) -> str:
+    """
+    Return the default priority class of a call (or batch of calls).
+
+    Args:
+        methods: RPC method names
+
+    Returns:
+        The most urgent class among the calls
+    """
+    best = len(PRIORITY_CLASSES) - 1
+    for method in methods:
+        if method in TIP_METHODS or method in _TIP_BLOCK_METHODS:
+            return "tip"
+        if method in FEE_METHODS:
+            best = min(best, 1)
+    return PRIORITY_CLASSES[best]
+
+
+class _Bucket:
+    """Token bucket; a rate of 0 means unlimited."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready(self) -> bool:
+        return not self.rate or self.tokens >= 1.0
+
+    def take(self) -> None:
+        if self.rate:
+            self.tokens -= 1.0
+
+    def wait_secs(self) -> float:
+        """Seconds until a token is available."""
+        if self.ready():
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class _ClassStats:
+    __slots__ = ("queued", "max_queued", "acquired", "waited", "wait_secs", "max_wait_secs")
+
+    def __init__(self):
+        self.queued = 0
+        self.max_queued = 0
+        self.acquired = 0
+        self.waited = 0
+        self.wait_secs = 0.0
+        self.max_wait_secs = 0.0
+
+
+class RateLimiter:
+    """Token-bucket limiter with strict priority between classes."""
+
+    def __init__(self, per_sec: float, burst: float, classes: Optional[Dict[str, Dict]] = None):
+        """
+        Initialize rate limiter.
+
+        Args:
+            per_sec: Requests per second for the node as a whole (0 = unlimited)
+            burst: Requests the node bucket can hold
+            classes: Optional {class: {"per_sec": ..., "burst": ...}} budgets;
+                missing classes are only bounded by the node bucket
+        """
+        classes = classes or {}
+        self._node = _Bucket(per_sec, burst)
+        self._buckets = {
+            name: _Bucket(classes.get(name, {}).get("per_sec", 0), classes.get(name, {}).get("burst", 1))
+            for name in PRIORITY_CLASSES
+        }
+        self._stats = {name: _ClassStats() for name in PRIORITY_CLASSES}
+        self._cond = threading.Condition()
+
+    @classmethod
+    def shared(cls, group: Tuple, per_sec: float, burst: float,
+               classes: Optional[Dict[str, Dict]] = None) -> "RateLimiter":
+        """
+        Get the process-wide limiter for a set of nodes, creating it on first use.
+
+        Args:
+            group: Hashable identity of the nodes, e.g. (urls, user)
+            per_sec: Node budget used if the limiter is created
+            burst: Node burst used if the limiter is created
+            classes: Class budgets used if the limiter is created
+
+        Returns:
+            RateLimiter shared by all clients of that group
+        """
+        with _shared_lock:
+            limiter = _shared.get(group)
+            if limiter is None:
+                limiter = _shared[group] = cls(per_sec, burst, classes)
+            return limiter
+
+    @classmethod
+    def from_config(cls, group: Tuple, rate_limit_config: Dict) -> Optional["RateLimiter"]:
+        """
+        Get the shared limiter described by ``Config.rpc_rate_limit_config``.
+
+        Args:
+            group: Hashable identity of the nodes, e.g. (urls, user)
+            rate_limit_config: Dictionary with enabled, per_sec, burst and classes
+
+        Returns:
+            RateLimiter, or None if rate limiting is disabled
+        """
+        if not rate_limit_config["enabled"]:
+            return None
+        return cls.shared(
+            group,
+            rate_limit_config["per_sec"],
+            rate_limit_config["burst"],
+            rate_limit_config["classes"],
+        )
+
+    def _blocked_by_higher(self, priority: str) -> bool:
+        """Return True if a more urgent class is queued and only lacks a node token."""
+        for name in PRIORITY_CLASSES[:PRIORITY_CLASSES.index(priority)]:
+            if self._stats[name].queued and self._buckets[name].ready():
+                return True
+        return False
+
+    def acquire(self, priority: str) -> float:
+        """
+        Block until a request of the given class may be sent.
+
+        Args:
+            priority: One of PRIORITY_CLASSES
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            ValueError: If priority is not a known class
+        """
+        if priority not in self._buckets:
+            raise ValueError(f"Unknown RPC priority class: {priority}")
+        bucket = self._buckets[priority]
+        stats = self._stats[priority]
+        start = time.monotonic()
+        with self._cond:
+            stats.queued += 1
+            stats.max_queued = max(stats.max_queued, stats.queued)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._node.refill(now)
+                    bucket.refill(now)
+                    if bucket.ready() and self._node.ready() and not self._blocked_by_higher(priority):
+                        bucket.take()
+                        self._node.take()
+                        break
+                    # Re-check when a token is due or when another class finishes
+                    delay = max(bucket.wait_secs(), self._node.wait_secs())
+                    self._cond.wait(delay or 0.05)
+            finally:
+                stats.queued -= 1
+                self._cond.notify_all()
+            waited = time.monotonic() - start
+            stats.acquired += 1
+            if waited > 0.001:
+                stats.waited += 1
+            stats.wait_secs += waited
+            stats.max_wait_secs = max(stats.max_wait_secs, waited)
+        return waited
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Return queue depth and wait-time counters per class.
+
+        Returns:
+            Dictionary mapping class to queued (now), max_queued, acquired,
+            waited (requests that had to wait), wait_secs and max_wait_secs
+        """
+        with self._cond:
+            return {
+                name: {
+                    "queued": s.queued,
+                    "max_queued": s.max_queued,
+                    "acquired": s.acquired,
+                    "waited": s.waited,
+                    "wait_secs": round(s.wait_secs, 3),
+                    "max_wait_secs": round(s.max_wait_secs, 3),
+                }
+                for name, s in self._stats.items()
+            }
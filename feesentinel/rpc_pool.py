@@ -0,0 +1,197 @@
+"""Endpoint selection for RPC clients talking to several bitcoind nodes."""
+
+import time
+from typing import Iterable, List, Optional, Sequence
+from .constants import (
+    DEFAULT_RPC_ENDPOINT_RETRY_SECS,
+    DEFAULT_RPC_HEALTH_CHECK_SECS,
+)
+
+# Calls describing the chain tip. They stick to one node so that heights and
+# hashes compared during reorg checks come from the same view of the chain.
+TIP_METHODS = frozenset({
+    "getblockcount",
+    "getbestblockhash",
+    "getblockhash",
+    "getblockchaininfo",
+    "getchaintips",
+    "waitfornewblock",
+    "waitforblock",
+    "waitforblockheight",
+})
+
+# Calls that return the same answer on any synced node and can be spread out
+READ_ONLY_METHODS = frozenset({
+    "getblock",
+    "getblockheader",
+    "getblockstats",
+    "getrawtransaction",
+    "getrawmempool",
+    "getmempoolinfo",
+    "getmempoolentry",
+    "getmempoolancestors",
+    "getmempooldescendants",
+    "gettxout",
+    "estimatesmartfee",
+    "decoderawtransaction",
+    "decodescript",
+    "getnetworkinfo",
+    "getindexinfo",
+})
+
+# Read-only calls addressing a block by hash: a lagging node may not have it yet
+BLOCK_BY_HASH_METHODS = frozenset({"getblock", "getblockheader", "getblockstats"})
+
+# Long-polls take as long as the node wants; they say nothing about latency
+UNTIMED_METHODS = frozenset({"waitfornewblock", "waitforblock", "waitforblockheight"})
+
+
+def classify_methods(methods: Iterable[str]) -> str:
+    """
+    Classify a call (or batch of calls) for routing.
+
+    Args:
+        methods: RPC method names
+
+    Returns:
+        "primary" if any call must go to the primary node (wallet and other
+        node-specific calls), "tip" if any call reads the chain tip, else "read"
+    """
+    kinds = set()
+    for method in methods:
+        if method in TIP_METHODS:
+            kinds.add("tip")
+        elif method not in READ_ONLY_METHODS:
+            return "primary"
+    return "tip" if kinds else "read"
+
+
+class NodeEndpoint:
+    """Health and latency state for one bitcoind RPC endpoint."""
+
+    def __init__(self, url: str):
+        """
+        Initialize endpoint state.
+
+        Args:
+            url: RPC URL of the node
+        """
+        self.url = url
+        self.latency: Optional[float] = None  # EWMA seconds
+        self.down_until = 0.0
+        self.syncing = False
+        self.checked_at: Optional[float] = None
+
+    def is_available(self, now: float) -> bool:
+        """Return True if the endpoint is neither marked down nor in IBD."""
+        return now >= self.down_until and not self.syncing
+
+    def __repr__(self) -> str:
+        return f"NodeEndpoint({self.url!r})"
+
+
+class EndpointPool:
+    """Orders endpoints for each call by health, latency and stickiness."""
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        retry_secs: float = DEFAULT_RPC_ENDPOINT_RETRY_SECS,
+        health_check_secs: float = DEFAULT_RPC_HEALTH_CHECK_SECS,
+    ):
+        """
+        Initialize endpoint pool.
+
+        Args:
+            urls: RPC URLs; the first one is the primary node
+            retry_secs: Seconds an unreachable endpoint is skipped
+            health_check_secs: Seconds between sync-state checks per endpoint
+        """
+        if not urls:
+            raise ValueError("At least one RPC URL is required")
+        self.endpoints = [NodeEndpoint(url) for url in urls]
+        self.retry_secs = retry_secs
+        self.health_check_secs = health_check_secs
+        self._tip = self.endpoints[0]
+
+    @property
+    def primary(self) -> NodeEndpoint:
+        """The first configured endpoint (wallet and node-specific calls)."""
+        return self.endpoints[0]
+
+    @property
+    def tip(self) -> NodeEndpoint:
+        """The endpoint currently answering tip calls."""
+        return self._tip
+
+    def candidates(self, kind: str) -> List[NodeEndpoint]:
+        """
+        Return endpoints to try, in order, for a call of the given kind.
+
+        Unavailable endpoints are kept at the end as a last resort so a call
+        is always attempted somewhere.
+
+        Args:
+            kind: Result of classify_methods()
+
+        Returns:
+            Ordered list of endpoints
+        """
+        if kind == "primary" or len(self.endpoints) == 1:
+            return [self.primary]
+
+        now = time.monotonic()
+        if kind == "tip":
+            ordered = [self._tip] + [ep for ep in self.endpoints if ep is not self._tip]
+        else:
+            # Unmeasured endpoints sort first so every node gets a latency sample
+            ordered = sorted(self.endpoints, key=lambda ep: ep.latency or 0.0)
+        available = [ep for ep in ordered if ep.is_available(now)]
+        return available + [ep for ep in ordered if not ep.is_available(now)]
+
+    def needs_check(self, endpoint: NodeEndpoint) -> bool:
+        """Return True if the endpoint's sync state should be refreshed."""
+        if len(self.endpoints) == 1:
+            return False
+        return endpoint.checked_at is None or time.monotonic() - endpoint.checked_at >= self.health_check_secs
+
+    def record_sync_state(self, endpoint: NodeEndpoint, syncing: bool) -> None:
+        """Store the result of a sync-state check."""
+        endpoint.checked_at = time.monotonic()
+        endpoint.syncing = syncing
+        if syncing and endpoint is self._tip:
+            self._move_tip()
+
+    def record_success(self, endpoint: NodeEndpoint, kind: str, elapsed: Optional[float]) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            endpoint: Endpoint that answered
+            kind: Routing kind of the call
+            elapsed: Request duration in seconds, or None if not representative
+        """
+        endpoint.down_until = 0.0
+        if elapsed is not None:
+            if endpoint.latency is None:
+                endpoint.latency = elapsed
+            else:
+                endpoint.latency = 0.8 * endpoint.latency + 0.2 * elapsed
+        if kind == "tip" and endpoint is not self._tip:
+            # Failover happened: stay on the new node for tip calls
+            self._tip = endpoint
+
+    def record_failure(self, endpoint: NodeEndpoint) -> None:
+        """Mark an endpoint unreachable for retry_secs."""
+        endpoint.down_until = time.monotonic() + self.retry_secs
+        endpoint.checked_at = None
+        if endpoint is self._tip:
+            self._move_tip()
+
+    def _move_tip(self) -> None:
+        """Switch tip calls to the first available endpoint, if any."""
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if endpoint.is_available(now):
+                self._tip = endpoint
+                return
@@ -0,0 +1,243 @@
+"""Timeouts, hedging delays and circuit breaking for RPC requests.
+
+``AdaptiveTimeouts`` keeps a window of recent latencies per kind of request
+and derives the read timeout from their tail (p99 times a multiplier,
+clamped), so a stalled node is given up on quickly for ``getblockcount`` but
+not for a large ``getblock``. Requests are told apart by method and verbosity
+argument (``getrawmempool false`` is timed apart from ``getrawmempool true``)
+and batches also by their size, so cheap calls never set the timeout of
+expensive ones. The p95 doubles as the delay after which an idempotent read
+is hedged to a second node.
+
+``CircuitBreaker`` stops sending to an endpoint after consecutive connection
+failures or timeouts and lets a single probe through once the cool-down has
+passed, so an unhealthy node fails fast instead of tying up a thread per
+call.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Sequence
+
+import requests
+
+from .constants import (
+    DEFAULT_RPC_BREAKER_FAILURES,
+    DEFAULT_RPC_BREAKER_RESET_SECS,
+    DEFAULT_RPC_TIMEOUT_MAX_SECS,
+    DEFAULT_RPC_TIMEOUT_MIN_SECS,
+    DEFAULT_RPC_TIMEOUT_MULTIPLIER,
+    DEFAULT_RPC_TIMEOUT_SECS,
+)
+from .rpc_pool import UNTIMED_METHODS
+
+# Latency samples kept per method, and needed before they are trusted
+_WINDOW = 200
+_MIN_SAMPLES = 20
+
+# Position of the argument that selects how much data a method returns
+_VERBOSITY_ARGS = {
+    "getblock": 1,
+    "getblockheader": 1,
+    "getrawtransaction": 1,
+    "getrawmempool": 0,
+    "getmempoolancestors": 1,
+    "getmempooldescendants": 1,
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without contacting a node when every endpoint's circuit is open."""
+
+
+def _percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+
+class AdaptiveTimeouts:
+    """Per-method request timeouts derived from observed latency."""
+
+    def __init__(
+        self,
+        default_secs: float = DEFAULT_RPC_TIMEOUT_SECS,
+        min_secs: float = DEFAULT_RPC_TIMEOUT_MIN_SECS,
+        max_secs: float = DEFAULT_RPC_TIMEOUT_MAX_SECS,
+        multiplier: float = DEFAULT_RPC_TIMEOUT_MULTIPLIER,
+    ):
+        """
+        Initialize adaptive timeouts.
+
+        Args:
+            default_secs: Timeout until a method has enough samples
+            min_secs: Lower bound of adaptive timeouts
+            max_secs: Upper bound; also the timeout of long-polls, so keep it
+                above event_watcher.longpoll.timeout_secs
+            multiplier: Factor applied to the observed p99 latency
+        """
+        self.min_secs = float(min_secs)
+        self.max_secs = max(self.min_secs, float(max_secs))
+        self.default_secs = min(max(float(default_secs), self.min_secs), self.max_secs)
+        self.multiplier = float(multiplier)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    @staticmethod
+    def _call_key(method: str, params: Sequence[Any]) -> str:
+        position = _VERBOSITY_ARGS.get(method)
+        if position is None or len(params) <= position:
+            return method
+        try:
+            return f"{method}:{int(params[position])}"
+        except (TypeError, ValueError):
+            return method
+
+    @classmethod
+    def _key(cls, methods: Sequence[str], params: Optional[Sequence[Sequence[Any]]] = None) -> str:
+        if params is None:
+            params = [()] * len(methods)
+        keys = sorted({cls._call_key(method, args) for method, args in zip(methods, params)})
+        if len(methods) == 1:
+            return keys[0]
+        # Batches take longer than any of their calls alone, and longer the
+        # more calls they carry: time them per content and power-of-two size
+        size = 1 << (len(methods) - 1).bit_length()
+        return f"batch:{'+'.join(keys)}:{size}"
+
+    def observe(
+        self, methods: Sequence[str], elapsed_secs: float, params: Optional[Sequence[Sequence[Any]]] = None
+    ) -> None:
+        """
+        Record the latency of a completed request.
+
+        Args:
+            methods: RPC methods carried by the request
+            elapsed_secs: Seconds until the node answered
+            params: Parameters of each call, aligned with ``methods``
+        """
+        if any(method in UNTIMED_METHODS for method in methods):
+            return
+        key = self._key(methods, params)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=_WINDOW)
+            samples.append(elapsed_secs)
+
+    def _tail(self, key: str, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < _MIN_SAMPLES:
+                return None
+            samples = list(samples)
+        return _percentile(samples, pct)
+
+    def timeout(self, methods: Sequence[str], params: Optional[Sequence[Sequence[Any]]] = None) -> float:
+        """
+        Return the read timeout for a request.
+
+        Args:
+            methods: RPC methods carried by the request
+            params: Parameters of each call, aligned with ``methods``
+
+        Returns:
+            Seconds to wait for the node's answer
+        """
+        if any(method in UNTIMED_METHODS for method in methods):
+            return self.max_secs
+        return self._timeout_for_key(self._key(methods, params))
+
+    def _timeout_for_key(self, key: str) -> float:
+        p99 = self._tail(key, 99)
+        if p99 is None:
+            return self.default_secs
+        return min(max(p99 * self.multiplier, self.min_secs), self.max_secs)
+
+    def hedge_delay(
+        self, methods: Sequence[str], params: Optional[Sequence[Sequence[Any]]] = None
+    ) -> Optional[float]:
+        """Return the p95 latency after which a read is hedged, or None if unknown."""
+        return self._tail(self._key(methods, params), 95)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the current timeout per observed kind of request."""
+        with self._lock:
+            keys = list(self._samples)
+        return {key: round(self._timeout_for_key(key), 3) for key in keys}
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one endpoint."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_RPC_BREAKER_FAILURES,
+        reset_secs: float = DEFAULT_RPC_BREAKER_RESET_SECS,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_secs: Seconds the circuit stays open before a probe
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_secs = float(reset_secs)
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Return True if ``allow`` would let a request through, without claiming the probe."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                return time.monotonic() - self._opened_at >= self.reset_secs
+            return not self._probing
+
+    def allow(self) -> bool:
+        """
+        Return True if a request may be sent (at most one probe when half-open).
+
+        A True answer in the half-open state claims the probe slot, so only
+        call this right before sending and always report the outcome with
+        ``record_success`` or ``record_failure``.
+        """
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_secs:
+                    return False
+                self.state = "half_open"
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def release(self) -> None:
+        """Give back a claimed half-open probe whose request was abandoned."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        """The endpoint answered: close the circuit."""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """The endpoint was unreachable or timed out."""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probing = False
@@ -8,13 +8,19 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict
 from .config import Config
 from .rpc import RPCClient
+from .async_rpc import AsyncRPCClient
+from .zmq_notifier import ZMQNotifier
 from .fees import current_fee_percentiles
-from .rolling import Rolling
+from .mempool_tracker import MempoolTracker
+from .projected_blocks import BlockProjector
+from .block_fees import ConfirmedFeeTracker
+from .poll_scheduler import PollScheduler
+from .rolling import RollingEngine, window_label
 from .alerts import AlertManager
 from .consolidation import ConsolidationManager
 from .logging import get_logger
-from .buckets import classify_fee_bucket, FEE_POLICIES, FeeBucket
-from .constants import DEFAULT_PSBT_COOLDOWN_SECS
+from .buckets import classify_fee_bucket, snapshot_fee, FEE_POLICIES, FeeBucket
+from .constants import DEFAULT_PSBT_COOLDOWN_SECS, FEE_METRICS
 from .structured_output import StructuredOutputWriter
 from . import policies
 
@@ -78,12 +84,21 @@ class FeeSentinelRunner:
         """
         self.config = config
         self._structured_writer = structured_writer
-        self.rpc_client = RPCClient(
-            config.rpc_url,
-            config.rpc_user,
-            config.rpc_password
+        self.rpc_client = RPCClient.from_config(config)
+        self.mempool_tracker = (
+            MempoolTracker(self.rpc_client, packages=config.package_feerates, streaming=config.mempool_streaming)
+            if config.mempool_tracker else None
         )
-        self.rolling = Rolling(config.rolling_window_mins)
+        self.block_projector = BlockProjector(config.projected_blocks) if config.projected_blocks else None
+        self.confirmed_fees = (
+            ConfirmedFeeTracker(self.rpc_client, config.confirmed_blocks) if config.confirmed_blocks else None
+        )
+        # Async client is only created for continuous runs (see run_continuous)
+        self.async_client = None
+        self.notifier: Optional[ZMQNotifier] = None
+        # One buffer for every window/metric pair; rolling_stats reports the main window of the fee metric
+        self.rolling = RollingEngine(config.rolling_windows_mins, config.rolling_metrics, config.rolling_ewma_mins)
+        self.rolling_window = window_label(config.rolling_window_mins)
         self.alert_manager = AlertManager(
             config.alert_webhook_url,
             config.alert_min_change_secs,
@@ -99,6 +114,63 @@ class FeeSentinelRunner:
                 config.consolidate_label
             )
     
+    def warm_start(self) -> int:
+        """
+        Reload the rolling windows from recent records in fee_snapshots.jsonl.
+
+        Called by run_continuous before the first poll. Only the tail
+        covering the longest window (or five half-lives of the slowest EWMA)
+        is read, scanning backwards from the end of the file.
+
+        Returns:
+            Number of snapshots loaded
+        """
+        lookback_mins = max(self.config.rolling_windows_mins + [5 * m for m in self.config.rolling_ewma_mins])
+        since = datetime.utcnow() - timedelta(minutes=lookback_mins)
+        loaded = 0
+        for record in self._structured_writer.recent_fee_snapshots(since):
+            try:
+                values = self._rolling_values(record["snapshot"])
+                ts = datetime.fromisoformat(record["timestamp"].rstrip("Z"))
+            except (KeyError, TypeError, ValueError):
+                # Written by an older version or with other metrics
+                continue
+            self.rolling.add(ts, values)
+            loaded += 1
+        if loaded:
+            logger.info(f"Warm-started rolling windows with {loaded} snapshots from the last {lookback_mins:g} min")
+        return loaded
+
+    def _rolling_values(self, snapshot: Dict) -> Dict[str, float]:
+        """Pick the rolling metrics out of a fee snapshot."""
+        return {
+            metric: snapshot_fee(snapshot, metric) if metric in FEE_METRICS else snapshot[metric]
+            for metric in self.rolling.metrics
+        }
+
+    def rpc_stats(self, reset: bool = False) -> Dict[str, Dict]:
+        """
+        Get per-method RPC call statistics.
+
+        Args:
+            reset: Clear the counters after reading
+
+        Returns:
+            Dictionary with an "rpc" section mapping a method name to its
+            counters (see CallStats.snapshot; includes asyncio calls), "cache",
+            "coalesce" and "limiter" with cumulative cache, single-flight and
+            rate limiter counters, and "resilience" with current timeouts and
+            circuit breaker states
+        """
+        cache = self.rpc_client.cache
+        return {
+            "rpc": self.rpc_client.stats.snapshot(reset),
+            "cache": cache.stats() if cache is not None else {},
+            "coalesce": self.rpc_client.flight.stats() if self.rpc_client.flight is not None else {},
+            "limiter": self.rpc_client.limiter.stats() if self.rpc_client.limiter is not None else {},
+            "resilience": self.rpc_client.resilience_stats(),
+        }
+
     def run_once(self, prepare_psbt: bool = False) -> Dict:
         """
         Run one monitoring iteration.
@@ -109,16 +181,35 @@ class FeeSentinelRunner:
         Returns:
             Dictionary with snapshot and optional PSBT result
         """
-        snapshot = current_fee_percentiles(self.rpc_client)
+        snapshot = current_fee_percentiles(
+            self.rpc_client,
+            self.async_client,
+            streaming=self.config.mempool_streaming,
+            tracker=self.mempool_tracker,
+            percentiles=self.config.fee_percentiles,
+            backend=self.config.fee_backend,
+            projector=self.block_projector,
+            packages=self.config.package_feerates,
+            histogram=self.config.fee_histogram,
+        )
+        if self.confirmed_fees is not None:
+            try:
+                with self.rpc_client.priority("fees"):
+                    snapshot["confirmed"] = self.confirmed_fees.update()
+            except Exception as e:
+                # The mempool snapshot stands on its own
+                logger.warning(f"Failed to update confirmed block fees: {e}")
         ts = datetime.utcnow()
+        fee_satvb = snapshot_fee(snapshot, self.config.fee_metric)
         
-        self.rolling.add(ts, snapshot["p50"])
-        stats = self.rolling.stats()
-        bucket = classify_fee_bucket(snapshot["p50"])
+        self.rolling.add(ts, self._rolling_values(snapshot))
+        stats = self.rolling.stats(self.rolling_window, self.config.fee_metric)
+        bucket = classify_fee_bucket(fee_satvb)
         
         result = {
             "snapshot": snapshot,
             "rolling_stats": stats,
+            "rolling": self.rolling.snapshot(),
             "bucket": {
                 "name": bucket.name,
                 "label": bucket.label,
@@ -146,7 +237,7 @@ class FeeSentinelRunner:
         cooldown_secs = get_psbt_cooldown_secs(self.config)
         if prepare_psbt and self.consolidation_manager and should_prepare_consolidation(bucket, cooldown_secs):
             # Choose a conservative fee: at least 1 sat/vB, capped within the bucket range
-            target_satvb = max(1, min(snapshot["p50"], bucket.max_satvb))
+            target_satvb = max(1, min(fee_satvb, bucket.max_satvb))
             try:
                 psbt_result = self.consolidation_manager.prepare_psbt(target_satvb)
                 result["psbt"] = psbt_result
@@ -175,24 +266,52 @@ class FeeSentinelRunner:
     def run_continuous(self, poll_secs: int, dry_run: bool, prepare_psbt: bool):
         """
         Run continuous monitoring loop.
+
+        Polls run on absolute deadlines; the interval shrinks towards
+        polling.poll_min_secs during volatility or after a block and grows
+        towards polling.poll_max_secs in a flat market (see PollScheduler).
         
         Args:
-            poll_secs: Seconds between polls
+            poll_secs: Seconds between polls in a normal market
             dry_run: If True, only log (no side effects beyond alerts)
             prepare_psbt: Whether to prepare PSBTs when conditions are met
         """
+        # Single-shot runs never read the rolling windows, so only the loop warm-starts them
+        if self.config.rolling_warm_start and self._structured_writer is not None:
+            self.warm_start()
+        if self.config.rpc_async_enabled and self.async_client is None:
+            self.async_client = AsyncRPCClient.from_config(self.config, self.rpc_client)
+        if self.notifier is None:
+            self.notifier = ZMQNotifier.from_config(self.config.zmq_config)
+        scheduler = PollScheduler(poll_secs, self.config.poll_min_secs, self.config.poll_max_secs)
+        new_block = False
+        tip_height = None
+        
         while True:
             try:
                 result = self.run_once(prepare_psbt)
                 snapshot = result["snapshot"]
                 stats = result["rolling_stats"]
-                bucket = classify_fee_bucket(snapshot["p50"])
+                fee_satvb = snapshot_fee(snapshot, self.config.fee_metric)
+
+                # Without ZMQ, a moved tip in the confirmed stats also means a new block
+                confirmed_tip = snapshot.get("confirmed", {}).get("tip_height")
+                if confirmed_tip is not None:
+                    new_block = new_block or (tip_height is not None and confirmed_tip != tip_height)
+                    tip_height = confirmed_tip
+                scheduler.update(fee_satvb, stats, new_block)
+                bucket = classify_fee_bucket(fee_satvb)
                 ts = datetime.utcnow()
                 
                 # Bucket classification + logging
+                next_block = (
+                    f"next_block_median={snapshot['next_block_median']} | "
+                    if "next_block_median" in snapshot else ""
+                )
                 line = (
                     f"[{ts.isoformat()}Z] "
                     f"p50={snapshot['p50']} sat/vB [{bucket.name}] | "
+                    f"{next_block}"
                     f"p25={snapshot['p25']} p75={snapshot['p75']} p90={snapshot['p90']} | "
                     f"tx={snapshot['tx_count']} | "
                     f"roll_avg={stats['avg']}({stats.get('n', 0)}pts)"
@@ -200,31 +319,44 @@ class FeeSentinelRunner:
                 logger.info(line)
                 
                 # Send alert if bucket changed
-                self.alert_manager.maybe_alert_bucket_change(
-                    bucket,
-                    {
-                        "p50": snapshot["p50"],
-                        "p75": snapshot["p75"],
-                        "p95": snapshot.get("p95", snapshot["p90"]),
-                        "rolling_avg": stats["avg"],
-                        "tx": snapshot["tx_count"],
-                        "bucket_note": FEE_POLICIES.get(bucket.name, {}).get("note", "")
+                bucket_payload = {
+                    "p50": snapshot["p50"],
+                    "p75": snapshot["p75"],
+                    "p95": snapshot.get("p95", snapshot["p90"]),
+                    "rolling_avg": stats["avg"],
+                    "tx": snapshot["tx_count"],
+                    "bucket_note": FEE_POLICIES.get(bucket.name, {}).get("note", "")
+                }
+                if "next_block_median" in snapshot:
+                    bucket_payload["next_block_median"] = snapshot["next_block_median"]
+                rolling_fields = self.config.alert_rolling_fields
+                if rolling_fields:
+                    bucket_payload["rolling"] = {
+                        key: policies.rolling_value(result["rolling"], key) for key in rolling_fields
                     }
-                )
+                self.alert_manager.maybe_alert_bucket_change(bucket, bucket_payload)
                 
                 # Check for fee spikes and policy adjustments
                 spike_config = self.config.spike_detection_config
-                current_satvb = snapshot["p50"]
-                trail_avg = stats["avg"]
+                baseline_metric = spike_config["baseline"].partition("/")[2]
+                current_satvb = (
+                    snapshot_fee(snapshot, baseline_metric) if baseline_metric in FEE_METRICS
+                    else snapshot[baseline_metric]
+                )
+                trail_avg = policies.trailing_baseline(result["rolling"], spike_config["baseline"])
+                confirmed_satvb = snapshot.get("confirmed", {}).get("p50")
 
-                if policies.should_alert_spike(current_satvb, trail_avg, spike_config):
+                if policies.should_alert_spike(current_satvb, trail_avg, spike_config, confirmed_satvb):
                     spike_payload = {
                         "type": "fee_spike",
                         "now_sat_vb": round(current_satvb, 2),
                         "trail_avg_sat_vb": round(trail_avg, 2),
+                        "baseline": spike_config["baseline"],
                         "spike_pct": round(100.0 * (current_satvb - trail_avg) / max(trail_avg, 1e-9), 2),
                         "at": ts.isoformat() + "Z"
                     }
+                    if confirmed_satvb is not None:
+                        spike_payload["confirmed_sat_vb"] = confirmed_satvb
                     
                     # Also include policy adjustment suggestion
                     proposal = policies.propose_adjustment(current_satvb, trail_avg, spike_config)
@@ -235,15 +367,37 @@ class FeeSentinelRunner:
                     
                     self.alert_manager.maybe_alert_spike(spike_payload, cooldown_secs)
                 
-                if dry_run:
-                    time.sleep(poll_secs)
-                    continue
-                
             except KeyboardInterrupt:
                 logger.info("Exiting.")
+                if self.notifier is not None:
+                    self.notifier.stop()
                 sys.exit(0)
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}", exc_info=True)
             
-            time.sleep(poll_secs)
+            new_block = self._wait_for_next_poll(scheduler.wait_secs())
+            if new_block:
+                scheduler.restart()
+
+    def _wait_for_next_poll(self, wait_secs: float) -> bool:
+        """
+        Sleep until the next poll, waking early when a new block is announced.
+
+        A block clears part of the mempool, so the fee snapshot is refreshed
+        right away instead of at the next regular poll.
+
+        Args:
+            wait_secs: Seconds until the next scheduled poll
+
+        Returns:
+            True if woken by a block announcement
+        """
+        if self.notifier is None or not self.notifier.is_healthy():
+            time.sleep(wait_secs)
+            return False
+        if self.notifier.wait_for_block(wait_secs) is not None:
+            logger.debug("New block announced; refreshing fee snapshot")
+            self.rpc_client.expire_tip()
+            return True
+        return False
 
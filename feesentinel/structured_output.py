@@ -5,7 +5,7 @@ later be ingested into relational or analytical databases.
 """
 
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional
 import json
 from datetime import datetime
 
@@ -18,16 +18,45 @@ DEFAULT_EVENTS_FILENAME = "events.jsonl"
 DEFAULT_BLOCKS_FILENAME = "blocks.jsonl"
 DEFAULT_FEE_ALERTS_FILENAME = "fee_alerts.jsonl"
 DEFAULT_FEE_SNAPSHOTS_FILENAME = "fee_snapshots.jsonl"
+DEFAULT_RPC_STATS_FILENAME = "rpc_stats.jsonl"
+
+# Bytes read per step when scanning a file backwards from its end
+_REVERSE_BLOCK_BYTES = 65536
+
+
+def read_lines_reversed(path: Path, block_bytes: int = _REVERSE_BLOCK_BYTES) -> Iterator[bytes]:
+    """Yield the lines of a file newest first, reading fixed-size blocks back from EOF.
+
+    Only the blocks the caller consumes are read, so taking the last few
+    lines of a multi-gigabyte file costs a handful of reads.
+    """
+    with path.open("rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_bytes, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + tail).split(b"\n")
+            # The first piece may continue in the previous block
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if tail:
+            yield tail
 
 
 class StructuredOutputWriter:
     """Write structured JSONL records for future database rollups.
 
-    This writer focuses on four high-level record types:
+    This writer focuses on five high-level record types:
     - events: blockchain events (treasury, ordinals, covenants, blocks, etc.)
     - blocks: per-block summaries and metrics
     - fee_alerts: fee bucket change and PSBT-related alerts
     - fee_snapshots: periodic fee snapshots with rolling statistics
+    - rpc_stats: periodic per-method RPC and webhook call statistics
     """
 
     def __init__(
@@ -37,6 +66,7 @@ class StructuredOutputWriter:
         blocks_filename: str = DEFAULT_BLOCKS_FILENAME,
         fee_alerts_filename: str = DEFAULT_FEE_ALERTS_FILENAME,
         fee_snapshots_filename: str = DEFAULT_FEE_SNAPSHOTS_FILENAME,
+        rpc_stats_filename: str = DEFAULT_RPC_STATS_FILENAME,
     ) -> None:
         self.base_path = Path(base_dir)
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -45,6 +75,7 @@ class StructuredOutputWriter:
         self.blocks_path = self.base_path / blocks_filename
         self.fee_alerts_path = self.base_path / fee_alerts_filename
         self.fee_snapshots_path = self.base_path / fee_snapshots_filename
+        self.rpc_stats_path = self.base_path / rpc_stats_filename
 
     def _append_line(self, path: Path, record: Dict) -> None:
         """Append a single JSON record to the given file as one line.
@@ -86,3 +117,30 @@ class StructuredOutputWriter:
     def record_fee_snapshot(self, payload: Dict) -> None:
         """Record a periodic fee snapshot with rolling statistics."""
         self._append_line(self.fee_snapshots_path, payload)
+
+    def recent_fee_snapshots(self, since: datetime) -> List[Dict]:
+        """Return fee snapshot records with a timestamp at or after ``since``, oldest first.
+
+        The file is scanned backwards from its end and the scan stops at the
+        first older record, so the cost follows the span asked for rather
+        than the file size. Unreadable lines (e.g. one cut short by a crash)
+        are skipped.
+        """
+        if not self.fee_snapshots_path.exists():
+            return []
+        records = []
+        for line in read_lines_reversed(self.fee_snapshots_path):
+            try:
+                record = json.loads(line)
+                ts = datetime.fromisoformat(record["timestamp"].rstrip("Z"))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            if ts < since:
+                break
+            records.append(record)
+        records.reverse()
+        return records
+
+    def record_rpc_stats(self, payload: Dict) -> None:
+        """Record per-method call statistics for one reporting interval."""
+        self._append_line(self.rpc_stats_path, payload)
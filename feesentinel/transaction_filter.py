@@ -3,12 +3,31 @@
 import re
 from typing import Dict, List, Set, Optional
 from .rpc import RPCClient
+from .async_rpc import AsyncRPCClient
 from .treasury_registry import TreasuryRegistry
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def script_addresses(script_pub_key: Dict) -> List[str]:
+    """
+    Get the addresses of a decoded scriptPubKey.
+
+    Bitcoin Core v22+ reports a single "address" field; older versions report
+    an "addresses" list.
+
+    Args:
+        script_pub_key: scriptPubKey dictionary from a decoded transaction
+
+    Returns:
+        List of addresses (empty for non-standard scripts)
+    """
+    if "address" in script_pub_key:
+        return [script_pub_key["address"]]
+    return script_pub_key.get("addresses", [])
+
+
 class TransactionFilter:
     """Filters transactions for treasury UTXOs, ordinals, and covenants."""
 
@@ -22,7 +41,8 @@ class TransactionFilter:
         detect_ordinals: bool = True,
         ordinal_hotspots: List[Dict] = None,
         detect_covenants: bool = False,
-        covenant_patterns: List[str] = None
+        covenant_patterns: List[str] = None,
+        async_client: Optional[AsyncRPCClient] = None
     ):
         """
         Initialize transaction filter.
@@ -37,8 +57,11 @@ class TransactionFilter:
             ordinal_hotspots: List of hotspot configs {id, label, addresses}
             detect_covenants: Enable covenant detection
             covenant_patterns: List of covenant patterns to detect
+            async_client: Optional async RPC client used to fetch parent
+                transactions concurrently instead of as one batch
         """
         self.rpc_client = rpc_client
+        self.async_client = async_client
         self.treasury_registry = treasury_registry
         
         # Build treasury_addresses set from registry or fallback to simple list
@@ -92,6 +115,76 @@ class TransactionFilter:
             logger.debug(f"Failed to get transaction {txid[:16]}...: {e}")
             return None
 
+    def get_transactions(self, txids: List[str]) -> Dict[str, Dict]:
+        """
+        Get several transactions in one batched (or concurrent) request.
+
+        Falls back to individual lookups if the node rejects the batch.
+
+        Args:
+            txids: Transaction IDs
+
+        Returns:
+            Dictionary mapping txid to transaction dictionary (missing txids omitted)
+        """
+        unique_txids = list(dict.fromkeys(txids))
+        if not unique_txids:
+            return {}
+
+        calls = [("getrawtransaction", [txid, True]) for txid in unique_txids]
+        try:
+            if self.async_client is not None:
+                replies = self.async_client.call_many(calls)
+            else:
+                replies = self.rpc_client.batch(calls)
+            transactions = {}
+            for txid, reply in zip(unique_txids, replies):
+                if isinstance(reply, Exception):
+                    logger.debug(f"Failed to get transaction {txid[:16]}...: {reply}")
+                    continue
+                transactions[txid] = reply
+            return transactions
+        except Exception as e:
+            logger.debug(f"Batched transaction lookup failed, falling back to single calls: {e}")
+
+        transactions = {}
+        for txid in unique_txids:
+            tx = self.get_transaction(txid)
+            if tx:
+                transactions[txid] = tx
+        return transactions
+
+    def get_prev_outputs(self, tx: Dict) -> Dict[tuple, Dict]:
+        """
+        Resolve the outputs spent by a transaction's inputs.
+
+        Prevouts embedded by getblock verbosity 3 are used directly; any
+        remaining parent transactions are fetched in one batched request.
+
+        Args:
+            tx: Transaction dictionary
+
+        Returns:
+            Dictionary mapping (txid, vout) to the spent output dictionary
+        """
+        prev_outputs = {}
+        outpoints = []
+        for vin in tx.get("vin", []):
+            if "txid" in vin and "vout" in vin:
+                if "prevout" in vin:
+                    prev_outputs[(vin["txid"], vin["vout"])] = vin["prevout"]
+                else:
+                    outpoints.append((vin["txid"], vin["vout"]))
+        if not outpoints:
+            return prev_outputs
+
+        parents = self.get_transactions([txid for txid, _ in outpoints])
+        for txid, vout in outpoints:
+            prev_tx = parents.get(txid)
+            if isinstance(prev_tx, dict) and "vout" in prev_tx:
+                prev_outputs[(txid, vout)] = prev_tx["vout"][vout]
+        return prev_outputs
+
     def get_txout(self, txid: str, vout: int) -> Optional[Dict]:
         """
         Get transaction output details.
@@ -149,13 +242,13 @@ class TransactionFilter:
         
         # Check inputs (spends)
         if self.watch_inputs and "vin" in tx:
+            prev_outputs = self.get_prev_outputs(tx)
             for vin in tx.get("vin", []):
                 if "txid" in vin and "vout" in vin:
-                    prev_tx = self.get_transaction(vin["txid"])
-                    if prev_tx and "vout" in prev_tx:
-                        prev_out = prev_tx["vout"][vin["vout"]]
-                        if "scriptPubKey" in prev_out and "addresses" in prev_out["scriptPubKey"]:
-                            addresses = prev_out["scriptPubKey"]["addresses"]
+                    prev_out = prev_outputs.get((vin["txid"], vin["vout"]))
+                    if prev_out:
+                        if "scriptPubKey" in prev_out:
+                            addresses = script_addresses(prev_out["scriptPubKey"])
                             value_sats = int(prev_out.get("value", 0) * 100_000_000)  # Convert BTC to sats
                             for addr in addresses:
                                 if addr in self.treasury_addresses:
@@ -197,8 +290,8 @@ class TransactionFilter:
         # Check outputs (receives)
         if self.watch_outputs and "vout" in tx:
             for vout_idx, vout in enumerate(tx.get("vout", [])):
-                if "scriptPubKey" in vout and "addresses" in vout["scriptPubKey"]:
-                    addresses = vout["scriptPubKey"]["addresses"]
+                if "scriptPubKey" in vout:
+                    addresses = script_addresses(vout["scriptPubKey"])
                     value_sats = int(vout.get("value", 0) * 100_000_000)  # Convert BTC to sats
                     for addr in addresses:
                         if addr in self.treasury_addresses:
@@ -346,13 +439,13 @@ class TransactionFilter:
         if self.hotspot_addresses and inscriptions:
             # Check inputs
             if "vin" in tx:
+                prev_outputs = self.get_prev_outputs(tx)
                 for vin in tx.get("vin", []):
                     if "txid" in vin and "vout" in vin:
-                        prev_tx = self.get_transaction(vin["txid"])
-                        if prev_tx and "vout" in prev_tx:
-                            prev_out = prev_tx["vout"][vin["vout"]]
-                            if "scriptPubKey" in prev_out and "addresses" in prev_out["scriptPubKey"]:
-                                addresses = prev_out["scriptPubKey"]["addresses"]
+                        prev_out = prev_outputs.get((vin["txid"], vin["vout"]))
+                        if prev_out:
+                            if "scriptPubKey" in prev_out:
+                                addresses = script_addresses(prev_out["scriptPubKey"])
                                 for addr in addresses:
                                     if addr in self.hotspot_addresses:
                                         # Find matching hotspot config
@@ -369,8 +462,8 @@ class TransactionFilter:
             # Check outputs
             if "vout" in tx:
                 for vout_idx, vout in enumerate(tx.get("vout", [])):
-                    if "scriptPubKey" in vout and "addresses" in vout["scriptPubKey"]:
-                        addresses = vout["scriptPubKey"]["addresses"]
+                    if "scriptPubKey" in vout:
+                        addresses = script_addresses(vout["scriptPubKey"])
                         for addr in addresses:
                             if addr in self.hotspot_addresses:
                                 # Find matching hotspot config
@@ -471,6 +564,23 @@ class TransactionFilter:
                 "matched": False
             }
         
+        return self.filter_decoded_transaction(tx, txid)
+
+    def filter_decoded_transaction(self, tx: Dict, txid: str = None) -> Dict:
+        """
+        Filter an already decoded transaction for all configured patterns.
+
+        Used with getblock verbosity 2/3 so block transactions need no
+        additional getrawtransaction calls.
+
+        Args:
+            tx: Transaction dictionary
+            txid: Transaction ID (defaults to tx["txid"])
+
+        Returns:
+            Dictionary with filter results (same shape as filter_transaction)
+        """
+        txid = txid or tx.get("txid")
         treasury_result = self.check_treasury_utxo(tx)
         ordinal_result = self.check_ordinal(tx)
         covenant_result = self.check_covenant(tx)
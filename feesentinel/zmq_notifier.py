@@ -0,0 +1,195 @@
+"""Push-driven block and mempool notifications from bitcoind's ZMQ interface.
+
+Requires the optional ``pyzmq`` package and bitcoind started with e.g.
+``-zmqpubhashblock=tcp://127.0.0.1:28332``. When pyzmq is missing or the
+socket goes quiet, the runners keep polling as before.
+"""
+
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+from .block_parser import sha256d
+from .constants import DEFAULT_ZMQ_QUIET_SECS
+from .logging import get_logger
+
+try:
+    import zmq
+except ImportError:  # pragma: no cover - exercised only without pyzmq
+    zmq = None
+
+logger = get_logger(__name__)
+
+ZMQ_TOPICS = ("hashblock", "rawblock", "rawtx", "sequence")
+
+# Poll timeout for the receiver thread so stop() is honoured promptly
+_RECV_POLL_MS = 250
+
+
+class ZMQNotifier:
+    """Subscribes to bitcoind ZMQ topics on a background thread."""
+
+    def __init__(self, endpoints: Dict[str, str], quiet_secs: float = DEFAULT_ZMQ_QUIET_SECS):
+        """
+        Initialize ZMQ notifier.
+
+        Args:
+            endpoints: Mapping of topic (hashblock, rawblock, rawtx, sequence)
+                to the endpoint bitcoind publishes it on
+            quiet_secs: Seconds without any message after which the socket is
+                considered quiet and callers should fall back to polling
+        """
+        unknown = set(endpoints) - set(ZMQ_TOPICS)
+        if unknown:
+            raise ValueError(f"Unknown ZMQ topics: {sorted(unknown)}")
+        self.endpoints = dict(endpoints)
+        self.quiet_secs = quiet_secs
+
+        self._block_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_seq: Dict[str, int] = {}
+        self._last_message_ts = 0.0
+
+        self.last_block_hash: Optional[str] = None
+        self.mempool_sequence: Optional[int] = None
+        self.stats = {
+            "blocks": 0,
+            "transactions": 0,
+            "mempool_events": 0,
+            "sequence_gaps": 0,
+        }
+
+    @classmethod
+    def from_config(cls, zmq_config: Dict) -> Optional["ZMQNotifier"]:
+        """
+        Build and start a notifier from the zmq config section.
+
+        Args:
+            zmq_config: Dictionary from Config.zmq_config
+
+        Returns:
+            Running ZMQNotifier, or None if disabled or pyzmq is unavailable
+        """
+        if not zmq_config.get("enabled") or not zmq_config.get("endpoints"):
+            return None
+        notifier = cls(zmq_config["endpoints"], zmq_config.get("quiet_secs", DEFAULT_ZMQ_QUIET_SECS))
+        return notifier if notifier.start() else None
+
+    def start(self) -> bool:
+        """
+        Start the receiver thread.
+
+        Returns:
+            True if started, False if pyzmq is not installed
+        """
+        if zmq is None:
+            logger.warning("ZMQ notifications enabled but pyzmq is not installed; using polling")
+            return False
+        if self._thread is None:
+            self._last_message_ts = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="zmq-notifier", daemon=True)
+            self._thread.start()
+            logger.info(f"Subscribed to ZMQ topics: {', '.join(sorted(self.endpoints))}")
+        return True
+
+    def stop(self) -> None:
+        """Stop the receiver thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def is_healthy(self) -> bool:
+        """Return True if the receiver is running and not quiet for longer than quiet_secs."""
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        return time.monotonic() - self._last_message_ts < self.quiet_secs
+
+    def wait_for_block(self, timeout: float) -> Optional[str]:
+        """
+        Wait for a block notification.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Hash of the newest announced block (empty string if the topic does
+            not carry one), or None on timeout
+        """
+        if not self._block_event.wait(timeout):
+            return None
+        with self._lock:
+            self._block_event.clear()
+            return self.last_block_hash or ""
+
+    def _run(self) -> None:
+        """Receiver loop."""
+        context = zmq.Context.instance()
+        socket = context.socket(zmq.SUB)
+        socket.setsockopt(zmq.RCVHWM, 0)
+        for endpoint in sorted(set(self.endpoints.values())):
+            socket.connect(endpoint)
+        for topic in self.endpoints:
+            socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        try:
+            while not self._stop.is_set():
+                if not poller.poll(_RECV_POLL_MS):
+                    continue
+                frames = socket.recv_multipart()
+                if len(frames) < 2:
+                    continue
+                self._handle(frames[0].decode(errors="replace"), frames[1], frames[2] if len(frames) > 2 else None)
+        except Exception as e:
+            logger.error(f"ZMQ receiver stopped: {e}", exc_info=True)
+        finally:
+            socket.close(linger=0)
+
+    def _handle(self, topic: str, body: bytes, seq_frame: Optional[bytes]) -> None:
+        """Process one notification."""
+        self._last_message_ts = time.monotonic()
+        if seq_frame is not None and len(seq_frame) == 4:
+            self._check_sequence(topic, struct.unpack("<I", seq_frame)[0])
+
+        if topic == "hashblock":
+            self._block_arrived(body.hex())
+        elif topic == "rawblock":
+            self._block_arrived(sha256d(body[:80])[::-1].hex())
+        elif topic == "rawtx":
+            self.stats["transactions"] += 1
+        elif topic == "sequence" and len(body) >= 33:
+            label = chr(body[32])
+            if label in ("C", "D"):
+                # Block connected or disconnected (reorg): either way re-check the tip
+                self._block_arrived(body[:32].hex())
+            elif label in ("A", "R") and len(body) >= 41:
+                self._check_mempool_sequence(struct.unpack("<Q", body[33:41])[0])
+
+    def _block_arrived(self, block_hash: str) -> None:
+        with self._lock:
+            self.last_block_hash = block_hash
+            self.stats["blocks"] += 1
+            self._block_event.set()
+
+    def _check_sequence(self, topic: str, seq: int) -> None:
+        """Detect dropped messages using bitcoind's per-topic message counter."""
+        last = self._last_seq.get(topic)
+        if last is not None and seq != (last + 1) & 0xFFFFFFFF:
+            self.stats["sequence_gaps"] += 1
+            logger.warning(f"ZMQ {topic} sequence gap: {last} -> {seq}")
+            # A missed block notification must not delay processing
+            if topic in ("hashblock", "rawblock", "sequence"):
+                self._block_event.set()
+        self._last_seq[topic] = seq
+
+    def _check_mempool_sequence(self, mempool_sequence: int) -> None:
+        """Track the node's mempool sequence number from sequence A/R events."""
+        self.stats["mempool_events"] += 1
+        if self.mempool_sequence is not None and mempool_sequence != self.mempool_sequence + 1:
+            self.stats["sequence_gaps"] += 1
+        self.mempool_sequence = mempool_sequence
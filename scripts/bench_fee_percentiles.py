@@ -0,0 +1,63 @@
+"""Benchmark fee percentile backends: pure Python sort vs numpy partition.
+
+Builds synthetic fee/size columns (like the streaming scanner produces) for
+50k, 300k and 1M transactions and times ``fee_percentiles`` with each
+backend. Only the percentile computation is measured.
+
+Usage:
+    python scripts/bench_fee_percentiles.py [entries ...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feesentinel.constants import DEFAULT_FEE_PERCENTILES  # noqa: E402
+from feesentinel.fees import fee_percentiles, np  # noqa: E402
+from feesentinel.mempool_stream import MempoolFeeArrays  # noqa: E402
+
+REPEATS = 5
+
+
+def build_mempool(entries: int) -> MempoolFeeArrays:
+    """Synthetic mempool with a long low-fee tail, like a congested one."""
+    rng = random.Random(42)
+    mempool = MempoolFeeArrays()
+    for _ in range(entries):
+        vsize = rng.randint(110, 2000)
+        mempool.append(int(vsize * rng.lognormvariate(2.5, 1.0)), vsize)
+    return mempool
+
+
+def best_time(func) -> float:
+    """Best wall time of REPEATS runs."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50_000, 300_000, 1_000_000]
+    backends = ["python"] + (["numpy"] if np is not None else [])
+    if np is None:
+        print("numpy is not installed; timing the python backend only")
+    for entries in sizes:
+        mempool = build_mempool(entries)
+        results = {}
+        line = f"{entries:>9} txs"
+        for backend in backends:
+            results[backend] = fee_percentiles(mempool, DEFAULT_FEE_PERCENTILES, backend)
+            elapsed = best_time(lambda: fee_percentiles(mempool, DEFAULT_FEE_PERCENTILES, backend))
+            line += f"  {backend} {elapsed * 1000:8.1f} ms"
+        assert len({tuple(values) for values in results.values()}) == 1, results
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark memory held by mempool representations.
+
+Builds a synthetic verbose getrawmempool reply (default 300k entries) and
+reports, via tracemalloc, the memory retained by each representation once
+built:
+
+- decoded: the ``json.loads`` dict of dicts
+- dict mirror: txid -> (fee, vsize) tuples, the tracker's former layout
+- snapshot: MempoolSnapshot (typed columns, packed txids, index)
+- arrays: MempoolFeeArrays (fee and size columns only)
+
+Usage:
+    python scripts/bench_mempool_memory.py [entries]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_mempool_parse import build_reply  # noqa: E402
+from feesentinel.mempool_stream import parse_mempool_stream  # noqa: E402
+from feesentinel.mempool_tracker import entry_fee_vsize  # noqa: E402
+
+CHUNK_SIZE = 65536
+
+
+def retained(label: str, build) -> None:
+    """Print the memory still allocated after ``build()`` returns its result."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {len(result):>8} txs  retained {current / 1e6:8.1f} MB  peak {peak / 1e6:8.1f} MB")
+    del result
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    body = build_reply(entries)
+
+    def chunks():
+        return (body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+
+    print(f"{entries} entries, reply {len(body) / 1e6:.1f} MB")
+
+    retained("decoded", lambda: json.loads(body)["result"])
+    retained("dict mirror", lambda: {
+        txid: entry_fee_vsize(entry) for txid, entry in json.loads(body)["result"].items()
+    })
+    retained("snapshot", lambda: parse_mempool_stream(chunks(), keep_txids=True))
+    retained("arrays", lambda: parse_mempool_stream(chunks()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark verbose getrawmempool decoding: full json vs streaming scan.
+
+Builds a synthetic reply shaped like bitcoind's (default 300k entries) and
+reports wall time and tracemalloc peak for each path (measured in separate
+runs, since tracing slows allocation-heavy code down). The reply bytes are
+built before measuring, so only decoding is counted.
+
+Usage:
+    python scripts/bench_mempool_parse.py [entries]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feesentinel.fees import _dict_fee_arrays  # noqa: E402
+from feesentinel.mempool_stream import parse_mempool_stream  # noqa: E402
+
+CHUNK_SIZE = 65536
+
+
+def build_reply(entries: int) -> bytes:
+    """Serialize a synthetic verbose getrawmempool reply."""
+    rng = random.Random(42)
+    parts = []
+    for i in range(entries):
+        vsize = rng.randint(110, 2000)
+        base = round(vsize * rng.uniform(1, 200) / 1e8, 8)
+        entry = {
+            "vsize": vsize,
+            "weight": vsize * 4 - rng.randint(0, 3),
+            "time": 1700000000 + i,
+            "height": 820000,
+            "descendantcount": 1,
+            "descendantsize": vsize,
+            "ancestorcount": 1,
+            "ancestorsize": vsize,
+            "wtxid": f"{rng.getrandbits(256):064x}",
+            "fees": {"base": base, "modified": base, "ancestor": base, "descendant": base},
+            "depends": [],
+            "spentby": [],
+            "bip125-replaceable": False,
+            "unbroadcast": False,
+        }
+        parts.append(f'"{rng.getrandbits(256):064x}":' + json.dumps(entry, separators=(",", ":")))
+    return ('{"result":{' + ",".join(parts) + '},"error":null,"id":"fs"}').encode()
+
+
+def measure(label: str, func):
+    """Run ``func`` twice: once for wall time, once under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {count:>8} txs  {elapsed:7.2f}s  peak {peak / 1_048_576:8.1f} MiB")
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    body = build_reply(entries)
+    print(f"reply: {entries} entries, {len(body) / 1_048_576:.1f} MiB")
+
+    def full_json():
+        return len(list(_dict_fee_arrays(json.loads(body)["result"]).feerates()))
+
+    def streaming():
+        chunks = (body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+        return len(list(parse_mempool_stream(chunks).feerates()))
+
+    measure("json", full_json)
+    measure("streaming", streaming)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark Rolling window updates against the former full-rescan version.
+
+Feeds N points (default 100k) spaced ``step`` seconds apart into a window
+that holds all of them (multi-hour window, poll every few seconds), calling
+``stats()`` after every ``add`` like the runner does.
+
+Usage:
+    python scripts/bench_rolling.py [points] [step_secs]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feesentinel.rolling import Rolling  # noqa: E402
+
+
+class RescanRolling:
+    """The former implementation: rebuild the list on add, rescan on stats."""
+
+    def __init__(self, minutes: int):
+        self.minutes = minutes
+        self.points = []
+
+    def add(self, ts, p50):
+        self.points.append((ts, p50))
+        cutoff = ts - timedelta(minutes=self.minutes)
+        self.points = [(t, v) for (t, v) in self.points if t >= cutoff]
+
+    def stats(self):
+        vals = [v for _, v in self.points]
+        if not vals:
+            return {"avg": 0, "min": 0, "max": 0, "n": 0}
+        return {"avg": int(round(sum(vals) / len(vals))), "min": min(vals), "max": max(vals), "n": len(vals)}
+
+
+def run(cls, points: int, step_secs: int, window_mins: int):
+    rolling = cls(window_mins)
+    start = datetime(2024, 1, 1)
+    began = time.perf_counter()
+    for i in range(points):
+        rolling.add(start + timedelta(seconds=i * step_secs), (i * 7919) % 500 + 1)
+        stats = rolling.stats()
+    return time.perf_counter() - began, stats
+
+
+def main() -> None:
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    step_secs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    window_mins = points * step_secs // 60 + 1
+    print(f"{points} points every {step_secs}s, {window_mins} min window")
+    elapsed, stats = run(Rolling, points, step_secs, window_mins)
+    print(f"deque   {elapsed * 1000:10.1f} ms  {elapsed / points * 1e6:8.2f} us/point  {stats}")
+    # The rescan version is quadratic; time a tenth of the points and say so
+    sample = max(1, points // 10)
+    elapsed, stats = run(RescanRolling, sample, step_secs, window_mins)
+    print(f"rescan  {elapsed * 1000:10.1f} ms  {elapsed / sample * 1e6:8.2f} us/point  ({sample} points only)")
+
+
+if __name__ == "__main__":
+    main()
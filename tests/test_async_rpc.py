@@ -0,0 +1,173 @@
+"""Tests for the asyncio RPC client against a local HTTP stand-in."""
+
+import asyncio
+import json
+from unittest.mock import Mock
+import pytest
+import requests
+from feesentinel.async_rpc import AsyncRPCClient
+from feesentinel.rpc import PrunedBlockError, RPCClient
+from feesentinel.rpc_cache import ResponseCache
+from feesentinel.rpc_resilience import CircuitOpenError
+
+
+class FakeNode:
+    """Minimal keep-alive JSON-RPC server used in place of bitcoind."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                request = json.loads(await reader.readexactly(length))
+
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(self.delay)
+                self.in_flight -= 1
+
+                body = json.dumps(self.reply(request)).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+    @staticmethod
+    def reply(request):
+        method = request["method"]
+        if method == "getblock":
+            return {"id": request["id"], "result": None,
+                    "error": {"code": -1, "message": "Block not available (pruned data)"}}
+        if method == "fail":
+            return {"id": request["id"], "result": None,
+                    "error": {"code": -32601, "message": "Method not found"}}
+        return {"id": request["id"], "result": [method] + request["params"], "error": None}
+
+
+async def run_with_node(node, scenario):
+    """Start the fake node and run ``scenario(client)`` against it."""
+    server = await asyncio.start_server(node.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    client = AsyncRPCClient(f"http://127.0.0.1:{port}", "user", "pass", max_in_flight=3)
+    try:
+        return await scenario(client)
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+
+def test_call_reuses_keep_alive_connection():
+    """Test that sequential calls share one pooled connection."""
+    node = FakeNode()
+
+    async def scenario(client):
+        first = await client.call("getblockcount")
+        second = await client.call("getblockhash", 5)
+        return first, second
+
+    first, second = asyncio.run(run_with_node(node, scenario))
+
+    assert first == ["getblockcount"]
+    assert second == ["getblockhash", 5]
+    assert node.connections == 1
+
+
+def test_gather_bounds_in_flight_requests():
+    """Test that concurrent calls never exceed max_in_flight."""
+    node = FakeNode(delay=0.02)
+
+    async def scenario(client):
+        return await client.gather([("getblockhash", [h]) for h in range(10)])
+
+    results = asyncio.run(run_with_node(node, scenario))
+
+    assert results == [["getblockhash", h] for h in range(10)]
+    assert node.max_in_flight == 3
+
+
+def test_errors_use_shared_mapping():
+    """Test that RPC errors map to PrunedBlockError/RuntimeError like RPCClient."""
+    node = FakeNode()
+
+    async def scenario(client):
+        return await client.gather([("getblock", ["abc", 1]), ("fail", []), ("ok", [])])
+
+    pruned, failed, ok = asyncio.run(run_with_node(node, scenario))
+
+    assert isinstance(pruned, PrunedBlockError)
+    assert pruned.block_hash == "abc"
+    assert isinstance(failed, RuntimeError)
+    assert ok == ["ok"]
+
+
+def test_call_timeout():
+    """Test that slow calls raise a requests Timeout."""
+    node = FakeNode(delay=0.5)
+
+    async def scenario(client):
+        await client.call("getblockcount", timeout=0.05)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        asyncio.run(run_with_node(node, scenario))
+
+
+def test_call_many_shares_sync_cache():
+    """Test that call_many answers cached calls locally and caches new immutable results."""
+    rpc_client = RPCClient("http://127.0.0.1:1", "user", "pass", cache=ResponseCache())
+    rpc_client.cache.put("getblock", ["aa" * 32, 1], {"height": 1})
+    client = AsyncRPCClient("http://127.0.0.1:1", "user", "pass", rpc_client=rpc_client)
+    sent = []
+
+    async def gather(calls):
+        sent.extend(calls)
+        return [{"height": 2} for _ in calls]
+
+    client.gather = gather
+    calls = [("getblock", ["aa" * 32, 1]), ("getblock", ["bb" * 32, 1])]
+    assert client.call_many(calls) == [{"height": 1}, {"height": 2}]
+    assert sent == [("getblock", ["bb" * 32, 1])]
+    assert rpc_client.cache.get("getblock", ["bb" * 32, 1]) == {"height": 2}
+
+
+def test_call_many_uses_sync_failover_with_several_nodes():
+    """Test that call_many goes through RPCClient.batch when several nodes are configured."""
+    rpc_client = RPCClient(["http://a:8332", "http://b:8332"], "user", "pass")
+    rpc_client.batch = Mock(return_value=["hash"])
+    client = AsyncRPCClient("http://a:8332", "user", "pass", rpc_client=rpc_client)
+    assert client.call_many([("getblockhash", [1])]) == ["hash"]
+    rpc_client.batch.assert_called_once_with([("getblockhash", [1])])
+
+
+def test_call_honours_shared_circuit_breaker():
+    """Test that unreachable-node failures open the shared breaker and later calls fail fast."""
+    rpc_client = RPCClient("http://127.0.0.1:1", "user", "pass", breaker_failures=1)
+    client = AsyncRPCClient("http://127.0.0.1:1", "user", "pass", rpc_client=rpc_client)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        asyncio.run(client.call("getblockcount"))
+    assert rpc_client.breakers["http://127.0.0.1:1"].state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.call("getblockcount"))
+    # Async calls are counted in the synchronous client's stats
+    assert rpc_client.stats.snapshot()["getblockcount"]["errors"] == 2
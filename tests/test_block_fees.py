@@ -0,0 +1,59 @@
+"""Tests for confirmed block fee statistics."""
+
+from unittest.mock import Mock
+from feesentinel.block_fees import ConfirmedFeeTracker
+from feesentinel.rpc import RPCClient
+
+
+class FakeChain:
+    """Chain of blocks answering the tracker's calls."""
+
+    def __init__(self, tip):
+        self.hashes = {height: f"h{height}" for height in range(tip + 1)}
+        self.stats_calls = []
+
+    def call(self, method, *params):
+        if method == "getblockcount":
+            return max(self.hashes)
+        if method == "getbestblockhash":
+            return self.hashes[max(self.hashes)]
+        raise AssertionError(f"unexpected call {method}")
+
+    def batch(self, calls):
+        replies = []
+        for method, params in calls:
+            if method == "getblockhash":
+                replies.append(self.hashes[params[0]])
+            else:
+                self.stats_calls.append(params[0])
+                rate = int(params[0][1:])
+                replies.append({"feerate_percentiles": [rate, rate, rate, rate, rate], "total_weight": 4_000_000})
+        return replies
+
+    def client(self):
+        rpc_client = Mock(spec=RPCClient)
+        rpc_client.call.side_effect = self.call
+        rpc_client.batch.side_effect = self.batch
+        return rpc_client
+
+
+def test_fetches_only_new_blocks():
+    """Test that stats are cached per hash and refetched only for new or reorged blocks."""
+    chain = FakeChain(tip=10)
+    tracker = ConfirmedFeeTracker(chain.client(), blocks=3)
+
+    assert tracker.update() == {"tip_height": 10, "blocks": 3, "p10": 9.0, "p25": 9.0,
+                                "p50": 9.0, "p75": 9.0, "p90": 9.0, "fullness": 1.0}
+    assert chain.stats_calls == ["h8", "h9", "h10"]
+
+    tracker.update()
+    assert len(chain.stats_calls) == 3
+
+    chain.hashes[11] = "h11"
+    assert tracker.update()["p50"] == 10.0
+    assert chain.stats_calls[3:] == ["h11"]
+
+    # Same-height reorg replaces the tip
+    chain.hashes[11] = "h20"
+    assert tracker.update()["p50"] == 13.0
+    assert chain.stats_calls[4:] == ["h20"]
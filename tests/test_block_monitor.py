@@ -0,0 +1,169 @@
+"""Tests for block monitoring and decoded block ingestion."""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock
+import pytest
+import requests
+from feesentinel.block_monitor import BlockMonitor
+from feesentinel.rpc import RPCClient
+
+
+def make_monitor(call, block_ingestion="verbose"):
+    """Create a block monitor backed by a mock RPC client and state manager."""
+    rpc_client = Mock(spec=RPCClient)
+    rpc_client.call.side_effect = call
+    state_manager = Mock()
+    monitor = BlockMonitor(rpc_client, state_manager, block_ingestion=block_ingestion)
+    return monitor, rpc_client
+
+
+def test_process_block_fetches_decoded_block():
+    """Test that verbose ingestion fetches the block once with verbosity 3."""
+    decoded = {"hash": "abc", "tx": [{"txid": "t1", "vin": [], "vout": []}]}
+    monitor, rpc_client = make_monitor(lambda method, *params: decoded)
+
+    block_info = monitor.process_block(100, "abc")
+
+    assert block_info["tx"][0]["txid"] == "t1"
+    rpc_client.call.assert_called_once_with("getblock", "abc", 3)
+    monitor.state_manager.mark_block_processed.assert_called_once_with(100, "abc")
+
+
+def test_process_block_falls_back_for_old_nodes():
+    """Test fallback to verbosity 1 when the node rejects numeric verbosity."""
+    def call(method, *params):
+        if params[1] == 3:
+            raise RuntimeError({"code": -1, "message": "JSON value is not a boolean as expected"})
+        return {"hash": "abc", "tx": ["t1", "t2"]}
+
+    monitor, rpc_client = make_monitor(call)
+
+    block_info = monitor.process_block(100, "abc")
+
+    assert block_info["tx"] == ["t1", "t2"]
+    assert monitor.block_ingestion == "txids"
+
+    # Later blocks go straight to verbosity 1
+    rpc_client.call.reset_mock()
+    monitor.process_block(101, "def")
+    rpc_client.call.assert_called_once_with("getblock", "def", 1)
+
+
+def test_transient_error_keeps_decoded_ingestion():
+    """Test that a node error unrelated to verbosity is raised without downgrading ingestion."""
+    def call(method, *params):
+        raise RuntimeError({"code": -28, "message": "Loading block index..."})
+
+    monitor, _ = make_monitor(call)
+
+    with pytest.raises(RuntimeError):
+        monitor.process_block(100, "abc")
+    assert monitor.block_ingestion == "verbose"
+    monitor.state_manager.mark_block_processed.assert_not_called()
+
+
+def test_process_block_parses_rest_block():
+    """Test REST ingestion parses the binary block locally."""
+    raw = bytes.fromhex((Path(__file__).parent / "fixtures" / "genesis_block.hex").read_text().strip())
+    monitor, rpc_client = make_monitor(lambda method, *params: {"chain": "main"}, block_ingestion="rest")
+    rpc_client.get_rest_block.return_value = raw
+
+    block_info = monitor.process_block(0, "000000000019d6689c085ae165831e934ff763ae46a2a6c172b3f1b60a8ce26f")
+
+    assert block_info["tx"][0]["txid"] == "4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b"
+    rpc_client.call.assert_called_once_with("getblockchaininfo")
+
+
+def test_rest_unavailable_falls_back_to_verbose():
+    """Test that a REST failure switches to decoded getblock."""
+    decoded = {"hash": "abc", "tx": [{"txid": "t1", "vin": [], "vout": []}]}
+    monitor, rpc_client = make_monitor(
+        lambda method, *params: {"chain": "main"} if method == "getblockchaininfo" else decoded,
+        block_ingestion="rest",
+    )
+    rpc_client.get_rest_block.side_effect = requests.exceptions.HTTPError("403 Forbidden")
+
+    block_info = monitor.process_block(100, "abc")
+
+    assert block_info is decoded
+    assert monitor.block_ingestion == "verbose"
+
+
+def test_wait_for_new_block_uses_waitforblockheight():
+    """Test that long-polling waits for the block after the last processed one."""
+    monitor, rpc_client = make_monitor(lambda method, *params: {"hash": "h", "height": 101})
+    monitor.state_manager.get_last_height.return_value = 100
+
+    assert monitor.wait_for_new_block(5) is True
+    rpc_client.call.assert_called_once_with("waitforblockheight", 101, 5000)
+
+
+def test_wait_for_new_block_timeout_and_fallback():
+    """Test timeout, connection failure and unsupported-node behaviour."""
+    replies = [
+        {"hash": "h", "height": 100},
+        requests.exceptions.ConnectionError("reset"),
+        RuntimeError({"code": -28, "message": "Loading block index..."}),
+        RuntimeError({"code": -32601, "message": "Method not found"}),
+    ]
+
+    def call(method, *params):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monitor, _ = make_monitor(call)
+    monitor.longpoll = True
+    monitor.state_manager.get_last_height.return_value = 100
+
+    assert monitor.wait_for_new_block(1) is False
+    assert monitor.wait_for_new_block(1) is None
+    assert monitor.longpoll is True
+    assert monitor.wait_for_new_block(1) is None  # transient node error: retried next time
+    assert monitor.longpoll is True
+    assert monitor.wait_for_new_block(1) is None
+    assert monitor.longpoll is False
+
+
+def make_http_client(status, body):
+    """Create a real RPC client whose node answers every call with ``status`` and ``body``."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode()
+    response.url = "http://test:8332"
+    rpc_client = RPCClient("http://test:8332", "user", "pass")
+    rpc_client.session.post = Mock(return_value=response)
+    return rpc_client
+
+
+def test_decoded_block_falls_back_on_http_500_error():
+    """Test that an HTTP 500 reply carrying a -8 error disables decoded ingestion."""
+    rpc_client = make_http_client(500, {
+        "result": None, "error": {"code": -8, "message": "Invalid verbosity"}, "id": "fs"
+    })
+    monitor = BlockMonitor(rpc_client, Mock(), block_ingestion="verbose")
+
+    assert monitor.get_decoded_block("ab" * 32) is None
+    assert monitor.block_ingestion == "txids"
+
+
+def test_longpoll_disabled_by_unknown_method_reply():
+    """Test that an HTTP 404 method-not-found reply turns long-poll off after one request."""
+    rpc_client = make_http_client(404, {
+        "result": None, "error": {"code": -32601, "message": "Method not found"}, "id": "fs"
+    })
+    state_manager = Mock()
+    state_manager.get_last_height.return_value = 100
+    monitor = BlockMonitor(rpc_client, state_manager, longpoll=True)
+
+    assert monitor.wait_for_new_block(1) is None
+    assert monitor.longpoll is False
+    assert rpc_client.session.post.call_count == 1
+
+    # A proxy's bare 404 without a JSON-RPC body is treated the same way
+    monitor.longpoll = True
+    rpc_client.session.post.return_value._content = b"Not Found"
+    assert monitor.wait_for_new_block(1) is None
+    assert monitor.longpoll is False
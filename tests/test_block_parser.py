@@ -0,0 +1,115 @@
+"""Tests for the raw block/transaction deserializer against captured fixtures."""
+
+from pathlib import Path
+from unittest.mock import Mock
+import pytest
+from feesentinel.block_parser import (
+    BlockParseError,
+    parse_block,
+    script_to_address,
+    sha256d,
+)
+from feesentinel.transaction_filter import TransactionFilter
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name):
+    """Load a hex-encoded raw block fixture."""
+    return bytes.fromhex((FIXTURES / name).read_text().strip())
+
+
+def merkle_root(txids):
+    """Compute a block merkle root (display byte order) from txids."""
+    layer = [bytes.fromhex(txid)[::-1] for txid in txids]
+    while len(layer) > 1:
+        if len(layer) % 2:
+            layer.append(layer[-1])
+        layer = [sha256d(layer[i] + layer[i + 1]) for i in range(0, len(layer), 2)]
+    return layer[0][::-1].hex()
+
+
+def test_parse_genesis_block():
+    """Test parsing the mainnet genesis block."""
+    block = parse_block(load_fixture("genesis_block.hex"))
+
+    assert block["hash"] == "000000000019d6689c085ae165831e934ff763ae46a2a6c172b3f1b60a8ce26f"
+    assert block["time"] == 1231006505
+    assert len(block["tx"]) == 1
+
+    coinbase = block["tx"][0]
+    assert coinbase["txid"] == "4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b"
+    assert "coinbase" in coinbase["vin"][0]
+    assert "txid" not in coinbase["vin"][0]
+    assert coinbase["vout"][0]["value"] == 50.0
+    # P2PK output has no address
+    assert "address" not in coinbase["vout"][0]["scriptPubKey"]
+
+
+def test_parse_segwit_block():
+    """Test txids, witness stacks and addresses in a segwit block."""
+    block = parse_block(load_fixture("segwit_block.hex"))
+    txs = block["tx"]
+
+    assert len(txs) == 3
+    # txids hash the stripped serialization; the header commits to them
+    assert merkle_root([tx["txid"] for tx in txs]) == block["merkleroot"]
+    assert txs[1]["txid"] != txs[1]["hash"]
+    assert txs[2]["txid"] == txs[2]["hash"]
+
+    spend = txs[1]
+    assert spend["vin"][0]["txid"] == "4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b"
+    assert spend["vin"][1]["vout"] == 1
+    assert spend["vin"][1]["txinwitness"] == ["", "6f7264", "0102"]
+    assert bytes(spend["vin"][1].witness[1]) == b"ord"
+
+    addresses = [out["scriptPubKey"].get("address") for out in spend["vout"]]
+    assert addresses == [
+        "bc1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3qccfmv3",
+        "bc1p5cyxnuxmeuwuvkwfem96lqzszd02n6xdcjrs20cac6yqjjwudpxqkedrcr",
+        "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+    ]
+    assert spend["vout"][0].value_sats == 150000
+
+    legacy = txs[2]
+    assert "txinwitness" not in legacy["vin"][0]
+    assert legacy["vin"][0]["scriptSig"]["hex"] == "0063036f726451"
+
+
+def test_script_to_address_vectors():
+    """Test address encoding against BIP173 vectors."""
+    assert script_to_address(
+        bytes.fromhex("0014751e76e8199196d454941c45d1b3a323f1433bd6")
+    ) == "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4"
+    assert script_to_address(
+        bytes.fromhex("0014751e76e8199196d454941c45d1b3a323f1433bd6"), "regtest"
+    ).startswith("bcrt1q")
+    assert script_to_address(bytes.fromhex("6a0568656c6c6f")) is None
+
+
+def test_truncated_block_raises():
+    """Test that truncated payloads are rejected."""
+    raw = load_fixture("segwit_block.hex")
+    with pytest.raises(BlockParseError):
+        parse_block(raw[:-10])
+
+
+def test_filter_accepts_parsed_transactions():
+    """Test that parsed views feed TransactionFilter without RPC calls for outputs."""
+    block = parse_block(load_fixture("segwit_block.hex"))
+    mock_rpc = Mock()
+    filter_obj = TransactionFilter(
+        mock_rpc,
+        treasury_addresses=["1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa"],
+        watch_inputs=False,
+        detect_ordinals=True,
+    )
+
+    result = filter_obj.filter_decoded_transaction(block["tx"][2])
+    assert result["ordinal"]["matched"] is True
+    assert result["treasury"]["matched"] is False
+
+    result = filter_obj.filter_decoded_transaction(block["tx"][1])
+    assert result["treasury"]["type"] == "receive"
+    assert result["treasury"]["outputs"][0]["value"] == 0.00099
+    mock_rpc.call.assert_not_called()
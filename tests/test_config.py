@@ -24,6 +24,8 @@ def test_config_defaults():
         assert config.poll_secs == 30
         assert config.rpc_user == "bitcoin"  # default
         assert config.rolling_window_mins == 60  # default
+        # Adaptive polling is opt-in: both bounds follow poll_secs
+        assert config.poll_min_secs == config.poll_max_secs == 30
     finally:
         os.unlink(temp_path)
 
@@ -55,3 +57,19 @@ def test_config_env_overrides():
             del os.environ["FS_POLL_SECS"]
 
 
+
+
+def test_block_ingestion_validated():
+    """Test that unknown event_watcher.block_ingestion values are rejected."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        yaml.dump({"event_watcher": {"block_ingestion": "verbos"}}, f)
+        temp_path = f.name
+
+    try:
+        config = Config(temp_path)
+        with pytest.raises(ValueError):
+            config.block_ingestion
+        with pytest.raises(ValueError):
+            config.event_watcher_config
+    finally:
+        os.unlink(temp_path)
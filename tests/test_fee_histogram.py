@@ -0,0 +1,70 @@
+"""Tests for log-scale fee histograms."""
+
+import json
+import random
+
+import pytest
+
+from feesentinel import fee_histogram
+from feesentinel.fee_histogram import NUM_BINS, FeeHistogram, bin_edges, bin_index
+from feesentinel.fees import fee_percentiles
+from feesentinel.mempool_stream import MempoolFeeArrays
+
+
+def _mempool(seed, size):
+    rng = random.Random(seed)
+    mempool = MempoolFeeArrays()
+    for _ in range(size):
+        vsize = rng.randint(110, 2000)
+        mempool.append(int(vsize * rng.lognormvariate(2, 1.2)), vsize)
+    return mempool
+
+
+def test_bins_cover_feerates():
+    """Test that each feerate falls inside its bin and out-of-range rates go to the end bins."""
+    for rate in (0.1, 0.5, 1, 1.01, 7.3, 42, 999.9, 9999):
+        lower, upper = bin_edges(bin_index(rate))
+        assert lower <= rate < upper
+    assert bin_index(0.01) == 0
+    assert bin_index(50_000) == NUM_BINS - 1
+
+
+def test_percentiles_within_half_a_bin(monkeypatch):
+    """Test histogram percentiles against exact ones, with and without numpy."""
+    mempool = _mempool(3, 5000)
+    exact = fee_percentiles(mempool, [10, 50, 90], "python")
+    monkeypatch.setattr(fee_histogram, "np", None)
+    hist = FeeHistogram.from_mempool(mempool)
+    assert hist.tx_count == 5000
+    for point, value in zip([10, 50, 90], exact):
+        assert abs(hist.percentile(point) - value) <= 0.07 * value + 0.5
+    assert FeeHistogram().percentile(50) is None
+
+
+def test_numpy_build_matches_python(monkeypatch):
+    """Test that the vectorized build fills the same bins."""
+    pytest.importorskip("numpy")
+    mempool = _mempool(5, 5000)
+    fast = FeeHistogram.from_mempool(mempool)
+    monkeypatch.setattr(fee_histogram, "np", None)
+    slow = FeeHistogram.from_mempool(mempool)
+    assert fast.counts == slow.counts
+    assert fast.vsizes == slow.vsizes
+
+
+def test_merge_and_serialization_round_trip():
+    """Test that serialized histograms merge into the histogram of the combined mempool."""
+    first, second = _mempool(1, 1000), _mempool(2, 1000)
+    combined = MempoolFeeArrays()
+    for part in (first, second):
+        for fee, vsize in zip(part.fees_sat, part.vsizes):
+            combined.append(fee, vsize)
+
+    records = [json.dumps(FeeHistogram.from_mempool(part).to_dict()) for part in (first, second)]
+    merged = FeeHistogram.merged(FeeHistogram.from_dict(json.loads(line)) for line in records)
+    expected = FeeHistogram.from_mempool(combined)
+    assert merged.counts == expected.counts
+    assert merged.percentile(75, weighted=True) == expected.percentile(75, weighted=True)
+    assert FeeHistogram().to_dict() == {"offset": 0, "count": [], "vsize": []}
+    with pytest.raises(ValueError):
+        FeeHistogram.from_dict({"offset": NUM_BINS, "count": [1], "vsize": [1]})
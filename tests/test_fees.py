@@ -1,7 +1,11 @@
 """Tests for fee percentile calculations."""
 
+import json
 from unittest.mock import Mock
+import pytest
+from feesentinel.async_rpc import AsyncRPCClient
 from feesentinel.fees import current_fee_percentiles
+from feesentinel.mempool_stream import parse_mempool_stream
 from feesentinel.rpc import RPCClient
 
 
@@ -22,6 +26,22 @@ def test_fee_percentiles_empty_mempool():
     assert result["tx_count"] == 0
 
 
+def test_async_fetch_asks_for_mempool_info_only_when_empty():
+    """Test that the async path does not request getmempoolinfo alongside a non-empty mempool."""
+    rpc_client = Mock(spec=RPCClient)
+    async_client = Mock(spec=AsyncRPCClient)
+    async_client.call_many.return_value = [{"tx1": {"fee": 0.00001, "vsize": 250}}]
+
+    assert current_fee_percentiles(rpc_client, async_client=async_client)["p50"] == 4
+    async_client.call_many.assert_called_once_with([("getrawmempool", [True])])
+    rpc_client.call.assert_not_called()
+
+    async_client.call_many.return_value = [{}]
+    rpc_client.call.return_value = {"mempoolminfee": 0.00001}
+    assert current_fee_percentiles(rpc_client, async_client=async_client)["tx_count"] == 0
+    rpc_client.call.assert_called_once_with("getmempoolinfo")
+
+
 def test_fee_percentiles_with_transactions():
     """Test fee calculation with sample transactions."""
     rpc_client = Mock(spec=RPCClient)
@@ -40,3 +60,116 @@ def test_fee_percentiles_with_transactions():
     assert result["p25"] == 8
     assert result["p75"] == 16
 
+
+def make_mempool_reply(entries):
+    """Serialize a verbose getrawmempool JSON-RPC reply like bitcoind does."""
+    return json.dumps(
+        {"result": entries, "error": None, "id": "fs"}, separators=(",", ":")
+    ).encode()
+
+
+def test_streaming_matches_dict_path():
+    """Test that the streaming scanner yields the same percentiles as json decoding."""
+    entries = {}
+    for i in range(200):
+        txid = f"{i:064x}"
+        entry = {
+            "vsize": 100 + i,
+            "weight": 4 * (100 + i),
+            "time": 1700000000,
+            "descendantcount": 1,
+            "wtxid": f"{i + 1000:064x}",
+            "fees": {"base": round((i + 1) * 0.0000013, 8), "modified": 0.1, "ancestor": 0.2},
+            "depends": [f"{i + 2000:064x}"],
+            "spentby": [],
+        }
+        if i % 3 == 0:
+            # Pre-v23 nodes also report a top-level fee
+            entry["fee"] = entry["fees"]["base"]
+        entries[txid] = entry
+    body = make_mempool_reply(entries)
+
+    rpc_client = Mock(spec=RPCClient)
+    rpc_client.call.return_value = entries
+    expected = current_fee_percentiles(rpc_client)
+
+    # Split at awkward offsets so tokens straddle chunk boundaries
+    rpc_client.call_stream.return_value = iter(body[i:i + 37] for i in range(0, len(body), 37))
+    assert current_fee_percentiles(rpc_client, streaming=True) == expected
+
+
+def test_streaming_weight_only_and_errors():
+    """Test weight-only entries and RPC error replies in the streaming path."""
+
+    body = make_mempool_reply({"ab" * 32: {"weight": 561, "fee": 0.00001}})
+    mempool = parse_mempool_stream([body])
+    assert list(mempool.vsizes) == [140]
+    assert list(mempool.fees_sat) == [1000]
+
+    error = b'{"result":null,"error":{"code":-28,"message":"Loading block index"},"id":"fs"}'
+    with pytest.raises(RuntimeError):
+        parse_mempool_stream([error])
+    assert len(parse_mempool_stream([make_mempool_reply({})])) == 0
+
+
+def test_fee_backends_agree_and_custom_points():
+    """Test that numpy and python backends give identical custom percentiles."""
+    pytest.importorskip("numpy")
+    import random
+    from feesentinel.fees import fee_percentiles
+    from feesentinel.mempool_stream import MempoolFeeArrays
+
+    rng = random.Random(7)
+    mempool = MempoolFeeArrays()
+    for _ in range(5000):
+        vsize = rng.randint(110, 2000)
+        mempool.append(int(vsize * rng.uniform(1, 300)), vsize)
+    points = [0, 10, 25, 50, 99.5, 100]
+    assert fee_percentiles(mempool, points, "numpy") == fee_percentiles(mempool, points, "python")
+
+    rpc_client = Mock(spec=RPCClient)
+    rpc_client.call.return_value = {"tx1": {"fee": 0.00001, "vsize": 100}, "tx2": {"fee": 0.00003, "vsize": 100}}
+    result = current_fee_percentiles(rpc_client, percentiles=[10, 50, 99.5], backend="numpy")
+    assert result == {"p10": 10, "p50": 10, "p99.5": 30, "tx_count": 2}
+    with pytest.raises(ValueError):
+        fee_percentiles(mempool, [50], "fortran")
+
+
+def test_package_feerates_follow_cpfp():
+    """Test effective feerates: a paying child lifts its parent and is capped by it."""
+    parent, child, lone = "aa" * 32, "bb" * 32, "cc" * 32
+    entries = {
+        # 1 sat/vB parent with a 49 sat/vB child of the same size: package at 25
+        parent: {
+            "vsize": 200, "ancestorsize": 200, "descendantsize": 400, "descendantcount": 2,
+            "fees": {"base": 0.000002, "ancestor": 0.000002, "descendant": 0.0001},
+            "depends": [],
+        },
+        child: {
+            "vsize": 200, "ancestorsize": 400, "descendantsize": 200, "descendantcount": 1,
+            "fees": {"base": 0.000098, "ancestor": 0.0001, "descendant": 0.000098},
+            "depends": [parent],
+        },
+        lone: {
+            "vsize": 100, "ancestorsize": 100, "descendantsize": 100, "descendantcount": 1,
+            "fees": {"base": 0.00001, "ancestor": 0.00001, "descendant": 0.00001},
+            "depends": [],
+        },
+    }
+    rpc_client = Mock(spec=RPCClient)
+    rpc_client.call.return_value = entries
+    own = current_fee_percentiles(rpc_client, percentiles=[0, 50, 100], backend="python")
+    effective = current_fee_percentiles(rpc_client, percentiles=[0, 50, 100], backend="python", packages=True)
+    assert (own["p0"], own["p50"], own["p100"]) == (1, 10, 49)
+    assert (effective["p0"], effective["p50"], effective["p100"]) == (10, 25, 25)
+
+    body = make_mempool_reply(entries)
+    rpc_client.call_stream.return_value = iter([body[:101], body[101:]])
+    assert current_fee_percentiles(
+        rpc_client, streaming=True, percentiles=[0, 50, 100], backend="python", packages=True
+    ) == effective
+
+    # The vectorized pass matches the per-transaction one
+    pytest.importorskip("numpy")
+    mempool = parse_mempool_stream([body], packages=True)
+    assert mempool.feerate_array().tolist() == list(mempool.feerates())
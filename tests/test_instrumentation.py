@@ -0,0 +1,56 @@
+"""Tests for per-method call statistics."""
+
+import json
+from unittest.mock import Mock
+import pytest
+from feesentinel.instrumentation import CallStats
+from feesentinel.rpc import RPCClient
+
+
+def test_call_stats_histogram_and_reset():
+    """Test counters, percentile estimates and interval reset."""
+    stats = CallStats()
+    for _ in range(9):
+        stats.record("getblock", 0.004, bytes_sent=50, bytes_received=1000)
+    stats.record("getblock", 0.8, errors=1)
+
+    snap = stats.snapshot(reset=True)["getblock"]
+    assert snap["calls"] == 10
+    assert snap["errors"] == 1
+    assert snap["bytes_sent"] == 450
+    assert snap["bytes_received"] == 9000
+    assert snap["p50_ms"] == 5.0
+    assert snap["p95_ms"] == 1000.0
+    assert snap["histogram_ms"]["le_5"] == 9
+    assert stats.snapshot() == {}
+
+
+def test_rpc_client_records_calls_batches_and_errors():
+    """Test that RPCClient records single calls, batch items and failures per method."""
+    client = RPCClient("http://test:8332", "user", "pass")
+
+    def post(url, data=None, **_):
+        payload = json.loads(data)
+        if isinstance(payload, list):
+            body = [{"id": item["id"], "result": item["params"][0], "error": None} for item in payload]
+        elif payload["method"] == "fail":
+            body = {"result": None, "error": {"code": -1, "message": "boom"}}
+        else:
+            body = {"result": 1, "error": None}
+        response = Mock()
+        response.content = json.dumps(body).encode()
+        return response
+
+    client.session.post = Mock(side_effect=post)
+
+    client.call("getblockcount")
+    client.batch([("getblockhash", [h]) for h in range(3)])
+    with pytest.raises(RuntimeError):
+        client.call("fail")
+
+    snap = client.stats.snapshot()
+    assert snap["getblockcount"]["calls"] == 1
+    assert snap["getblockcount"]["bytes_received"] > 0
+    assert snap["getblockhash"]["calls"] == 3
+    assert snap["getblockhash"]["requests"] == 1
+    assert snap["fail"]["errors"] == 1
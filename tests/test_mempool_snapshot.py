@@ -0,0 +1,44 @@
+"""Tests for the compact mempool snapshot."""
+
+import json
+import random
+
+from feesentinel.mempool_snapshot import MempoolSnapshot
+from feesentinel.mempool_stream import parse_mempool_stream
+
+
+def test_snapshot_tracks_dict_through_churn():
+    """Test adds, overwrites and removals against a plain dict, across index rebuilds."""
+    rng = random.Random(11)
+    snapshot = MempoolSnapshot()
+    expected = {}
+    for step in range(5000):
+        if expected and rng.random() < 0.4:
+            txid = rng.choice(list(expected))
+            del expected[txid]
+            assert snapshot.discard(txid)
+        else:
+            txid = f"{rng.getrandbits(256):064x}" if rng.random() < 0.9 or not expected else rng.choice(list(expected))
+            value = (rng.randint(100, 10**6), rng.randint(60, 5000))
+            expected[txid] = value
+            snapshot.add(txid, *value)
+    assert len(snapshot) == len(expected)
+    assert dict((txid, snapshot[txid]) for txid in snapshot) == expected
+    assert sorted(snapshot.feerates()) == sorted(fee / vsize for fee, vsize in expected.values())
+    assert not snapshot.discard("00" * 32)
+    assert "00" * 32 not in snapshot
+    assert snapshot.nbytes() < 64 * len(snapshot) + 4096
+
+
+def test_stream_keeps_txids_and_packages():
+    """Test that the streaming scanner can fill a snapshot keyed by txid."""
+    entries = {
+        "aa" * 32: {"vsize": 200, "ancestorsize": 200, "descendantsize": 300, "descendantcount": 2,
+                    "fees": {"base": 0.000002, "ancestor": 0.000002, "descendant": 0.00001}},
+        "bb" * 32: {"weight": 401, "fee": 0.00001},
+    }
+    body = json.dumps({"result": entries, "error": None, "id": "fs"}).encode()
+    snapshot = parse_mempool_stream([body], packages=True, keep_txids=True)
+    assert sorted(snapshot) == ["aa" * 32, "bb" * 32]
+    assert snapshot["aa" * 32] == (200, 200, (200, 200, 1000, 300, 2))
+    assert snapshot["bb" * 32] == (1000, 100, (1000, 100, 1000, 100, 1))
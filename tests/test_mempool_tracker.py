@@ -0,0 +1,123 @@
+"""Tests for the incremental mempool tracker."""
+
+from unittest.mock import Mock
+from feesentinel.fees import current_fee_percentiles
+from feesentinel.mempool_tracker import MempoolTracker
+from feesentinel.rpc import RPCClient
+
+
+class FakeNode:
+    """Mempool with a sequence counter, answering the tracker's calls."""
+
+    def __init__(self, entries):
+        self.entries = dict(entries)
+        self.sequence = 1
+        self.lookups = []
+
+    def add(self, txid, fee_btc, vsize):
+        self.entries[txid] = {"vsize": vsize, "fees": {"base": fee_btc}}
+        self.sequence += 1
+
+    def remove(self, txid):
+        del self.entries[txid]
+        self.sequence += 1
+
+    def call(self, method, *params):
+        if params == (True,):
+            return dict(self.entries)
+        if params == (False, True):
+            return {"txids": list(self.entries), "mempool_sequence": self.sequence}
+        raise AssertionError(f"unexpected call {method} {params}")
+
+    def batch(self, calls):
+        self.lookups.extend(params[0] for _, params in calls)
+        return [self.entries[params[0]] for _, params in calls]
+
+    def client(self):
+        rpc_client = Mock(spec=RPCClient)
+        rpc_client.call.side_effect = self.call
+        rpc_client.batch.side_effect = self.batch
+        return rpc_client
+
+
+def txid(n):
+    return f"{n:064x}"
+
+
+def test_tracker_applies_diffs():
+    """Test that only new transactions are fetched and removed ones dropped."""
+    node = FakeNode({txid(i): {"vsize": 100, "fees": {"base": 0.00001 * (i + 1)}} for i in range(10)})
+    rpc_client = node.client()
+    tracker = MempoolTracker(rpc_client)
+    tracker.sync()
+    assert len(tracker) == 10
+    assert tracker.stats["resyncs"] == 1
+
+    # Unchanged sequence: no lookups
+    tracker.sync()
+    assert node.lookups == []
+
+    node.add(txid(100), 0.0005, 250)
+    node.remove(txid(0))
+    tracker.sync()
+    assert node.lookups == [txid(100)]
+    assert txid(0) not in tracker.entries
+    assert tracker.entries[txid(100)] == (50000, 250)
+    assert tracker.sequence == 3
+
+    # The percentiles read from the mirror
+    result = current_fee_percentiles(rpc_client, tracker=tracker)
+    assert result["tx_count"] == 10
+    assert result["p95"] == 200
+
+
+def test_tracker_resyncs_on_sequence_reset_and_heavy_churn():
+    """Test full reloads after a node restart or when most of the mempool changed."""
+    node = FakeNode({txid(i): {"vsize": 100, "fees": {"base": 0.00001}} for i in range(4)})
+    tracker = MempoolTracker(node.client())
+    tracker.sync()
+
+    node.sequence = 0  # restarted node
+    tracker.sync()
+    assert tracker.stats["resyncs"] == 2
+
+    for i in range(4):
+        node.remove(txid(i))
+    for i in range(10, 13):
+        node.add(txid(i), 0.00002, 100)
+    tracker.sync()
+    assert tracker.stats["resyncs"] == 3
+    assert node.lookups == []
+    assert sorted(tracker.entries) == [txid(i) for i in range(10, 13)]
+
+
+def test_tracker_refreshes_relatives_of_package_changes():
+    """Test that a parent's package totals are re-fetched when a child arrives or leaves."""
+    parent, child = txid(1), txid(2)
+    # Unrelated transactions keep the churn below the resync threshold
+    node = FakeNode({txid(i): {"vsize": 100, "fees": {"base": 0.00001}} for i in range(10, 14)})
+    node.entries[parent] = {
+        "vsize": 100, "ancestorsize": 100, "descendantsize": 100, "descendantcount": 1,
+        "fees": {"base": 0.000001, "ancestor": 0.000001, "descendant": 0.000001}, "depends": [],
+    }
+    rpc_client = node.client()
+    tracker = MempoolTracker(rpc_client, packages=True)
+    tracker.sync()
+
+    node.entries[parent].update(descendantsize=200, descendantcount=2)
+    node.entries[parent]["fees"]["descendant"] = 0.000051
+    node.entries[child] = {
+        "vsize": 100, "ancestorsize": 200, "descendantsize": 100, "descendantcount": 1,
+        "fees": {"base": 0.00005, "ancestor": 0.000051, "descendant": 0.00005}, "depends": [parent],
+    }
+    node.sequence += 1
+    tracker.sync()
+    assert node.lookups == [child, parent]
+    assert tracker.entries[parent][2] == (100, 100, 5100, 200, 2)
+    assert sorted(tracker.fee_arrays().feerates()) == [10, 10, 10, 10, 25.5, 25.5]
+
+    node.remove(child)
+    tracker.sync()
+    assert node.lookups[-1] == parent
+    assert tracker.stats["refreshed"] == 2
+    assert tracker.parents == {} and tracker.children == {}
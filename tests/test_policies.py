@@ -39,6 +39,15 @@ class TestPolicies(unittest.TestCase):
         # 10 -> 20 is 100% spike, 20 > 15
         self.assertTrue(should_alert_spike(20, 10, self.default_config))
 
+    def test_should_alert_spike_confirmed(self):
+        # 20 -> 30 is a spike, but blocks already clear at 30
+        self.assertFalse(should_alert_spike(30, 20, self.default_config, confirmed=32))
+        self.assertTrue(should_alert_spike(30, 20, self.default_config, confirmed=25))
+
+        cfg = self.default_config.copy()
+        cfg["confirmed_pct"] = 25
+        self.assertFalse(should_alert_spike(30, 20, cfg, confirmed=25))
+
     def test_should_alert_spike_edge_cases(self):
         # Division by zero protection (trail_avg <= 0)
         self.assertFalse(should_alert_spike(100, 0, self.default_config))
@@ -0,0 +1,46 @@
+"""Tests for the fee poll scheduler."""
+
+from feesentinel.poll_scheduler import PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadlines_do_not_drift():
+    """Test that iteration time is absorbed instead of added to the period."""
+    clock = FakeClock()
+    scheduler = PollScheduler(60, 15, 300, clock=clock)
+    for _ in range(3):
+        clock.now += 7  # the iteration itself
+        wait = scheduler.wait_secs()
+        assert wait == 53
+        clock.now += wait
+    assert clock.now == 1180
+
+    # An overrun polls right away and reschedules from there
+    clock.now += 100
+    assert scheduler.wait_secs() == 0
+    clock.now += 5
+    assert scheduler.wait_secs() == 55
+
+
+def test_interval_follows_volatility():
+    """Test tightening on spikes and blocks, and backing off while flat."""
+    scheduler = PollScheduler(60, 15, 300, clock=FakeClock())
+    flat = {"avg": 20, "min": 19, "max": 21}
+
+    assert scheduler.update(20, flat) == 90
+    assert scheduler.update(20, flat) == 135
+    for _ in range(10):
+        scheduler.update(20, flat)
+    assert scheduler.interval == 300
+
+    assert scheduler.update(30, flat) == 15
+    assert scheduler.update(20.5, {"avg": 20, "min": 10, "max": 30}) == 60
+    assert scheduler.update(20, flat, new_block=True) == 15
+    assert scheduler.update(5, {"avg": 0, "min": 0, "max": 0}) == 60
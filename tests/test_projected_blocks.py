@@ -0,0 +1,64 @@
+"""Tests for projected-block fee rates."""
+
+import pytest
+
+from feesentinel import projected_blocks
+from feesentinel.buckets import snapshot_fee
+from feesentinel.mempool_stream import MempoolFeeArrays
+from feesentinel.projected_blocks import BlockProjector
+
+
+def _mempool(pairs):
+    mempool = MempoolFeeArrays()
+    for fee, vsize in pairs:
+        mempool.append(fee, vsize)
+    return mempool
+
+
+def test_weighted_median_ignores_swarm_of_small_transactions():
+    """A few large high-fee transactions set the block median, not many tiny ones."""
+    # 3 x 200 kvB at 30 sat/vB plus 1000 x 110 vB at 1 sat/vB
+    pairs = [(30 * 200_000, 200_000)] * 3 + [(110, 110)] * 1000
+    blocks = BlockProjector(1).project(_mempool(pairs))
+
+    assert len(blocks) == 1
+    assert blocks[0]["median_feerate"] == 30
+    assert blocks[0]["min_feerate"] == 1
+    assert blocks[0]["vsize"] == 710_000
+    assert snapshot_fee({"p50": 1, "next_block_median": 30}, "next_block_median") == 30
+    assert snapshot_fee({"p50": 1}, "next_block_median") == 1
+
+
+def test_blocks_are_cut_at_block_vsize():
+    """A transaction that does not fit starts the next block."""
+    pairs = [(50 * 400, 400), (40 * 400, 400), (30 * 400, 400), (20 * 400, 400)]
+    blocks = BlockProjector(3, block_vsize=1000).project(_mempool(pairs))
+
+    assert [(b["max_feerate"], b["min_feerate"], b["tx_count"]) for b in blocks] == [
+        (50, 40, 2), (30, 20, 2)
+    ]
+
+
+def test_cutoff_is_reused_across_polls(monkeypatch):
+    """The second poll only sorts transactions near the previous cutoff."""
+    monkeypatch.setattr(projected_blocks, "np", None)
+    pairs = [((i % 100 + 1) * 1000, 1000) for i in range(5000)]
+    projector = BlockProjector(2, block_vsize=1_000_000)
+
+    first = projector.project(_mempool(pairs))
+    second = projector.project(_mempool(pairs))
+
+    assert first == second
+    assert projector.stats == {"projections": 2, "full_sorts": 1}
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    """Both orderings produce the same blocks."""
+    pytest.importorskip("numpy")
+    pairs = [((i * 7919) % 5000 + 100, (i * 104729) % 900 + 100) for i in range(20000)]
+
+    with_numpy = BlockProjector(3, block_vsize=500_000).project(_mempool(pairs))
+    monkeypatch.setattr(projected_blocks, "np", None)
+    without_numpy = BlockProjector(3, block_vsize=500_000).project(_mempool(pairs))
+
+    assert with_numpy == without_numpy
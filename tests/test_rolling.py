@@ -1,6 +1,7 @@
 """Tests for rolling window statistics."""
 
 from datetime import datetime, timedelta
+import pytest
 from feesentinel.rolling import Rolling
 
 
@@ -46,4 +47,66 @@ def test_rolling_window_pruning():
     assert stats["n"] == 2
     assert stats["min"] == 10
     assert stats["max"] == 20
+    # points stays a plain list of (ts, p50), oldest first
+    assert rolling.points[-1:] == [(base_time + timedelta(minutes=30), 20)]
 
+
+
+def test_rolling_matches_full_rescan():
+    """Test that incremental stats equal a full rescan, including out-of-order points."""
+    import random
+
+    rng = random.Random(5)
+    rolling = Rolling(10)
+    points = []
+    ts = datetime(2024, 1, 1)
+    for _ in range(2000):
+        ts += timedelta(seconds=rng.randint(0, 40))
+        # Occasionally a point from the past, e.g. after a clock step
+        at = ts - timedelta(minutes=rng.randint(1, 12)) if rng.random() < 0.02 else ts
+        value = rng.randint(1, 300)
+        rolling.add(at, value)
+        points.append((at, value))
+        cutoff = at - timedelta(minutes=10)
+        points = [(t, v) for (t, v) in points if t >= cutoff]
+        vals = [v for _, v in points]
+        assert rolling.stats() == {
+            "avg": int(round(sum(vals) / len(vals))), "min": min(vals), "max": max(vals), "n": len(vals)
+        }
+
+
+def test_engine_windows_match_rolling():
+    """Test that every engine window equals a separate Rolling, through buffer compaction."""
+    from feesentinel.policies import rolling_value, trailing_baseline
+    from feesentinel.rolling import RollingEngine
+
+    engine = RollingEngine([5, 60], ["p50", "tx_count"], ewma_mins=[10])
+    singles = {"5m": Rolling(5), "60m": Rolling(60)}
+    ts = datetime(2024, 1, 1)
+    for i in range(5000):
+        ts += timedelta(seconds=7)
+        p50 = (i * 37) % 101
+        engine.add(ts, {"p50": p50, "tx_count": i})
+        for rolling in singles.values():
+            rolling.add(ts, p50)
+    for label, rolling in singles.items():
+        assert engine.stats(label, "p50") == rolling.stats()
+    assert engine.stats("5m", "tx_count")["max"] == 4999
+    assert len(engine._ts) < 2 * 60 * 60 / 7 + 1100
+
+    snapshot = engine.snapshot()
+    assert rolling_value(snapshot, "60m/p50") == singles["60m"].stats()
+    assert 0 < trailing_baseline(snapshot, "ewma_10m/p50") < 101
+    with pytest.raises(ValueError):
+        rolling_value(snapshot, "24h/p50")
+
+
+def test_engine_ewma_half_life():
+    """Test that a step change is halfway absorbed after one half-life."""
+    from feesentinel.rolling import RollingEngine
+
+    engine = RollingEngine([], ["p50"], ewma_mins=[10])
+    ts = datetime(2024, 1, 1)
+    engine.add(ts, {"p50": 0})
+    engine.add(ts + timedelta(minutes=10), {"p50": 100})
+    assert engine.ewma("ewma_10m", "p50") == 50
@@ -0,0 +1,214 @@
+"""Tests for the RPC client."""
+
+import io
+import json
+from unittest.mock import Mock
+import pytest
+import requests
+from feesentinel.mempool_stream import parse_mempool_stream
+from feesentinel.rpc import RPCClient, PrunedBlockError
+
+
+def make_response(body):
+    """Build a fake requests response carrying a JSON body."""
+    response = Mock()
+    response.content = json.dumps(body).encode()
+    response.json.return_value = body
+    response.raise_for_status.return_value = None
+    return response
+
+
+def make_batch_client(handler, **kwargs):
+    """Create an RPC client whose session answers batch posts with ``handler``."""
+    client = RPCClient("http://test:8332", "user", "pass", **kwargs)
+    posted = []
+
+    def post(url, data=None, **_):
+        payload = json.loads(data)
+        posted.append(payload)
+        return make_response([handler(item) for item in payload])
+
+    client.session.post = Mock(side_effect=post)
+    return client, posted
+
+
+def test_call_maps_pruned_error():
+    """Test that single calls raise PrunedBlockError for pruned blocks."""
+    client = RPCClient("http://test:8332", "user", "pass")
+    client.session.post = Mock(return_value=make_response(
+        {"result": None, "error": {"code": -1, "message": "Block not available (pruned data)"}}
+    ))
+
+    with pytest.raises(PrunedBlockError) as exc_info:
+        client.call("getblock", "abc", 1)
+    assert exc_info.value.block_hash == "abc"
+
+
+def test_batch_returns_results_in_order():
+    """Test that batch results follow call order even if replies are reordered."""
+    client = RPCClient("http://test:8332", "user", "pass")
+
+    def post(url, data=None, **_):
+        payload = json.loads(data)
+        replies = [
+            {"id": item["id"], "result": f"hash{item['params'][0]}", "error": None}
+            for item in payload
+        ]
+        return make_response(list(reversed(replies)))
+
+    client.session.post = Mock(side_effect=post)
+
+    assert client.batch([("getblockhash", [1]), ("getblockhash", [2]), ("getblockhash", [3])]) == [
+        "hash1", "hash2", "hash3"
+    ]
+    assert client.session.post.call_count == 1
+
+
+def test_batch_maps_per_item_errors():
+    """Test that failed items are returned as exceptions without failing the batch."""
+    def handler(item):
+        if item["params"][0] == "pruned":
+            return {"id": item["id"], "result": None,
+                    "error": {"code": -1, "message": "Block not available (pruned data)"}}
+        if item["params"][0] == "bad":
+            return {"id": item["id"], "result": None,
+                    "error": {"code": -5, "message": "No such transaction"}}
+        return {"id": item["id"], "result": {"ok": True}, "error": None}
+
+    client, _ = make_batch_client(handler)
+    results = client.batch([
+        ("getblock", ["good", 1]),
+        ("getblock", ["pruned", 1]),
+        ("getrawtransaction", ["bad", True]),
+    ])
+
+    assert results[0] == {"ok": True}
+    assert isinstance(results[1], PrunedBlockError)
+    assert results[1].block_hash == "pruned"
+    assert isinstance(results[2], RuntimeError)
+
+
+def test_batch_respects_item_cap():
+    """Test that batches are split by item count."""
+    client, posted = make_batch_client(
+        lambda item: {"id": item["id"], "result": item["params"][0], "error": None},
+        batch_max_items=2,
+    )
+
+    results = client.batch([("getblockhash", [h]) for h in range(5)])
+
+    assert results == [0, 1, 2, 3, 4]
+    assert [len(batch) for batch in posted] == [2, 2, 1]
+
+
+def test_batch_adapts_to_response_size():
+    """Test that large observed replies shrink later batches."""
+    big = "x" * 1000
+    client, posted = make_batch_client(
+        lambda item: {"id": item["id"], "result": big, "error": None},
+        batch_max_items=100,
+        batch_max_bytes=5000,
+    )
+
+    client.batch([("getblock", [h]) for h in range(2)])
+    learned = len(posted)
+    client.batch([("getblock", [h]) for h in range(10)])
+
+    # After learning ~1KB per reply, later batches stay under the byte budget
+    later = posted[learned:]
+    assert all(len(batch) <= 5 for batch in later)
+    assert len(later) < 10
+    assert sum(len(batch) for batch in later) == 10
+
+
+def make_pool_client(nodes):
+    """Create a multi-node RPC client; ``nodes`` maps URL to a handler or exception."""
+    client = RPCClient(list(nodes), "user", "pass")
+    posted = []
+
+    def post(url, data=None, **_):
+        payload = json.loads(data)
+        posted.append((url, payload["method"]))
+        handler = nodes[url]
+        if isinstance(handler, Exception):
+            raise handler
+        return make_response({"result": handler(payload), "error": None})
+
+    client.session.post = Mock(side_effect=post)
+    return client, posted
+
+
+def synced(result):
+    """Handler for a synced node returning ``result`` for every other call."""
+    def handler(payload):
+        if payload["method"] == "getblockchaininfo":
+            return {"initialblockdownload": False}
+        return result
+    return handler
+
+
+def test_pool_fails_over_and_keeps_tip_sticky():
+    """Test failover to the next node and that tip calls then stay on it."""
+    nodes = {
+        "http://a:8332": requests.exceptions.ConnectionError("refused"),
+        "http://b:8332": synced(100),
+        "http://c:8332": synced(99),
+    }
+    client, posted = make_pool_client(nodes)
+
+    assert client.call("getblockcount") == 100
+    assert client.pool.tip.url == "http://b:8332"
+
+    posted.clear()
+    client.call("getblockhash", 100)
+    assert posted == [("http://b:8332", "getblockhash")]
+
+
+def test_pool_skips_nodes_in_ibd():
+    """Test that syncing nodes are not used for read-only calls."""
+    nodes = {
+        "http://a:8332": synced("from-a"),
+        "http://b:8332": lambda payload: {"initialblockdownload": True},
+    }
+    client, posted = make_pool_client(nodes)
+    client.pool.endpoints[0].latency = 0.5  # a is slower, b would be preferred
+
+    assert client.call("getrawmempool") == "from-a"
+    assert ("http://b:8332", "getrawmempool") not in posted
+
+
+def test_pool_routes_wallet_calls_to_primary():
+    """Test that wallet calls never leave the primary node."""
+    nodes = {"http://a:8332": synced("wallet"), "http://b:8332": synced("other")}
+    client, posted = make_pool_client(nodes)
+    client.pool.endpoints[1].latency = 0.001
+    client.pool.endpoints[0].latency = 1.0
+
+    assert client.call("listunspent", 0) == "wallet"
+    assert posted[-1] == ("http://a:8332", "listunspent")
+    assert client.call("getmempoolinfo") == "other"
+
+
+def make_http_response(status, body):
+    """Build a real streamed requests response with the given status and raw body."""
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    response.url = "http://test:8332"
+    return response
+
+
+def test_call_stream_leaves_http_500_error_body_to_caller():
+    """Test that a streamed HTTP 500 JSON-RPC error reaches mempool_stream's error handling."""
+    client = RPCClient("http://test:8332", "user", "pass")
+    body = json.dumps({"result": None, "error": {"code": -28, "message": "Loading"}, "id": "fs"}).encode()
+    client.session.post = Mock(return_value=make_http_response(500, body))
+
+    with pytest.raises(RuntimeError) as exc_info:
+        parse_mempool_stream(client.call_stream("getrawmempool", True))
+    assert exc_info.value.args[0]["code"] == -28
+
+    # Without a JSON-RPC body the status is still an HTTP failure
+    client.session.post = Mock(return_value=make_http_response(500, b"Internal Server Error"))
+    with pytest.raises(requests.HTTPError):
+        client.call_stream("getrawmempool", True)
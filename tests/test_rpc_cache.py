@@ -0,0 +1,100 @@
+"""Tests for the immutable RPC response cache."""
+
+import json
+from unittest.mock import Mock
+from feesentinel.block_monitor import BlockMonitor
+from feesentinel.rpc import RPCClient
+from feesentinel.rpc_cache import MISS, ResponseCache
+
+HASH_A = "aa" * 32
+HASH_B = "bb" * 32
+
+
+def test_lru_eviction_by_bytes():
+    """Test that the byte budget evicts the least recently used entries."""
+    cache = ResponseCache(max_bytes=400)
+    for idx in range(4):
+        cache.put("getblockstats", [f"{idx:064x}"], {"height": idx, "pad": "x" * 60})
+    # Touch the oldest entry so the second one is evicted next
+    assert cache.get("getblockstats", [f"{0:064x}"])["height"] == 0
+    cache.put("getblockstats", [f"{9:064x}"], {"height": 9, "pad": "x" * 60})
+
+    assert cache.get("getblockstats", [f"{1:064x}"]) is MISS
+    assert cache.get("getblockstats", [f"{0:064x}"])["height"] == 0
+    stats = cache.stats()
+    assert stats["bytes"] <= 400
+    assert stats["evictions"] == 1
+
+
+def test_only_immutable_results_cached():
+    """Test that mempool transactions and height lookups are not cached."""
+    cache = ResponseCache()
+    assert not cache.put("getrawtransaction", ["cc" * 32, True], {"txid": "cc" * 32})
+    assert not cache.put("getblockhash", [800000], HASH_A)
+    assert cache.put("getrawtransaction", ["dd" * 32, True], {"txid": "dd" * 32, "blockhash": HASH_A,
+                                                           "confirmations": 3})
+    assert cache.put("getblock", [HASH_A, 1], {"hash": HASH_A, "confirmations": 1, "nextblockhash": HASH_B})
+
+    # Fields that change as the chain grows are not served from the cache
+    assert cache.get("getblock", [HASH_A, 1]) == {"hash": HASH_A}
+    assert "confirmations" not in cache.get("getrawtransaction", ["dd" * 32, True])
+
+
+def test_invalidate_reorged_blocks_and_disk_tier(tmp_path):
+    """Test reorg invalidation in memory and on disk, and reload from disk."""
+    cache = ResponseCache(disk_dir=str(tmp_path))
+    cache.put("getblock", [HASH_A, 2], {"hash": HASH_A})
+    cache.put("getrawtransaction", ["dd" * 32, True], {"txid": "dd" * 32, "blockhash": HASH_A})
+    cache.put("getblock", [HASH_B, 2], {"hash": HASH_B})
+
+    # A new process finds the entries on disk
+    restarted = ResponseCache(disk_dir=str(tmp_path))
+    assert restarted.get("getblock", [HASH_B, 2]) == {"hash": HASH_B}
+    assert restarted.stats()["disk_hits"] == 1
+
+    assert cache.invalidate_blocks([HASH_A]) == 4  # two in memory, two on disk
+    assert cache.get("getblock", [HASH_A, 2]) is MISS
+    assert cache.get("getrawtransaction", ["dd" * 32, True]) is MISS
+    assert ResponseCache(disk_dir=str(tmp_path)).get("getblock", [HASH_A, 2]) is MISS
+    assert cache.get("getblock", [HASH_B, 2]) == {"hash": HASH_B}
+
+
+def test_rpc_client_serves_hits_without_network():
+    """Test that calls and batches only send cache misses to the node."""
+    client = RPCClient("http://test:8332", "user", "pass", cache=ResponseCache())
+
+    def post(url, data=None, **_):
+        payload = json.loads(data)
+        items = payload if isinstance(payload, list) else [payload]
+        body = [{"result": {"hash": item["params"][0]}, "error": None, "id": item["id"]} for item in items]
+        response = Mock()
+        response.content = json.dumps(body if isinstance(payload, list) else body[0]).encode()
+        return response
+
+    client.session.post = Mock(side_effect=post)
+    assert client.call("getblock", HASH_A, 1) == {"hash": HASH_A}
+    assert client.call("getblock", HASH_A, 1) == {"hash": HASH_A}
+    assert client.session.post.call_count == 1
+
+    results = client.batch([("getblock", [HASH_A, 1]), ("getblock", [HASH_B, 1])])
+    assert results == [{"hash": HASH_A}, {"hash": HASH_B}]
+    assert client.session.post.call_count == 2
+    sent = json.loads(client.session.post.call_args.kwargs["data"])
+    assert [item["params"][0] for item in sent] == [HASH_B]
+
+
+def test_reorg_invalidates_cached_blocks():
+    """Test that BlockMonitor drops cached results of rolled-back blocks."""
+    rpc_client = Mock(spec=RPCClient)
+    rpc_client.cache = ResponseCache()
+    rpc_client.cache.put("getblock", [HASH_A, 1], {"hash": HASH_A})
+    rpc_client.call.side_effect = lambda method, *params: {"getblockcount": 101, "getblockhash": HASH_B}[method]
+    rpc_client.batch.return_value = [HASH_B]
+
+    state_manager = Mock()
+    state_manager.get_last_height.return_value = 100
+    state_manager.get_block_hash.side_effect = lambda height: HASH_A if height == 100 else None
+
+    monitor = BlockMonitor(rpc_client, state_manager, max_reorg_depth=1)
+    assert monitor.get_new_blocks() == (100, HASH_B, True)
+    assert rpc_client.cache.get("getblock", [HASH_A, 1]) is MISS
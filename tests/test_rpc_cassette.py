@@ -0,0 +1,91 @@
+"""Tests for RPC cassette record/replay."""
+
+import json
+from unittest.mock import Mock
+import pytest
+from feesentinel.fees import current_fee_percentiles
+from feesentinel.rpc import RPCClient, PrunedBlockError, rpc_error_code
+from feesentinel.rpc_cassette import Cassette, CassetteMiss
+
+
+def make_node_client(cassette):
+    """RPC client whose session plays a tiny node, recording into ``cassette``."""
+    client = RPCClient("http://test:8332", "user", "pass", cassette=cassette)
+    height = {"value": 100}
+    mempool = {"ab" * 32: {"vsize": 200, "fees": {"base": 0.00002}}}
+
+    def reply(method, params):
+        if method == "getblockcount":
+            height["value"] += 1
+            return {"result": height["value"], "error": None}
+        if method == "getblock":
+            return {"result": None, "error": {"code": -1, "message": "Block not available (pruned data)"}}
+        if method == "getrawmempool":
+            return {"result": mempool, "error": None}
+        if method == "getrawtransaction":
+            return {"result": None, "error": {"code": -5, "message": "No such mempool or blockchain transaction"}}
+        return {"result": [method] + params, "error": None}
+
+    def post(url, data=None, stream=False, **_):
+        payload = json.loads(data)
+        if isinstance(payload, list):
+            body = [dict(reply(item["method"], item["params"]), id=item["id"]) for item in payload]
+        else:
+            body = reply(payload["method"], payload["params"])
+        response = Mock()
+        response.content = json.dumps(body).encode()
+        response.iter_content.side_effect = lambda chunk_size: iter([response.content])
+        return response
+
+    client.session.post = Mock(side_effect=post)
+    return client
+
+
+def test_record_then_replay_without_node(tmp_path):
+    """Test that a recorded session replays identically with no node."""
+    path = str(tmp_path / "run.jsonl.gz")
+    recorder = Cassette(path, "record")
+    client = make_node_client(recorder)
+
+    recorded = [client.call("getblockcount"), client.call("getblockcount")]
+    batch = client.batch([("getblockhash", [1]), ("getblock", ["h", 1])])
+    snapshot = current_fee_percentiles(client, streaming=True)
+    with pytest.raises(PrunedBlockError):
+        client.call("getblock", "h", 3)
+    recorder.close()
+
+    replay_client = RPCClient("http://nowhere:1", "user", "pass", cassette=Cassette(path, "replay"))
+    replay_client.session.post = Mock(side_effect=AssertionError("network used during replay"))
+
+    assert [replay_client.call("getblockcount"), replay_client.call("getblockcount")] == recorded
+    # Exhausted keys keep answering with the last recording
+    assert replay_client.call("getblockcount") == recorded[-1]
+    replayed = replay_client.batch([("getblockhash", [1]), ("getblock", ["h", 1])])
+    assert replayed[0] == batch[0]
+    assert isinstance(replayed[1], PrunedBlockError)
+    assert current_fee_percentiles(replay_client, streaming=True) == snapshot
+    with pytest.raises(PrunedBlockError):
+        replay_client.call("getblock", "h", 3)
+    with pytest.raises(CassetteMiss):
+        replay_client.call("getbestblockhash")
+
+
+def test_replayed_errors_keep_rpc_code(tmp_path):
+    """Test that JSON-RPC error codes survive a record/replay round trip."""
+    path = str(tmp_path / "errors.jsonl.gz")
+    recorder = Cassette(path, "record")
+    client = make_node_client(recorder)
+    with pytest.raises(RuntimeError) as live:
+        client.call("getrawtransaction", "cd" * 32, True)
+    live_batch = client.batch([("getrawtransaction", ["ef" * 32, True]), ("getblock", ["h", 1])])
+    recorder.close()
+
+    replay_client = RPCClient("http://nowhere:1", "user", "pass", cassette=Cassette(path, "replay"))
+    with pytest.raises(RuntimeError) as replayed:
+        replay_client.call("getrawtransaction", "cd" * 32, True)
+    assert replayed.value.rpc_error == live.value.rpc_error
+    assert rpc_error_code(replayed.value) == -5
+
+    replayed_batch = replay_client.batch([("getrawtransaction", ["ef" * 32, True]), ("getblock", ["h", 1])])
+    assert [rpc_error_code(e) for e in replayed_batch] == [rpc_error_code(e) for e in live_batch] == [-5, -1]
+    assert isinstance(replayed_batch[1], PrunedBlockError)
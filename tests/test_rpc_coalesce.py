@@ -0,0 +1,84 @@
+"""Tests for single-flight RPC call coalescing."""
+
+import json
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+from feesentinel.rpc import RPCClient
+from feesentinel.rpc_coalesce import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_request():
+    """Test that followers wait for the leader and get its result or error."""
+    flight = SingleFlight(tip_ttl_secs=0)
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {"size": 3}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("getmempoolinfo", [], slow)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"size": 3}] * 4
+    assert flight.stats() == {"leaders": 1, "coalesced": 3, "ttl_hits": 0}
+
+    # Errors are not remembered: the next call runs again
+    with pytest.raises(RuntimeError):
+        flight.do("getmempoolinfo", [], Mock(side_effect=RuntimeError("boom")))
+    assert flight.do("getmempoolinfo", [], lambda: 7) == 7
+
+
+def test_tip_ttl_and_expire():
+    """Test that tip answers are reused within the TTL until a block is seen."""
+    flight = SingleFlight(tip_ttl_secs=60)
+    fetch = Mock(side_effect=[100, 101])
+    assert flight.do("getblockcount", [], fetch) == 100
+    assert flight.do("getblockcount", [], fetch) == 100
+    assert fetch.call_count == 1
+
+    # Non-tip methods are never served after their flight has landed
+    other = Mock(return_value={})
+    flight.do("getmempoolinfo", [], other)
+    flight.do("getmempoolinfo", [], other)
+    assert other.call_count == 2
+
+    flight.expire()
+    assert flight.do("getblockcount", [], fetch) == 101
+
+
+def test_clients_of_same_nodes_share_group():
+    """Test that two RPC clients sharing a group send one tip request."""
+    flight = SingleFlight.shared((("http://coalesce-test:8332",), "user"), tip_ttl_secs=60)
+    assert SingleFlight.shared((("http://coalesce-test:8332",), "user")) is flight
+
+    response = Mock()
+    response.content = json.dumps({"result": 800000, "error": None, "id": "fs"}).encode()
+    clients = []
+    for _ in range(2):
+        client = RPCClient("http://coalesce-test:8332", "user", "pass", flight=flight)
+        client.session.post = Mock(return_value=response)
+        clients.append(client)
+
+    assert clients[0].call("getblockcount") == 800000
+    assert clients[1].call("getblockcount") == 800000
+    assert clients[0].session.post.call_count == 1
+    assert clients[1].session.post.call_count == 0
+
+    # Wallet and other node-specific calls are never coalesced
+    assert not flight.should_coalesce("sendrawtransaction")
+    assert not flight.should_coalesce("waitforblockheight")
@@ -0,0 +1,69 @@
+"""Tests for the priority-aware RPC rate limiter."""
+
+import json
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+from feesentinel.rpc import RPCClient
+from feesentinel.rpc_limiter import RateLimiter, classify_priority
+
+
+def test_classify_priority():
+    """Test default priority classes of calls and batches."""
+    assert classify_priority(["getblockcount"]) == "tip"
+    assert classify_priority(["getrawmempool"]) == "fees"
+    assert classify_priority(["getrawtransaction"]) == "backfill"
+    assert classify_priority(["getrawtransaction", "getmempoolinfo"]) == "fees"
+    with pytest.raises(ValueError):
+        RateLimiter(10, 1).acquire("urgent")
+
+
+def test_class_budget_and_stats():
+    """Test that a class budget throttles requests and waits are reported."""
+    limiter = RateLimiter(0, 1, {"backfill": {"per_sec": 50, "burst": 2}})
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire("backfill")
+    # Two from the burst, three more at 50/s
+    assert time.monotonic() - start >= 0.05
+    stats = limiter.stats()
+    assert stats["backfill"]["acquired"] == 5
+    assert stats["backfill"]["waited"] >= 3
+    assert stats["tip"]["acquired"] == 0
+
+
+def test_higher_priority_goes_first():
+    """Test that queued tip requests take node tokens before backfill."""
+    limiter = RateLimiter(20, 1)
+    limiter.acquire("backfill")  # Drain the node bucket
+    order = []
+
+    def worker(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    backfill = [threading.Thread(target=worker, args=("backfill",)) for _ in range(3)]
+    for thread in backfill:
+        thread.start()
+    while limiter.stats()["backfill"]["queued"] < 3:
+        time.sleep(0.001)
+    tip = threading.Thread(target=worker, args=("tip",))
+    tip.start()
+    for thread in backfill + [tip]:
+        thread.join()
+    assert order[0] == "tip"
+
+
+def test_client_priority_override():
+    """Test that RPCClient.priority overrides the method's default class."""
+    limiter = Mock(spec=RateLimiter)
+    client = RPCClient("http://test:8332", "user", "pass", limiter=limiter)
+    response = Mock()
+    response.content = json.dumps({"result": {"hash": "ab"}, "error": None, "id": "fs"}).encode()
+    client.session.post = Mock(return_value=response)
+
+    client.call("getblock", "ab" * 32)
+    with client.priority("backfill"):
+        client.call("getblock", "ab" * 32)
+    assert [call.args[0] for call in limiter.acquire.call_args_list] == ["tip", "backfill"]
@@ -0,0 +1,152 @@
+"""Tests for adaptive RPC timeouts, hedging and circuit breaking."""
+
+import json
+import threading
+from unittest.mock import Mock
+import pytest
+import requests
+from feesentinel.rpc import RPCClient
+from feesentinel.rpc_resilience import AdaptiveTimeouts, CircuitBreaker, CircuitOpenError
+
+
+def make_response(result):
+    response = Mock()
+    response.content = json.dumps({"result": result, "error": None, "id": "fs"}).encode()
+    return response
+
+
+def test_adaptive_timeouts():
+    """Test default, learned and clamped timeouts per method."""
+    timeouts = AdaptiveTimeouts(default_secs=30, min_secs=2, max_secs=120, multiplier=4)
+    assert timeouts.timeout(["getblockcount"]) == 30
+    assert timeouts.hedge_delay(["getblockcount"]) is None
+
+    for _ in range(50):
+        timeouts.observe(["getblockcount"], 0.01)
+        timeouts.observe(["getblock"], 5.0)
+    assert timeouts.timeout(["getblockcount"]) == 2  # 0.04s raised to the floor
+    assert timeouts.timeout(["getblock"]) == 20
+    assert timeouts.hedge_delay(["getblock"]) == 5.0
+    # Batches and long-polls are timed separately
+    assert timeouts.timeout(["getblock", "getblock"]) == 30
+    assert timeouts.timeout(["waitforblockheight"]) == 120
+
+
+def test_adaptive_timeouts_keep_cheap_calls_apart():
+    """Test that cheap calls and small batches do not shrink the timeout of expensive ones."""
+    timeouts = AdaptiveTimeouts(default_secs=30, min_secs=2, max_secs=120, multiplier=4)
+    small_batch = ["getmempoolentry"] * 10
+    for _ in range(50):
+        timeouts.observe(["getrawmempool"], 0.05, [[False, True]])
+        timeouts.observe(["getblock"], 0.05, [["ab" * 32, 1]])
+        timeouts.observe(small_batch, 0.05, [["aa" * 32]] * 10)
+    assert timeouts.timeout(["getrawmempool"], [[False, True]]) == 2
+    assert timeouts.timeout(["getmempoolentry"] * 9, [["aa" * 32]] * 9) == 2  # same size bucket
+
+    # The next full resync, verbose block or large batch keeps the default
+    assert timeouts.timeout(["getrawmempool"], [[True]]) == 30
+    assert timeouts.timeout(["getblock"], [["ab" * 32, 3]]) == 30
+    assert timeouts.timeout(["getmempoolentry"] * 2000, [["aa" * 32]] * 2000) == 30
+    assert timeouts.hedge_delay(["getrawmempool"], [[True]]) is None
+
+
+def test_circuit_breaker_states(monkeypatch):
+    """Test opening after consecutive failures and a single half-open probe."""
+    now = [1000.0]
+    monkeypatch.setattr("feesentinel.rpc_resilience.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_secs=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] += 31
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_client_fails_fast_when_circuit_open():
+    """Test that timeouts are passed to requests and an open circuit skips the node."""
+    client = RPCClient("http://test:8332", "user", "pass", breaker_failures=2)
+    client.session.post = Mock(side_effect=requests.exceptions.ReadTimeout("stalled"))
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            client.call("getblockcount")
+    assert client.session.post.call_args.kwargs["timeout"] == (5, 30)
+
+    with pytest.raises(CircuitOpenError):
+        client.call("getblockcount")
+    assert client.session.post.call_count == 2
+    assert client.resilience_stats()["breakers"] == {"http://test:8332": "open"}
+
+
+def test_hedged_read_uses_faster_node():
+    """Test that a slow read-only call is raced against the second node."""
+    client = RPCClient(["http://a:8332", "http://b:8332"], "user", "pass", hedge=True)
+    for endpoint in client.pool.endpoints:
+        endpoint.checked_at = float("inf")  # skip sync-state checks
+    for _ in range(30):
+        client.timeouts.observe(["getblock"], 0.01)
+    release = threading.Event()
+
+    def post(url, data=None, **_):
+        if url == "http://a:8332":
+            release.wait(5)
+            return make_response("slow")
+        return make_response("fast")
+
+    client.session.post = Mock(side_effect=post)
+    try:
+        assert client.call("getblock", "ab" * 32) == "fast"
+    finally:
+        release.set()
+    assert client.hedge_stats == {"hedged": 1, "hedge_wins": 1}
+
+
+def test_half_open_probe_kept_when_endpoint_not_tried(monkeypatch):
+    """Test that a half-open node skipped while the primary answers is probed on the next failover."""
+    now = [1000.0]
+    monkeypatch.setattr("feesentinel.rpc_resilience.time.monotonic", lambda: now[0])
+    client = RPCClient(["http://a:8332", "http://b:8332"], "user", "pass", hedge=False, breaker_failures=1)
+    for endpoint in client.pool.endpoints:
+        endpoint.checked_at = float("inf")  # skip sync-state checks
+    secondary = client.breakers["http://b:8332"]
+    secondary.record_failure()
+    now[0] += 31  # cool-down over: the next request to b is the probe
+    assert secondary.available()
+
+    client.session.post = Mock(return_value=make_response(800000))
+    assert client.call("getblockcount") == 800000
+    assert [c.args[0] for c in client.session.post.call_args_list] == ["http://a:8332"]
+    assert secondary.available()
+
+    def post(url, data=None, **_):
+        if url == "http://a:8332":
+            raise requests.exceptions.ConnectionError("down")
+        return make_response(800001)
+
+    client.session.post = Mock(side_effect=post)
+    assert client.call("getblockcount") == 800001
+    assert secondary.state == "closed"
+
+
+def test_lost_probe_race_moves_to_next_endpoint():
+    """Test that losing a half-open probe between filtering and sending fails over instead of failing."""
+    client = RPCClient(["http://a:8332", "http://b:8332"], "user", "pass", hedge=False)
+    for endpoint in client.pool.endpoints:
+        endpoint.checked_at = float("inf")  # skip sync-state checks
+    primary = client.breakers["http://a:8332"]
+    primary.available = Mock(return_value=True)  # looked free when candidates were picked
+    primary.allow = Mock(return_value=False)  # but another thread took the probe
+    client.session.post = Mock(return_value=make_response(800000))
+
+    assert client.call("getblockcount") == 800000
+    assert [c.args[0] for c in client.session.post.call_args_list] == ["http://b:8332"]
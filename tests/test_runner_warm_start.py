@@ -0,0 +1,59 @@
+"""Tests for warm-starting the runner's rolling windows from fee_snapshots.jsonl."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytest
+import yaml
+from feesentinel.config import Config
+from feesentinel.runner import FeeSentinelRunner
+from feesentinel.structured_output import StructuredOutputWriter
+
+
+def snapshot_line(ts, p50, **extra):
+    snapshot = {"p25": p50 - 1, "p50": p50, "p75": p50 + 1, "p90": p50 + 2, "p95": p50 + 3, "tx_count": 100}
+    snapshot.update(extra)
+    return json.dumps({"type": "fee_snapshot", "snapshot": snapshot, "timestamp": ts.isoformat() + "Z"})
+
+
+def make_runner(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.dump({
+        "rpc": {"url": "http://test:8332"},
+        "polling": {"rolling_window_mins": 60, "rolling_ewma_mins": [10]},
+    }))
+    writer = StructuredOutputWriter(str(tmp_path / "out"))
+    return FeeSentinelRunner(Config(str(config_path)), structured_writer=writer), writer
+
+
+def test_warm_start_seeds_windows_and_ewma(tmp_path):
+    """Test that only recent, complete records are loaded and a torn tail line is ignored."""
+    runner, writer = make_runner(tmp_path)
+    now = datetime.utcnow()
+    lines = [
+        snapshot_line(now - timedelta(minutes=180), 500),  # older than the longest window
+        # Written by an older version without the other rolling metrics
+        json.dumps({"snapshot": {"p50": 7}, "timestamp": (now - timedelta(minutes=30)).isoformat() + "Z"}),
+        snapshot_line(now - timedelta(minutes=20), 10),
+        snapshot_line(now - timedelta(minutes=10), 20),
+        '{"type": "fee_snapshot", "snapshot": {"p2',  # cut short by a crash
+    ]
+    writer.fee_snapshots_path.write_text("\n".join(lines))
+
+    # Construction alone does not read the file (single-shot runs never use the windows)
+    assert runner.rolling.snapshot()["windows"]["60m"]["p50"]["n"] == 0
+
+    assert runner.warm_start() == 2
+    state = runner.rolling.snapshot()
+    assert state["windows"]["60m"]["p50"] == {"avg": 15, "min": 10, "max": 20, "n": 2}
+    assert state["windows"]["60m"]["tx_count"]["n"] == 2
+    assert 10 < state["ewma"]["ewma_10m"]["p50"] < 20
+
+
+def test_run_continuous_warm_starts(tmp_path):
+    """Test that the continuous loop, not construction, triggers the warm start."""
+    runner, _ = make_runner(tmp_path)
+    with patch.object(runner, "warm_start") as warm_start, patch.object(runner, "run_once", side_effect=KeyboardInterrupt):
+        with pytest.raises(SystemExit):
+            runner.run_continuous(60, dry_run=True, prepare_psbt=False)
+    warm_start.assert_called_once_with()
@@ -0,0 +1,28 @@
+"""Tests for structured output reading."""
+
+from datetime import datetime, timedelta
+
+from feesentinel.structured_output import StructuredOutputWriter, read_lines_reversed
+
+
+def test_read_lines_reversed_across_blocks(tmp_path):
+    """Test that lines split over block boundaries come back whole, newest first."""
+    path = tmp_path / "lines.jsonl"
+    lines = [f"line-{i}-" + "x" * (i % 13) for i in range(200)]
+    path.write_text("\n".join(lines) + "\n")
+    assert [line.decode() for line in read_lines_reversed(path, block_bytes=7)] == lines[::-1]
+
+
+def test_recent_fee_snapshots_stops_at_cutoff(tmp_path):
+    """Test that only the tail after ``since`` is returned, skipping a torn last line."""
+    writer = StructuredOutputWriter(str(tmp_path))
+    start = datetime(2024, 1, 1)
+    for i in range(100):
+        ts = start + timedelta(minutes=i)
+        writer.record_fee_snapshot({"type": "fee_snapshot", "snapshot": {"p50": i}, "timestamp": ts.isoformat() + "Z"})
+    with writer.fee_snapshots_path.open("a") as f:
+        f.write('{"type": "fee_snap')
+
+    records = writer.recent_fee_snapshots(start + timedelta(minutes=95))
+    assert [record["snapshot"]["p50"] for record in records] == [95, 96, 97, 98, 99]
+    assert StructuredOutputWriter(str(tmp_path / "empty")).recent_fee_snapshots(start) == []
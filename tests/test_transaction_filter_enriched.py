@@ -283,3 +283,36 @@ def test_category_summary():
     assert summary["category_b"]["in_sats"] == 3_000_000
     assert summary["category_b"]["entity_count"] == 1
 
+
+
+def test_treasury_spend_uses_embedded_prevout():
+    """Test that verbosity-3 prevouts are used without any RPC lookups."""
+    mock_rpc = create_mock_rpc_client()
+    filter_obj = TransactionFilter(
+        mock_rpc,
+        treasury_addresses=["bc1qspent"]
+    )
+
+    tx = {
+        "txid": "spend_tx",
+        "vin": [
+            {
+                "txid": "prev_tx",
+                "vout": 1,
+                "prevout": {
+                    "value": 0.5,
+                    "scriptPubKey": {"address": "bc1qspent"}
+                }
+            }
+        ],
+        "vout": []
+    }
+
+    result = filter_obj.filter_decoded_transaction(tx)
+
+    assert result["txid"] == "spend_tx"
+    assert result["treasury"]["matched"] is True
+    assert result["treasury"]["type"] == "spend"
+    assert result["treasury"]["enriched_addresses"][0]["value_sats"] == 50_000_000
+    mock_rpc.call.assert_not_called()
+    mock_rpc.batch.assert_not_called()
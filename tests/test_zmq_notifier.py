@@ -0,0 +1,92 @@
+"""Tests for ZMQ notifications against a local publisher stand-in."""
+
+import struct
+import time
+import pytest
+from feesentinel.zmq_notifier import ZMQNotifier
+
+zmq = pytest.importorskip("zmq")
+
+BLOCK_HASH = "000000000019d6689c085ae165831e934ff763ae46a2a6c172b3f1b60a8ce26f"
+
+
+@pytest.fixture
+def publisher():
+    """Bind a PUB socket standing in for bitcoind's -zmqpub* endpoints."""
+    socket = zmq.Context.instance().socket(zmq.PUB)
+    port = socket.bind_to_random_port("tcp://127.0.0.1")
+    yield socket, f"tcp://127.0.0.1:{port}"
+    socket.close(linger=0)
+
+
+def publish(socket, topic, body, seq):
+    """Publish one notification framed like bitcoind (topic, body, LE sequence)."""
+    socket.send_multipart([topic.encode(), body, struct.pack("<I", seq)])
+
+
+def wait_until_subscribed(publisher, notifier):
+    """Publish rawtx messages until the subscriber is connected (slow joiner)."""
+    seq = 0
+    deadline = time.monotonic() + 5
+    while notifier.stats["transactions"] == 0:
+        assert time.monotonic() < deadline, "subscriber never connected"
+        publish(publisher, "rawtx", b"\x00", seq)
+        seq += 1
+        time.sleep(0.02)
+    # Messages sent before the subscription completed were dropped, not missed
+    notifier._last_seq.clear()
+
+
+def test_hashblock_wakes_waiter(publisher):
+    """Test that a hashblock notification ends wait_for_block immediately."""
+    publisher, endpoint = publisher
+    notifier = ZMQNotifier({"hashblock": endpoint, "rawtx": endpoint})
+    assert notifier.start()
+    try:
+        wait_until_subscribed(publisher, notifier)
+        assert notifier.wait_for_block(0.05) is None
+
+        publish(publisher, "hashblock", bytes.fromhex(BLOCK_HASH), 0)
+        assert notifier.wait_for_block(2) == BLOCK_HASH
+        assert notifier.is_healthy()
+    finally:
+        notifier.stop()
+
+
+def test_sequence_topic_and_gap_detection(publisher):
+    """Test sequence connect events and counter gap detection."""
+    publisher, endpoint = publisher
+    notifier = ZMQNotifier({"sequence": endpoint, "rawtx": endpoint})
+    assert notifier.start()
+    try:
+        wait_until_subscribed(publisher, notifier)
+
+        added = bytes(32) + b"A" + struct.pack("<Q", 7)
+        publish(publisher, "sequence", added, 0)
+        # Counter jumps from 0 to 2: one notification was dropped
+        connected = bytes.fromhex(BLOCK_HASH) + b"C"
+        publish(publisher, "sequence", connected, 2)
+
+        assert notifier.wait_for_block(2) == BLOCK_HASH
+        assert notifier.mempool_sequence == 7
+        assert notifier.stats["sequence_gaps"] == 1
+    finally:
+        notifier.stop()
+
+
+def test_quiet_socket_falls_back_to_polling(publisher):
+    """Test that a socket without messages reports unhealthy after quiet_secs."""
+    _, endpoint = publisher
+    notifier = ZMQNotifier({"hashblock": endpoint}, quiet_secs=0.1)
+    assert notifier.start()
+    try:
+        assert notifier.is_healthy()
+        time.sleep(0.15)
+        assert not notifier.is_healthy()
+    finally:
+        notifier.stop()
+
+
+def test_from_config_disabled():
+    """Test that a disabled config yields no notifier."""
+    assert ZMQNotifier.from_config({"enabled": False, "endpoints": {"hashblock": "tcp://x"}}) is None